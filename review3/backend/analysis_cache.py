@@ -0,0 +1,227 @@
+"""
+LLM 분석 결과 캐시 모듈
+
+hash(모델, 프롬프트 템플릿 버전, 리뷰 내용)을 키로 Gemini 분석 결과를 DB에 저장합니다.
+같은 리뷰 내용(앱이 달라도)은 한 번만 분석하고, TTL과 LRU 방식으로 오래된 항목을 정리합니다.
+메서드는 동기 DB 세션을 사용하므로 비동기 코드에서는 asyncio.to_thread로 호출합니다.
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import DBAPIError
+
+from database import SessionLocal
+from models import AnalysisCache
+
+CACHE_TTL_DAYS = int(os.getenv("ANALYSIS_CACHE_TTL_DAYS", "30"))
+CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "100000"))
+# 최대 개수를 넘지 않아도 TTL이 지난 항목을 정리하는 간격(초)
+CACHE_EXPIRE_INTERVAL_SECONDS = 24 * 60 * 60
+# 한 문장으로 조회/저장할 키 수
+CACHE_CHUNK_SIZE = 500
+
+# INSERT ... ON CONFLICT DO UPDATE를 지원하는 DB별 insert
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", (text or "").strip())
+
+
+def make_key(model: str, prompt_version: str, kind: str, content: str) -> str:
+    raw = "\x1f".join([model, prompt_version, kind, _normalize(content)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _upsert_chunk(db, rows: list):
+    """같은 키가 있으면(TTL이 지나 남은 항목이나 동시에 분석한 결과) 덮어씁니다."""
+    dialect_insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if dialect_insert is None:
+        # 그 밖의 DB는 지우고 다시 저장 (동시에 같은 키를 쓰면 IntegrityError - put_many에서 처리)
+        db.execute(delete(AnalysisCache).where(AnalysisCache.key.in_([row["key"] for row in rows])))
+        db.execute(insert(AnalysisCache), rows)
+        return
+    statement = dialect_insert(AnalysisCache)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[AnalysisCache.key],
+            set_={
+                name: statement.excluded[name]
+                for name in ("kind", "value", "hit_count", "created_at", "last_accessed_at")
+            },
+        ),
+        rows,
+    )
+
+
+class AnalysisResultCache:
+    def __init__(self, ttl_days: int, max_entries: int):
+        self.ttl_days = ttl_days
+        self.max_entries = max_entries
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+        # 저장된 항목 수 추정값 (evict 때 COUNT로 다시 맞춤, None이면 아직 세지 않음)
+        self._estimated_entries: Optional[int] = None
+        self._last_evicted = time.monotonic()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """저장된 결과를 조회하고 접근 시각과 조회 수를 갱신합니다."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        now = datetime.utcnow()
+        expires_before = now - timedelta(days=self.ttl_days)
+        found = {}
+        db = SessionLocal()
+        try:
+            for start in range(0, len(keys), CACHE_CHUNK_SIZE):
+                rows = db.execute(
+                    select(AnalysisCache.key, AnalysisCache.value)
+                    .where(AnalysisCache.key.in_(keys[start:start + CACHE_CHUNK_SIZE]))
+                    .where(AnalysisCache.created_at >= expires_before)
+                ).all()
+                if not rows:
+                    continue
+                found.update(rows)
+                db.execute(
+                    update(AnalysisCache)
+                    .where(AnalysisCache.key.in_([key for key, _ in rows]))
+                    .values(hit_count=AnalysisCache.hit_count + 1, last_accessed_at=now)
+                )
+            db.commit()
+        finally:
+            db.close()
+
+        with self._lock:
+            self._hits += len(found)
+            self._misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, kind: str, values: Dict[str, str]):
+        """
+        분석 결과를 chunk 단위로 upsert합니다.
+        캐시 저장은 부가 기능이므로 저장에 실패한 chunk는 기록만 하고 분석 결과 반환을 막지 않습니다.
+        """
+        if not values:
+            return
+        now = datetime.utcnow()
+        items = list(values.items())
+        stored = 0
+        db = SessionLocal()
+        try:
+            for start in range(0, len(items), CACHE_CHUNK_SIZE):
+                chunk = items[start:start + CACHE_CHUNK_SIZE]
+                try:
+                    _upsert_chunk(db, [
+                        {
+                            "key": key, "kind": kind, "value": value,
+                            "hit_count": 0, "created_at": now, "last_accessed_at": now,
+                        }
+                        for key, value in chunk
+                    ])
+                    db.commit()
+                    stored += len(chunk)
+                except DBAPIError as e:
+                    db.rollback()
+                    print(f"[AnalysisCache] 분석 결과 {len(chunk)}개를 캐시에 저장하지 못했습니다: {str(e)}")
+        finally:
+            db.close()
+
+        with self._lock:
+            if self._estimated_entries is not None:
+                self._estimated_entries += stored
+
+    def evict_if_needed(self) -> int:
+        """
+        저장된 항목 수(추정값)가 최대 개수를 넘었거나 TTL 정리 간격이 지났을 때만 evict를 실행합니다.
+        처음 한 번만 항목 수를 세고, 이후에는 저장한 수를 더해 추정합니다.
+        """
+        with self._lock:
+            estimated = self._estimated_entries
+            expire_due = time.monotonic() - self._last_evicted >= CACHE_EXPIRE_INTERVAL_SECONDS
+        if estimated is None:
+            db = SessionLocal()
+            try:
+                estimated = db.query(func.count(AnalysisCache.key)).scalar()
+            finally:
+                db.close()
+            with self._lock:
+                self._estimated_entries = estimated
+        if estimated <= self.max_entries and not expire_due:
+            return 0
+        return self.evict()
+
+    def evict(self) -> int:
+        """TTL이 지난 항목과 최대 개수를 넘는 가장 오래 사용하지 않은 항목을 삭제합니다."""
+        db = SessionLocal()
+        try:
+            expires_before = datetime.utcnow() - timedelta(days=self.ttl_days)
+            removed = (
+                db.query(AnalysisCache)
+                .filter(AnalysisCache.created_at < expires_before)
+                .delete(synchronize_session=False)
+            )
+
+            overflow = db.query(func.count(AnalysisCache.key)).scalar() - self.max_entries
+            if overflow > 0:
+                oldest = (
+                    db.query(AnalysisCache.key)
+                    .order_by(AnalysisCache.last_accessed_at)
+                    .limit(overflow)
+                    .subquery()
+                )
+                removed += (
+                    db.query(AnalysisCache)
+                    .filter(AnalysisCache.key.in_(db.query(oldest.c.key)))
+                    .delete(synchronize_session=False)
+                )
+            db.commit()
+            with self._lock:
+                self._estimated_entries = min(db.query(func.count(AnalysisCache.key)).scalar(), self.max_entries)
+                self._last_evicted = time.monotonic()
+            return removed
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        db = SessionLocal()
+        try:
+            by_kind = dict(
+                db.query(AnalysisCache.kind, func.count(AnalysisCache.key))
+                .group_by(AnalysisCache.kind)
+                .all()
+            )
+        finally:
+            db.close()
+
+        with self._lock:
+            hits, misses = self._hits, self._misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else None,
+            "entries": sum(by_kind.values()),
+            "entries_by_kind": by_kind,
+            "ttl_days": self.ttl_days,
+            "max_entries": self.max_entries,
+        }
+
+
+# 애플리케이션 전역 분석 결과 캐시 (hits/misses는 프로세스 시작 이후 누적값)
+analysis_cache = AnalysisResultCache(CACHE_TTL_DAYS, CACHE_MAX_ENTRIES)
+
+
+def is_failure(text: str) -> bool:
+    """분석 실패 메시지는 캐시하지 않습니다."""
+    return text.startswith(("전체 분석 실패", "개별 분석 실패"))
+
@@ -0,0 +1,215 @@
+"""
+Playwright Chromium 브라우저 풀 모듈
+
+브라우저는 처음 필요할 때(또는 FastAPI startup 시점에) 한 번만 실행하고, 크롤링마다
+격리된 브라우저 컨텍스트를 빌려주는 방식으로 재사용합니다.
+"""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import List, Optional, Set
+from urllib.parse import urlsplit
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Frame, Page, Playwright
+
+
+class _PooledContext:
+    """풀에서 관리하는 브라우저 컨텍스트와 사용 횟수, 방문한 origin"""
+
+    def __init__(self, context: BrowserContext, generation: int):
+        self.context = context
+        self.generation = generation
+        self.uses = 0
+        # 반납할 때 저장소를 비울 origin
+        self.origins: Set[str] = set()
+        context.on("page", self._track_page)
+
+    def _track_page(self, page: Page):
+        page.on("framenavigated", self._track_frame)
+
+    def _track_frame(self, frame: Frame):
+        parts = urlsplit(frame.url)
+        if parts.scheme in ("http", "https"):
+            self.origins.add(f"{parts.scheme}://{parts.netloc}")
+
+
+class BrowserPool:
+    """
+    장기 실행 Chromium 브라우저 풀
+
+    - 동시에 사용할 수 있는 컨텍스트 수를 세마포어로 제한
+    - 컨텍스트는 max_context_uses 회 사용 후 폐기하고 새로 생성
+    - 브라우저 프로세스가 죽으면 다음 요청 시 자동으로 재시작
+    """
+
+    def __init__(self, max_contexts: int = 4, max_context_uses: int = 20, headless: bool = True):
+        self.max_contexts = max_contexts
+        self.max_context_uses = max_context_uses
+        self.headless = headless
+
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._generation = 0  # 브라우저가 재시작될 때마다 증가
+        self._idle: List[_PooledContext] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock: Optional[asyncio.Lock] = None
+        # 첫 크롤링 요청들이 동시에 start를 호출해도 한 번만 실행
+        self._start_lock = asyncio.Lock()
+
+    @property
+    def started(self) -> bool:
+        return self._playwright is not None
+
+    async def start(self):
+        """Playwright와 브라우저를 실행합니다. 실행에 실패하면 다음 호출 때 다시 시도합니다."""
+        async with self._start_lock:
+            if self.started:
+                return
+            self._playwright = await async_playwright().start()
+            try:
+                await self._launch_browser()
+            except Exception:
+                await self._playwright.stop()
+                self._playwright = None
+                raise
+            self._semaphore = asyncio.Semaphore(self.max_contexts)
+            self._lock = asyncio.Lock()
+
+    async def stop(self):
+        """모든 컨텍스트와 브라우저를 종료합니다."""
+        if not self.started:
+            return
+        for pooled in self._idle:
+            await self._close_context(pooled)
+        self._idle.clear()
+
+        if self._browser:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+
+        await self._playwright.stop()
+        self._playwright = None
+
+    async def _launch_browser(self):
+        self._browser = await self._playwright.chromium.launch(headless=self.headless)
+        self._generation += 1
+        print(f"[BrowserPool] Chromium 실행 (generation {self._generation})")
+
+    async def _ensure_browser(self):
+        """브라우저가 죽었으면 유휴 컨텍스트를 버리고 재시작합니다."""
+        async with self._lock:
+            if self._browser and self._browser.is_connected():
+                return
+            print("[BrowserPool] 브라우저 연결이 끊어져 재시작합니다.")
+            self._idle.clear()
+            if self._browser:
+                try:
+                    await self._browser.close()
+                except Exception:
+                    pass
+            await self._launch_browser()
+
+    async def _close_context(self, pooled: _PooledContext):
+        try:
+            await pooled.context.close()
+        except Exception:
+            pass
+
+    async def _acquire_context(self) -> _PooledContext:
+        await self._ensure_browser()
+        while self._idle:
+            pooled = self._idle.pop()
+            if pooled.generation == self._generation:
+                return pooled
+            await self._close_context(pooled)
+
+        context = await self._browser.new_context(locale="ko-KR")
+        return _PooledContext(context, self._generation)
+
+    async def _release_context(self, pooled: _PooledContext, healthy: bool):
+        pooled.uses += 1
+        reusable = (
+            healthy
+            and pooled.generation == self._generation
+            and pooled.uses < self.max_context_uses
+            and self._browser is not None
+            and self._browser.is_connected()
+        )
+        if not reusable:
+            await self._close_context(pooled)
+            return
+
+        try:
+            await self._reset_context(pooled)
+        except Exception:
+            await self._close_context(pooled)
+            return
+        self._idle.append(pooled)
+
+    async def _reset_context(self, pooled: _PooledContext):
+        """다음 크롤링과 상태를 공유하지 않도록 쿠키, 권한, HTTP 캐시와 방문한 origin의 저장소를 비웁니다."""
+        context = pooled.context
+        await context.clear_cookies()
+        await context.clear_permissions()
+        # localStorage, IndexedDB, Cache Storage 등은 Playwright API가 없어 Chromium CDP로 삭제
+        page = await context.new_page()
+        try:
+            cdp = await context.new_cdp_session(page)
+            await cdp.send("Network.clearBrowserCache")
+            for origin in pooled.origins:
+                await cdp.send("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            await cdp.detach()
+        finally:
+            await page.close()
+        pooled.origins.clear()
+
+    @asynccontextmanager
+    async def context(self):
+        """격리된 브라우저 컨텍스트를 빌려줍니다. 풀이 아직 실행되지 않았으면 먼저 실행합니다."""
+        if not self.started:
+            await self.start()
+
+        async with self._semaphore:
+            pooled = await self._acquire_context()
+            healthy = True
+            try:
+                yield pooled.context
+            except Exception:
+                healthy = False
+                raise
+            finally:
+                await self._release_context(pooled, healthy)
+
+    @asynccontextmanager
+    async def page(self):
+        """풀의 컨텍스트에서 새 페이지를 열어 빌려줍니다."""
+        async with self.context() as context:
+            page: Page = await context.new_page()
+            try:
+                yield page
+            finally:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+
+    def status(self) -> dict:
+        return {
+            "started": self.started,
+            "connected": bool(self._browser and self._browser.is_connected()),
+            "generation": self._generation,
+            "max_contexts": self.max_contexts,
+            "idle_contexts": len(self._idle),
+            "max_context_uses": self.max_context_uses,
+        }
+
+
+# 애플리케이션 전역에서 공유하는 브라우저 풀
+browser_pool = BrowserPool(
+    max_contexts=int(os.getenv("BROWSER_POOL_SIZE", "4")),
+    max_context_uses=int(os.getenv("BROWSER_CONTEXT_MAX_USES", "20")),
+    headless=os.getenv("BROWSER_HEADLESS", "true").lower() != "false",
+)
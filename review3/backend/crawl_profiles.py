@@ -0,0 +1,153 @@
+"""
+크롤링 프로필 모듈
+
+page.route로 요청을 가로채 프로필에 지정된 리소스(이미지, 미디어, 폰트, 분석 스크립트 등)를
+차단하고, 프로필별로 차단한 요청 수와 절약한 바이트(추정치)를 집계합니다.
+"""
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Optional, Tuple
+from urllib.parse import urlparse
+
+from playwright.async_api import Page, Request, Response, Route
+
+# 추출에 필요 없는 서드파티 분석/광고/로깅 요청
+ANALYTICS_URL_PATTERNS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "play.google.com/log",
+)
+
+# 실제로 받아 본 적이 없는 리소스 종류의 차단 바이트 추정에 쓰는 기본값
+DEFAULT_RESOURCE_BYTES = {
+    "image": 30_000,
+    "media": 500_000,
+    "font": 40_000,
+    "stylesheet": 20_000,
+    "script": 60_000,
+}
+
+
+@dataclass(frozen=True)
+class CrawlProfile:
+    name: str
+    blocked_resource_types: FrozenSet[str] = frozenset()
+    blocked_url_patterns: Tuple[str, ...] = ()
+
+    @property
+    def blocks_anything(self) -> bool:
+        return bool(self.blocked_resource_types or self.blocked_url_patterns)
+
+    def should_block(self, request: Request) -> bool:
+        if request.resource_type in self.blocked_resource_types:
+            return True
+        parsed = urlparse(request.url)
+        target = parsed.netloc + parsed.path
+        return any(pattern in target for pattern in self.blocked_url_patterns)
+
+
+PROFILES: Dict[str, CrawlProfile] = {
+    # 모든 리소스를 그대로 로드 (셀렉터 디버깅용)
+    "full": CrawlProfile("full"),
+    # 이미지/미디어/폰트와 분석 스크립트 차단 (기본값)
+    "light": CrawlProfile(
+        "light",
+        blocked_resource_types=frozenset({"image", "media", "font"}),
+        blocked_url_patterns=ANALYTICS_URL_PATTERNS,
+    ),
+    # light + 스타일시트 차단. 레이아웃에 의존하는 동작이 깨질 수 있음
+    "minimal": CrawlProfile(
+        "minimal",
+        blocked_resource_types=frozenset({"image", "media", "font", "stylesheet"}),
+        blocked_url_patterns=ANALYTICS_URL_PATTERNS,
+    ),
+}
+
+DEFAULT_PROFILE = os.getenv("CRAWL_PROFILE", "light")
+
+
+@dataclass
+class CrawlMetrics:
+    """프로필 하나의 누적 요청/바이트 통계"""
+
+    pages: int = 0
+    page_seconds: float = 0.0
+    requests_loaded: Counter = field(default_factory=Counter)
+    bytes_loaded: Counter = field(default_factory=Counter)
+    requests_blocked: Counter = field(default_factory=Counter)
+
+    def record_loaded(self, response: Response):
+        resource_type = response.request.resource_type
+        self.requests_loaded[resource_type] += 1
+        # content-length가 없는 응답(청크 전송 등)은 바이트 집계에서 제외
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            self.bytes_loaded[resource_type] += int(length)
+
+    def record_blocked(self, request: Request):
+        self.requests_blocked[request.resource_type] += 1
+
+    def record_page(self, seconds: float):
+        self.pages += 1
+        self.page_seconds += seconds
+
+    def _average_bytes(self, resource_type: str) -> int:
+        count = self.requests_loaded.get(resource_type, 0)
+        if count and self.bytes_loaded.get(resource_type):
+            return self.bytes_loaded[resource_type] // count
+        return DEFAULT_RESOURCE_BYTES.get(resource_type, 10_000)
+
+    def snapshot(self) -> dict:
+        estimated_saved = sum(
+            count * self._average_bytes(resource_type)
+            for resource_type, count in self.requests_blocked.items()
+        )
+        return {
+            "pages": self.pages,
+            "avg_page_seconds": round(self.page_seconds / self.pages, 3) if self.pages else None,
+            "requests_loaded": sum(self.requests_loaded.values()),
+            "requests_blocked": sum(self.requests_blocked.values()),
+            "blocked_by_type": dict(self.requests_blocked),
+            "bytes_loaded": sum(self.bytes_loaded.values()),
+            "bytes_loaded_per_page": sum(self.bytes_loaded.values()) // self.pages if self.pages else None,
+            "estimated_bytes_saved": estimated_saved,
+        }
+
+
+_metrics: Dict[str, CrawlMetrics] = {name: CrawlMetrics() for name in PROFILES}
+
+
+def get_profile(name: Optional[str] = None) -> CrawlProfile:
+    name = name or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"알 수 없는 크롤링 프로필입니다: {name} (사용 가능: {', '.join(PROFILES)})")
+    return PROFILES[name]
+
+
+async def apply_profile(page: Page, profile: CrawlProfile) -> CrawlMetrics:
+    """페이지에 요청 차단 규칙과 통계 수집을 설정하고 해당 프로필의 통계 객체를 반환합니다."""
+    metrics = _metrics[profile.name]
+    page.on("response", metrics.record_loaded)
+
+    if profile.blocks_anything:
+        async def handle_route(route: Route):
+            if profile.should_block(route.request):
+                metrics.record_blocked(route.request)
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await page.route("**/*", handle_route)
+
+    return metrics
+
+
+def metrics_snapshot() -> dict:
+    return {
+        "default_profile": DEFAULT_PROFILE,
+        "profiles": {name: metrics.snapshot() for name, metrics in _metrics.items()},
+    }
@@ -0,0 +1,153 @@
+"""
+배치 크롤링 스케줄러
+
+여러 앱 ID를 동시성 제한, 호스트별 요청 간격 제한, 재시도(지수 백오프)와 함께
+크롤링하고 앱 단위 진행 상황을 비동기 제너레이터로 내보냅니다.
+재시도는 페이지 로딩 시간 초과와 네트워크 오류에만 하고, 백오프 대기 중에는 동시성 슬롯을 반납합니다.
+"""
+import asyncio
+import os
+import random
+import time
+from contextlib import nullcontext
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from crawler import APP_DETAIL_URL, TransientCrawlError, crawl_app_with_reviews
+
+
+class HostRateLimiter:
+    """호스트별로 요청 시작 간격을 min_interval 초 이상으로 유지합니다."""
+
+    def __init__(self, min_interval: float = 1.0):
+        self.min_interval = min_interval
+        self._next_slot: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def wait(self, host: str):
+        if self.min_interval <= 0:
+            return
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+PLAY_STORE_HOST = urlparse(APP_DETAIL_URL).netloc
+
+# 모든 배치 요청이 공유하는 호스트별 제한기
+host_rate_limiter = HostRateLimiter(float(os.getenv("CRAWL_HOST_MIN_INTERVAL", "1.0")))
+
+
+class CrawlFailedError(Exception):
+    """재시도까지 실패한 크롤링 (attempts: 시도한 횟수)"""
+
+    def __init__(self, error: Exception, attempts: int):
+        super().__init__(str(error))
+        self.attempts = attempts
+
+
+async def crawl_with_retry(
+    app_id: str,
+    max_reviews: int = 10,
+    max_retries: int = 2,
+    backoff_base: float = 2.0,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> Tuple[Dict, List[Dict], int]:
+    """
+    호스트 요청 간격을 지키며 앱을 크롤링하고, 시간 초과/네트워크 오류면 지수 백오프로 재시도합니다.
+    semaphore를 지정하면 시도하는 동안만 슬롯을 잡고 백오프 대기 중에는 다른 앱에 양보합니다.
+    Returns: (앱 정보, 리뷰 리스트, 시도 횟수)
+    Raises: CrawlFailedError (앱을 찾을 수 없는 경우 등 재시도해도 실패할 오류는 바로)
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            async with semaphore or nullcontext():
+                await host_rate_limiter.wait(PLAY_STORE_HOST)
+                app_info, reviews = await crawl_app_with_reviews(app_id, max_reviews=max_reviews)
+            return app_info, reviews, attempt
+        except TransientCrawlError as e:
+            if attempt > max_retries:
+                raise CrawlFailedError(e, attempt) from e
+        except Exception as e:
+            raise CrawlFailedError(e, attempt) from e
+        # 2초, 4초, 8초... 에 약간의 지터를 더해 대기
+        delay = backoff_base * (2 ** (attempt - 1))
+        await asyncio.sleep(delay + random.uniform(0, delay / 2))
+
+
+async def run_batch_crawl(
+    app_ids: List[str],
+    on_crawled: Callable[[Dict, List[Dict]], Awaitable[int]],
+    should_skip: Optional[Callable[[str], Awaitable[bool]]] = None,
+    concurrency: int = 4,
+    max_reviews: int = 10,
+    max_retries: int = 2,
+) -> AsyncIterator[Dict]:
+    """
+    앱 ID 목록을 최대 concurrency 개씩 동시에 크롤링합니다.
+
+    Args:
+        app_ids: 크롤링할 앱 ID 목록 (중복은 제거)
+        on_crawled: 크롤링 결과를 저장하고 저장된 리뷰 수를 반환하는 콜백
+        should_skip: True를 반환하는 앱 ID는 크롤링하지 않음 (이미 등록된 앱 등)
+        concurrency: 동시에 크롤링할 최대 앱 수
+        max_reviews: 앱당 수집할 리뷰 수
+        max_retries: 앱당 최대 재시도 횟수
+
+    Yields:
+        앱 하나가 끝날 때마다 진행 상황 이벤트
+    """
+    unique_ids = list(dict.fromkeys(a.strip() for a in app_ids if a and a.strip()))
+    total = len(unique_ids)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def process(app_id: str) -> Dict:
+        # 실패는 예외 대신 앱별 failed 이벤트로 보냄 (다른 앱의 진행을 멈추지 않도록)
+        started = time.monotonic()
+        attempts = 0
+        try:
+            if should_skip and await should_skip(app_id):
+                return {"app_id": app_id, "status": "skipped", "attempts": 0}
+
+            app_info, reviews, attempts = await crawl_with_retry(
+                app_id, max_reviews=max_reviews, max_retries=max_retries, semaphore=semaphore
+            )
+            saved = await on_crawled(app_info, reviews)
+            return {
+                "app_id": app_id,
+                "status": "success",
+                "attempts": attempts,
+                "app_name": app_info["app_name"],
+                "review_count": saved,
+                "elapsed": round(time.monotonic() - started, 2),
+            }
+        except Exception as e:
+            if isinstance(e, CrawlFailedError):
+                attempts = e.attempts
+            return {
+                "app_id": app_id,
+                "status": "failed",
+                "attempts": attempts,
+                "error": str(e),
+                "elapsed": round(time.monotonic() - started, 2),
+            }
+
+    tasks = [asyncio.create_task(process(app_id)) for app_id in unique_ids]
+    completed = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            event = await next_done
+            completed += 1
+            event["completed"] = completed
+            event["total"] = total
+            yield event
+    finally:
+        # 클라이언트 연결이 끊긴 경우 남은 작업 취소
+        for task in tasks:
+            task.cancel()
@@ -1,226 +1,349 @@
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
-import asyncio
-from typing import Dict, List
+from playwright.async_api import Error as PlaywrightError, Page, TimeoutError as PlaywrightTimeoutError
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 import re
+import time
 
-async def crawl_app_info(app_id: str) -> Dict:
-    """Google Play Store에서 앱 정보를 크롤링합니다."""
-    browser = None
+from browser_pool import browser_pool
+from crawl_profiles import apply_profile, get_profile
+
+APP_DETAIL_URL = "https://play.google.com/store/apps/details?id={app_id}&hl=ko&gl=KR"
+
+@asynccontextmanager
+async def _crawl_page(profile: Optional[str] = None):
+    """크롤링 프로필(리소스 차단 규칙)을 적용한 페이지를 풀에서 빌려옵니다."""
+    crawl_profile = get_profile(profile)
+    async with browser_pool.page() as page:
+        metrics = await apply_profile(page, crawl_profile)
+        started = time.monotonic()
+        try:
+            yield page
+        finally:
+            metrics.record_page(time.monotonic() - started)
+
+class TransientCrawlError(Exception):
+    """페이지 로딩 시간 초과나 네트워크 오류처럼 다시 시도하면 성공할 수 있는 크롤링 실패"""
+
+
+async def _open_app_page(page: Page, app_id: str):
+    """앱 상세 페이지로 이동하고 앱 제목이 렌더링될 때까지 기다립니다."""
+    page.set_default_timeout(15000)  # 15초 타임아웃
+
+    url = APP_DETAIL_URL.format(app_id=app_id)
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            page.set_default_timeout(15000)  # 15초 타임아웃
-            
-            url = f"https://play.google.com/store/apps/details?id={app_id}&hl=ko&gl=KR"
-            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            await asyncio.sleep(3)  # 페이지 로딩 대기
-            
-            # 앱명 추출 (더 간단한 셀렉터 사용)
-            app_name = ""
-            try:
-                app_name = await page.locator("h1 span").first.text_content(timeout=5000) or ""
-            except:
-                try:
-                    app_name = await page.locator("h1").first.text_content(timeout=5000) or ""
-                except:
-                    pass
-            
-            if not app_name:
-                raise Exception(f"앱을 찾을 수 없습니다. 앱 ID를 확인해주세요: {app_id}")
-            
-            # 리뷰수 추출
-            review_count = "정보 없음"
-            try:
-                # 여러 가능한 셀렉터 시도
-                selectors = [
-                    "div.g1rdde",
-                    "[aria-label*='리뷰']",
-                    "div:has-text('리뷰')"
-                ]
-                for selector in selectors:
-                    try:
-                        text = await page.locator(selector).first.text_content(timeout=3000)
-                        if text and any(char.isdigit() for char in text):
-                            review_count = text.strip()
-                            break
-                    except:
-                        continue
-            except:
-                pass
-            
-            # 별점 추출
-            rating = "정보 없음"
+        await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+    except PlaywrightTimeoutError:
+        raise
+    except PlaywrightError as e:
+        # DNS 실패, 연결 끊김 등 (net::ERR_...)
+        raise TransientCrawlError(f"페이지에 연결할 수 없습니다. 네트워크 연결을 확인해주세요: {str(e)}")
+
+    # 고정 sleep 대신 실제 콘텐츠(앱 제목)가 나타날 때까지 대기
+    try:
+        await page.wait_for_selector("h1", timeout=15000)
+    except PlaywrightTimeoutError:
+        # 존재하지 않는 앱은 제목이 없음 - 추출 단계에서 안내 메시지로 처리
+        pass
+
+# 앱 상세 페이지의 헤더 정보를 한 번의 evaluate로 수집합니다.
+# 리뷰수/다운로드수는 셀렉터 우선순위대로 숫자가 포함된 첫 텍스트를 사용하고,
+# 찾지 못하면 키워드와 숫자를 함께 포함한 가장 안쪽 div를 사용합니다.
+_APP_INFO_JS = r"""
+() => {
+    const text = el => ((el && el.textContent) || "").trim();
+    const hasDigit = s => /\d/.test(s);
+    const pick = (selectors, keyword) => {
+        for (const selector of selectors) {
+            const value = text(document.querySelector(selector));
+            if (hasDigit(value)) return value;
+        }
+        for (const el of document.querySelectorAll("div")) {
+            if (el.childElementCount > 0) continue;
+            const value = text(el);
+            if (value.includes(keyword) && hasDigit(value)) return value;
+        }
+        return null;
+    };
+    const title = document.querySelector("h1 span") || document.querySelector("h1");
+    return {
+        app_name: text(title),
+        review_count: pick(["div.g1rdde", "[aria-label*='리뷰']"], "리뷰"),
+        download_count: pick([
+            "div.JU1wdd > div > div > div:nth-child(2) > div.ClM7O",
+            "div.ClM7O",
+            "[aria-label*='다운로드']"
+        ], "다운로드"),
+        rating_labels: Array.from(document.querySelectorAll("div[role='img']"), el => el.getAttribute("aria-label") || "")
+            .filter(label => label.includes("별") || label.toLowerCase().includes("star"))
+    };
+}
+"""
+
+def _parse_app_rating(labels: List[str]) -> str:
+    """별점 이미지의 aria-label 목록에서 앱 평균 별점을 찾습니다."""
+    for aria_label in labels:
+        # "별표 5개 만점에 4.5개를 받았습니다" 형식
+        if "만점" in aria_label:
+            match = re.search(r'만점에\s*(\d+\.?\d*)', aria_label)
+            if match:
+                return match.group(1)
+
+        # "4.5점" 형식
+        match = re.search(r'(\d+\.?\d*)\s*점', aria_label)
+        if match and float(match.group(1)) <= 5:  # 별점은 5점 이하
+            return match.group(1)
+
+        # 소수점 숫자만 있는 경우 (예: "4.5")
+        match = re.search(r'(\d+\.\d+)', aria_label)
+        if match and float(match.group(1)) <= 5:
+            return match.group(1)
+
+    return "정보 없음"
+
+async def _extract_app_info(page: Page, app_id: str) -> Dict:
+    """열려 있는 앱 상세 페이지에서 앱 정보를 추출합니다."""
+    data = await page.evaluate(_APP_INFO_JS)
+
+    app_name = data.get("app_name") or ""
+    if not app_name:
+        raise Exception(f"앱을 찾을 수 없습니다. 앱 ID를 확인해주세요: {app_id}")
+
+    return {
+        "app_id": app_id,
+        "app_name": app_name.strip(),
+        "review_count": data.get("review_count") or "정보 없음",
+        "download_count": data.get("download_count") or "정보 없음",
+        "rating": _parse_app_rating(data.get("rating_labels") or [])
+    }
+
+REVIEW_DIALOG_SELECTOR = "div[role='dialog']"
+# 아직 추출하지 않은 리뷰 항목 (추출한 항목에는 data-crawled 속성을 붙임)
+PENDING_REVIEW_SELECTOR = "div.RHo1pe:not([data-crawled])"
+
+# 처리한 리뷰 노드는 마지막 하나만 남기고 제거해 DOM 크기를 일정하게 유지한 뒤
+# 리뷰 목록을 감싼 스크롤 영역을 끝까지 내려 다음 리뷰를 불러옵니다.
+_SCROLL_REVIEWS_JS = """
+() => {
+    const done = document.querySelectorAll("div[role='dialog'] div.RHo1pe[data-crawled]");
+    for (let i = 0; i < done.length - 1; i++) done[i].remove();
+    const last = done[done.length - 1];
+    if (!last) return false;
+    let el = last.parentElement;
+    while (el && el.scrollHeight <= el.clientHeight) el = el.parentElement;
+    if (!el) return false;
+    el.scrollTop = el.scrollHeight;
+    last.scrollIntoView({block: "end"});
+    return true;
+}
+"""
+
+# 리뷰 항목 최대 limit 개의 별점 라벨, 내용, 작성일을 한 번에 읽고 처리 표시를 남깁니다.
+_EXTRACT_REVIEWS_JS = """
+(els, limit) => {
+    const text = el => (el && el.textContent) || "";
+    const items = limit == null ? els : els.slice(0, limit);
+    return items.map(el => {
+        el.setAttribute("data-crawled", "1");
+        const ratingImg = el.querySelector("div[role='img']");
+        return {
+            rating_label: ratingImg ? ratingImg.getAttribute("aria-label") : null,
+            content: text(el.querySelector("div.h3YV2d") || el.querySelector("[class*='content']")),
+            date: text(el.querySelector("span.bp9Aid")),
+            review_id: (el.querySelector("[data-review-id]") || el).getAttribute("data-review-id"),
+            reviewer: text(el.querySelector("div.X5PpBb"))
+        };
+    });
+}
+"""
+
+_MARK_ALL_CRAWLED_JS = "els => els.forEach(el => el.setAttribute('data-crawled', '1'))"
+
+async def _open_review_dialog(page: Page) -> bool:
+    """리뷰 모두 보기 대화상자를 엽니다. 대화상자가 열리면 True를 반환합니다."""
+    try:
+        await page.locator("button:has-text('리뷰 모두 보기')").first.click(timeout=5000)
+        # 고정 sleep 대신 대화상자 안의 리뷰 항목이 렌더링될 때까지 대기
+        await page.wait_for_selector(f"{REVIEW_DIALOG_SELECTOR} div.RHo1pe", timeout=10000)
+        return True
+    except:
+        # 버튼이 없으면 페이지에 이미 리뷰가 표시되어 있음
+        try:
+            await page.wait_for_selector("div.RHo1pe", timeout=5000)
+        except:
+            pass
+        return False
+
+async def _sort_reviews_newest(page: Page):
+    """리뷰 대화상자의 정렬 기준을 최신순으로 바꿉니다."""
+    dialog = page.locator(REVIEW_DIALOG_SELECTOR).first
+    # 관련성순으로 표시된 기존 항목은 처리한 것으로 표시해 정렬 후 나타나는 항목만 추출
+    await dialog.locator("div.RHo1pe").evaluate_all(_MARK_ALL_CRAWLED_JS)
+
+    await dialog.locator("[aria-label*='정렬'], div[role='button']:has-text('관련성순')").first.click(timeout=5000)
+    await page.locator(
+        "[role='menuitemradio']:has-text('최신'), [role='menuitem']:has-text('최신')"
+    ).first.click(timeout=5000)
+    await page.wait_for_selector(f"{REVIEW_DIALOG_SELECTOR} {PENDING_REVIEW_SELECTOR}", timeout=10000)
+
+def _parse_review(raw: Dict) -> Optional[Dict]:
+    """페이지에서 읽은 리뷰 항목을 정리합니다. 내용이 없으면 None을 반환합니다."""
+    # 별점 추출
+    rating = 5.0  # 기본값
+    if raw.get("rating_label"):
+        match = re.search(r'(\d+)점', raw["rating_label"])
+        if match:
+            rating = float(match.group(1))
+
+    review_content = (raw.get("content") or "").strip()
+    if not review_content:  # 리뷰 내용이 있는 경우만 추가
+        return None
+
+    return {
+        "rating": rating,
+        "review_content": review_content,
+        "review_date": (raw.get("date") or "").strip() or "날짜 정보 없음",
+        # 같은 내용의 리뷰를 구분하기 위한 작성자 정보 (Play 리뷰 ID는 저장하지 않고 지문에만 사용)
+        "reviewer_name": (raw.get("reviewer") or "").strip() or None,
+        "review_id": raw.get("review_id") or None
+    }
+
+async def _iter_review_batches(
+    page: Page,
+    max_reviews: Optional[int] = None,
+    batch_size: int = 100,
+    newest_first: bool = False
+) -> AsyncIterator[List[Dict]]:
+    """
+    리뷰 대화상자를 스크롤하며 새로 나타난 리뷰만 추출해 batch_size 개씩 내보냅니다.
+    max_reviews가 None이면 더 이상 불러올 리뷰가 없을 때까지 계속합니다.
+    newest_first가 True이면 최신순으로 정렬한 뒤 추출하며, 정렬할 수 없으면 예외를 발생시킵니다.
+    """
+    in_dialog = await _open_review_dialog(page)
+    if newest_first:
+        try:
+            if not in_dialog:
+                raise Exception("리뷰 대화상자가 열리지 않았습니다.")
+            await _sort_reviews_newest(page)
+        except Exception as e:
+            raise Exception(f"리뷰를 최신순으로 정렬할 수 없습니다: {str(e)}")
+    scope = page.locator(REVIEW_DIALOG_SELECTOR).first if in_dialog else page
+    pending = scope.locator(PENDING_REVIEW_SELECTOR)
+
+    collected = 0
+    batch = []
+    idle_rounds = 0
+    first_round = True
+
+    while max_reviews is None or collected < max_reviews:
+        limit = None if max_reviews is None else max_reviews - collected
+        raw_items = await pending.evaluate_all(_EXTRACT_REVIEWS_JS, limit)
+        if first_round and not raw_items:
+            # 다른 셀렉터 시도 (스크롤 없이 한 번만)
+            raw_items = await page.locator("[class*='review']").evaluate_all(_EXTRACT_REVIEWS_JS, limit)
+            in_dialog = False
+        first_round = False
+
+        if raw_items:
+            idle_rounds = 0
+        for raw in raw_items:
+            review = _parse_review(raw)
+            if review:
+                batch.append(review)
+                collected += 1
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+
+        if not in_dialog or (max_reviews is not None and collected >= max_reviews):
+            break
+
+        # 다음 리뷰 불러오기
+        if not await page.evaluate(_SCROLL_REVIEWS_JS):
+            break
+        try:
+            await page.wait_for_selector(f"{REVIEW_DIALOG_SELECTOR} {PENDING_REVIEW_SELECTOR}", timeout=5000)
+        except PlaywrightTimeoutError:
+            idle_rounds += 1
+            if idle_rounds >= 3:  # 여러 번 스크롤해도 새 리뷰가 없으면 끝
+                break
+
+    if batch:
+        yield batch
+
+async def _extract_reviews(page: Page, max_reviews: int) -> List[Dict]:
+    """열려 있는 앱 상세 페이지에서 리뷰 대화상자를 열고 리뷰를 추출합니다."""
+    reviews = []
+    async for batch in _iter_review_batches(page, max_reviews=max_reviews):
+        reviews.extend(batch)
+
+    if not reviews:
+        raise Exception("리뷰를 찾을 수 없습니다. 이 앱에는 리뷰가 없거나 접근할 수 없습니다.")
+
+    return reviews
+
+async def crawl_app_with_reviews(
+    app_id: str,
+    max_reviews: int = 10,
+    profile: Optional[str] = None
+) -> Tuple[Dict, List[Dict]]:
+    """
+    앱 상세 페이지를 한 번만 열어 앱 정보와 리뷰를 함께 크롤링합니다.
+    Returns: (앱 정보, 리뷰 리스트)
+    """
+    try:
+        async with _crawl_page(profile) as page:
+            await _open_app_page(page, app_id)
+
             try:
-                # 모든 role='img' 요소를 찾아서 별점 확인
-                img_elements = await page.locator("div[role='img']").all()
-                
-                for element in img_elements:
-                    try:
-                        aria_label = await element.get_attribute("aria-label")
-                        if aria_label and ("별" in aria_label or "star" in aria_label.lower()):
-                            # "별표 5개 만점에 4.5개를 받았습니다" 형식
-                            if "만점" in aria_label:
-                                match = re.search(r'만점에\s*(\d+\.?\d*)', aria_label)
-                                if match:
-                                    rating = match.group(1)
-                                    break
-                            
-                            # "4.5점" 형식
-                            match = re.search(r'(\d+\.?\d*)\s*점', aria_label)
-                            if match:
-                                num = float(match.group(1))
-                                if num <= 5:  # 별점은 5점 이하
-                                    rating = match.group(1)
-                                    break
-                            
-                            # 소수점 숫자만 있는 경우 (예: "4.5")
-                            match = re.search(r'(\d+\.\d+)', aria_label)
-                            if match:
-                                num = float(match.group(1))
-                                if num <= 5:
-                                    rating = match.group(1)
-                                    break
-                    except:
-                        continue
-                    
+                app_info = await _extract_app_info(page, app_id)
             except Exception as e:
-                pass
-            
-            # 다운로드수 추출
-            download_count = "정보 없음"
+                raise Exception(f"앱 정보 크롤링 실패: {str(e)}")
+
             try:
-                # 대체 셀렉터 (더 안정적)
-                selectors = [
-                    "div.JU1wdd > div > div > div:nth-child(2) > div.ClM7O",
-                    "div.ClM7O",
-                    "[aria-label*='다운로드']",
-                    "div:has-text('다운로드')"
-                ]
-                
-                for selector in selectors:
-                    try:
-                        text = await page.locator(selector).first.text_content(timeout=2000)
-                        if text and any(char.isdigit() for char in text):
-                            download_count = text.strip()
-                            break
-                    except:
-                        continue
+                reviews = await _extract_reviews(page, max_reviews)
             except Exception as e:
-                pass
-            
-            result = {
-                "app_id": app_id,
-                "app_name": app_name.strip(),
-                "review_count": review_count,
-                "download_count": download_count,
-                "rating": rating
-            }
-            
-            await browser.close()
-            return result
-            
+                raise Exception(f"리뷰 크롤링 실패: {str(e)}")
+
+            return app_info, reviews
+
     except PlaywrightTimeoutError:
-        if browser:
-            await browser.close()
-        raise Exception(f"페이지 로딩 시간 초과. 네트워크 연결을 확인하거나 잠시 후 다시 시도해주세요.")
-    except Exception as e:
-        if browser:
-            await browser.close()
-        raise Exception(f"앱 정보 크롤링 실패: {str(e)}")
-
-async def crawl_app_reviews(app_id: str, max_reviews: int = 10) -> List[Dict]:
-    """Google Play Store에서 앱 리뷰를 크롤링합니다."""
-    browser = None
+        raise TransientCrawlError(f"페이지 로딩 시간 초과. 네트워크 연결을 확인하거나 잠시 후 다시 시도해주세요.")
+
+async def iter_app_reviews(
+    app_id: str,
+    max_reviews: Optional[int] = None,
+    batch_size: int = 100,
+    on_app_info: Optional[Callable[[Dict], Awaitable[None]]] = None,
+    newest_first: bool = False,
+    profile: Optional[str] = None
+) -> AsyncIterator[List[Dict]]:
+    """
+    리뷰 대화상자를 스크롤하며 리뷰를 batch_size 개씩 내보내는 비동기 제너레이터입니다.
+    이미 추출한 리뷰 노드는 페이지에서 제거하므로 리뷰 수와 관계없이 메모리 사용량이 일정합니다.
+
+    Args:
+        app_id: 앱 ID
+        max_reviews: 최대 수집 리뷰 수 (None이면 불러올 수 있는 만큼)
+        batch_size: 한 번에 내보낼 리뷰 수
+        on_app_info: 같은 페이지에서 추출한 앱 정보를 리뷰 수집 전에 전달받는 콜백
+        newest_first: 최신순으로 정렬해 수집 (증분 크롤링용)
+        profile: 크롤링 프로필 이름 (None이면 CRAWL_PROFILE 환경 변수 값)
+    """
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            page.set_default_timeout(15000)
-            
-            url = f"https://play.google.com/store/apps/details?id={app_id}&hl=ko&gl=KR&showAllReviews=true"
-            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            await asyncio.sleep(3)
-            
-            reviews = []
-            
-            try:
-                # 리뷰 섹션으로 스크롤
+        async with _crawl_page(profile) as page:
+            await _open_app_page(page, app_id)
+
+            if on_app_info:
                 try:
-                    await page.locator("button:has-text('리뷰 모두 보기')").first.click(timeout=5000)
-                    await asyncio.sleep(2)
-                except:
-                    # 버튼이 없으면 페이지에 이미 리뷰가 표시되어 있음
-                    pass
-                
-                # 리뷰 항목들 추출
-                review_items = await page.locator("div.RHo1pe").all()
-                
-                if not review_items:
-                    # 다른 셀렉터 시도
-                    review_items = await page.locator("[class*='review']").all()
-                
-                for idx, review_item in enumerate(review_items[:max_reviews]):
-                    try:
-                        # 별점 추출
-                        rating = 5.0  # 기본값
-                        try:
-                            rating_element = await review_item.locator("div[role='img']").first.get_attribute("aria-label", timeout=2000)
-                            if rating_element:
-                                match = re.search(r'(\d+)점', rating_element)
-                                if match:
-                                    rating = float(match.group(1))
-                        except:
-                            pass
-                        
-                        # 리뷰 내용 추출
-                        review_content = ""
-                        try:
-                            review_content = await review_item.locator("div.h3YV2d").first.text_content(timeout=2000) or ""
-                        except:
-                            try:
-                                review_content = await review_item.locator("[class*='content']").first.text_content(timeout=2000) or ""
-                            except:
-                                pass
-                        
-                        # 리뷰 작성일 추출
-                        review_date = "날짜 정보 없음"
-                        try:
-                            review_date = await review_item.locator("span.bp9Aid").first.text_content(timeout=2000) or "날짜 정보 없음"
-                        except:
-                            pass
-                        
-                        if review_content:  # 리뷰 내용이 있는 경우만 추가
-                            reviews.append({
-                                "rating": rating,
-                                "review_content": review_content.strip(),
-                                "review_date": review_date.strip()
-                            })
-                        
-                    except Exception as e:
-                        print(f"리뷰 {idx} 추출 중 오류 (건너뜀): {str(e)}")
-                        continue
-                
-                await browser.close()
-                
-                if not reviews:
-                    raise Exception("리뷰를 찾을 수 없습니다. 이 앱에는 리뷰가 없거나 접근할 수 없습니다.")
-                
-                return reviews
-                
-            except Exception as e:
-                await browser.close()
-                raise Exception(f"리뷰 크롤링 실패: {str(e)}")
-                
-    except PlaywrightTimeoutError:
-        if browser:
-            await browser.close()
-        raise Exception(f"리뷰 페이지 로딩 시간 초과. 네트워크 연결을 확인하거나 잠시 후 다시 시도해주세요.")
-    except Exception as e:
-        if browser:
-            await browser.close()
-        if "리뷰 크롤링 실패" in str(e):
-            raise
-        raise Exception(f"리뷰 크롤링 중 오류 발생: {str(e)}")
+                    app_info = await _extract_app_info(page, app_id)
+                except Exception as e:
+                    raise Exception(f"앱 정보 크롤링 실패: {str(e)}")
+                await on_app_info(app_info)
 
+            async for batch in _iter_review_batches(
+                page, max_reviews=max_reviews, batch_size=batch_size, newest_first=newest_first
+            ):
+                yield batch
 
+    except PlaywrightTimeoutError:
+        raise TransientCrawlError(f"페이지 로딩 시간 초과. 네트워크 연결을 확인하거나 잠시 후 다시 시도해주세요.")
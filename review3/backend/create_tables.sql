@@ -7,8 +7,15 @@ CREATE TABLE IF NOT EXISTS app_info (
     review_count VARCHAR,
     download_count VARCHAR,
     rating VARCHAR,
+    review_count_value BIGINT,
+    download_count_value BIGINT,
+    rating_value FLOAT,
     overall_analysis TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_refreshed_at TIMESTAMP,
+    last_refresh_attempt_at TIMESTAMP,
+    refresh_failures INTEGER DEFAULT 0,
+    refresh_resume_hash VARCHAR(64)
 );
 
 -- 인덱스 생성
@@ -21,13 +28,92 @@ CREATE TABLE IF NOT EXISTS app_review (
     rating FLOAT,
     review_content TEXT,
     review_date VARCHAR,
+    reviewer_name VARCHAR,
+    review_date_value DATE,
     individual_analysis TEXT,
+    sentiment VARCHAR,
+    content_hash VARCHAR(64),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT fk_app_review_app_info FOREIGN KEY (app_id) REFERENCES app_info(app_id) ON DELETE CASCADE
 );
 
 -- 인덱스 생성
 CREATE INDEX IF NOT EXISTS idx_app_review_app_id ON app_review(app_id);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_app_review_app_id_content_hash ON app_review(app_id, content_hash);
+CREATE INDEX IF NOT EXISTS ix_app_review_app_id_id ON app_review(app_id, id);
+CREATE INDEX IF NOT EXISTS ix_app_review_app_id_rating_id ON app_review(app_id, rating, id);
+CREATE INDEX IF NOT EXISTS ix_app_review_app_id_review_date_value ON app_review(app_id, review_date_value, id);
+
+-- job 테이블 (백그라운드 작업 큐)
+CREATE TABLE IF NOT EXISTS job (
+    id VARCHAR PRIMARY KEY,
+    kind VARCHAR NOT NULL,
+    status VARCHAR NOT NULL DEFAULT 'queued',
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+-- 인덱스 생성
+CREATE INDEX IF NOT EXISTS ix_job_status ON job(status);
+CREATE INDEX IF NOT EXISTS ix_job_created_at ON job(created_at);
+
+-- analysis_cache 테이블 (Gemini 분석 결과 캐시)
+CREATE TABLE IF NOT EXISTS analysis_cache (
+    key VARCHAR(64) PRIMARY KEY,
+    kind VARCHAR NOT NULL,
+    value TEXT NOT NULL,
+    hit_count INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_accessed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 인덱스 생성
+CREATE INDEX IF NOT EXISTS ix_analysis_cache_created_at ON analysis_cache(created_at);
+CREATE INDEX IF NOT EXISTS ix_analysis_cache_last_accessed_at ON analysis_cache(last_accessed_at);
+
+-- review_token 테이블 (토픽 모델링 형태소 분석 결과 캐시)
+CREATE TABLE IF NOT EXISTS review_token (
+    text_hash VARCHAR(64) NOT NULL,
+    tokenizer_version VARCHAR NOT NULL,
+    tokens TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (text_hash, tokenizer_version)
+);
+
+-- topic_model 테이블 (앱별 학습된 토픽 모델)
+CREATE TABLE IF NOT EXISTS topic_model (
+    app_id VARCHAR PRIMARY KEY,
+    config VARCHAR NOT NULL,
+    fingerprint VARCHAR(64) NOT NULL,
+    review_ids TEXT NOT NULL,
+    fitted_review_count INTEGER NOT NULL,
+    model BYTEA NOT NULL,
+    result TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT fk_topic_model_app_info FOREIGN KEY (app_id) REFERENCES app_info(app_id) ON DELETE CASCADE
+);
+
+-- review_stat 테이블 (앱별 작성일·별점·감정 리뷰 수 요약)
+CREATE TABLE IF NOT EXISTS review_stat (
+    id SERIAL PRIMARY KEY,
+    app_id VARCHAR NOT NULL,
+    review_day DATE,
+    rating INTEGER,
+    sentiment VARCHAR,
+    review_count INTEGER NOT NULL,
+    CONSTRAINT fk_review_stat_app_info FOREIGN KEY (app_id) REFERENCES app_info(app_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS ix_review_stat_app_id_review_day ON review_stat(app_id, review_day);
+
+-- 리뷰 내용 검색 (GET /api/reviews/search) - ILIKE 검색을 trigram 인덱스로 가속
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS ix_app_review_content_trgm ON app_review USING gin (review_content gin_trgm_ops);
 
 -- 테이블 생성 확인
 SELECT 'Tables created successfully!' AS status;
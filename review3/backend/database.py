@@ -1,7 +1,14 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, func, inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from models import Base
+from models import Base, AppInfo, AppReview, ReviewStat, review_fingerprint
+from review_search import backfill_search_index, ensure_search_index, unindex_reviews
+from review_stats import refresh_review_stats
+from value_parsers import app_metric_values, parse_review_date, parse_sentiment
 import os
+import threading
+from collections import Counter
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -15,19 +22,316 @@ DB_PATH = BASE_DIR / "app_review.db"
 # DATABASE_URL 환경 변수가 있으면 사용, 없으면 SQLite 사용
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DB_PATH}")
 
-# SQLite 사용 시 추가 설정
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False}
-    )
-else:
-    engine = create_engine(DATABASE_URL)
+# 커넥션 풀 설정 (메모리 SQLite를 제외한 모든 DB)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# 원격 DB가 유휴 연결을 끊기 전에 재연결하도록 연결 수명(초) 제한
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# SQLite 설정
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "20000"))
+
+# async def 핸들러용 비동기 드라이버 (동기 URL의 드라이버만 바꿔 같은 DB에 연결)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+# 커넥션 풀 이벤트 누적 횟수 (/api/db/pool, 엔진별)
+_pool_events = {"sync": Counter(), "async": Counter()}
+_pool_events_lock = threading.Lock()
+
+def _count_pool_event(label: str, name: str):
+    with _pool_events_lock:
+        _pool_events[label][name] += 1
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url.split("://")[1] in ("", "/:memory:") or "mode=memory" in url
+
+def to_async_url(url: str) -> str:
+    """동기 DB URL을 같은 DB의 비동기 드라이버 URL로 바꿉니다."""
+    scheme, _, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(
+            f"비동기 드라이버를 알 수 없는 DB입니다: {dialect} (ASYNC_DATABASE_URL 환경 변수로 직접 지정하세요)"
+        )
+    return f"{ASYNC_DRIVERS[dialect]}://{rest}"
+
+# ASYNC_DATABASE_URL 환경 변수가 없으면 DATABASE_URL에서 만듦
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+def _apply_sqlite_pragmas(dbapi_connection, url: str):
+    cursor = dbapi_connection.cursor()
+    try:
+        if not _is_memory_sqlite(url):
+            # WAL: 쓰기 중에도 읽기가 막히지 않음 (DB 파일에 한 번 설정하면 유지됨)
+            cursor.execute("PRAGMA journal_mode=WAL")
+            # WAL 모드에서는 NORMAL로도 DB가 손상되지 않음 (전원 장애 시 마지막 트랜잭션만 유실 가능)
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        # 다른 연결이 쓰는 중이면 바로 "database is locked" 오류를 내지 않고 기다림
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+def _engine_options(url: str) -> dict:
+    """
+    DB 종류에 맞는 커넥션 풀과 연결 옵션 (동기/비동기 엔진 공통)
+    - SQLite: 파일 DB만 풀 크기/대기 시간 설정 (메모리 DB는 드라이버 기본 풀 사용)
+    - 원격 DB (PostgreSQL 등): 풀 크기/오버플로/대기 시간, pre-ping, recycle
+    """
+    if url.startswith("sqlite"):
+        if _is_memory_sqlite(url):
+            # 메모리 DB는 연결마다 별도 DB가 되므로 기본 풀(연결 하나 공유) 사용
+            return {"connect_args": {"check_same_thread": False}}
+        return {
+            "connect_args": {"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+        }
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        # 끊어진 연결(원격 DB 재시작, 유휴 연결 종료)을 사용 전에 확인해 재연결
+        "pool_pre_ping": True,
+    }
+
+def _install_engine_events(engine: Engine, url: str, label: str):
+    """SQLite PRAGMA 적용과 풀 이벤트 집계 리스너를 등록합니다."""
+    if url.startswith("sqlite"):
+        @event.listens_for(engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            _apply_sqlite_pragmas(dbapi_connection, url)
+
+    for name in ("connect", "checkout", "checkin", "invalidate"):
+        event.listen(engine, name, lambda *args, _name=name: _count_pool_event(label, _name))
+
+def create_db_engine(url: str) -> Engine:
+    """DB 종류에 맞게 커넥션 풀과 연결 옵션을 설정한 엔진을 만듭니다."""
+    engine = create_engine(url, **_engine_options(url))
+    _install_engine_events(engine, url, "sync")
+    return engine
+
+def create_async_db_engine(url: str) -> AsyncEngine:
+    """
+    async def 핸들러용 비동기 엔진을 만듭니다 (aiosqlite / asyncpg).
+    메모리 SQLite는 동기 엔진과 다른 DB가 되므로 파일 DB나 원격 DB에서만 사용하세요.
+    """
+    options = _engine_options(url)
+    if url.startswith("postgresql+asyncpg"):
+        # Supabase 풀러(pgbouncer 트랜잭션 모드)는 연결 간에 prepared statement를 유지하지 못하므로 캐시 비활성화
+        options["connect_args"] = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    async_engine = create_async_engine(url, **options)
+    # 이벤트 리스너는 비동기 엔진이 감싸고 있는 동기 엔진에 등록
+    _install_engine_events(async_engine.sync_engine, url, "async")
+    return async_engine
+
+engine = create_db_engine(DATABASE_URL)
+async_engine = create_async_db_engine(ASYNC_DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# commit 후 속성을 다시 읽으면 이벤트 루프 밖에서 암묵적 I/O가 일어나므로 만료시키지 않음
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+def _migrate_schema():
+    """
+    기존 테이블에 모델에 새로 추가된 컬럼과 인덱스를 만듭니다.
+    create_all은 이미 존재하는 테이블을 변경하지 않기 때문에 필요합니다.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                print(f"[DB] {table.name}.{column.name} 컬럼 추가")
+            for index in table.indexes:
+                # 유니크 인덱스는 기존 중복 행을 지운 뒤 만듦 (_ensure_unique_review_hash)
+                if index.unique:
+                    continue
+                index.create(bind=conn, checkfirst=True)
+
+def _backfill_content_hash(chunk_size: int = 1000):
+    """content_hash가 비어 있는 기존 리뷰의 지문을 채웁니다."""
+    db = SessionLocal()
+    try:
+        while True:
+            reviews = (
+                db.query(AppReview)
+                .filter(AppReview.content_hash.is_(None))
+                .limit(chunk_size)
+                .all()
+            )
+            if not reviews:
+                break
+            for review in reviews:
+                review.content_hash = review_fingerprint(
+                    review.review_date, review.rating, review.review_content, review.reviewer_name
+                )
+            db.commit()
+    finally:
+        db.close()
+
+def _ensure_unique_review_hash(chunk_size: int = 1000):
+    """
+    같은 앱에 중복 저장된 리뷰(content_hash 기준)를 가장 먼저 저장된 것만 남기고 지운 뒤
+    (app_id, content_hash) 유니크 인덱스를 만듭니다. 이전의 일반 인덱스는 삭제합니다.
+    """
+    unique_index = next(index for index in AppReview.__table__.indexes if index.name == "ux_app_review_app_id_content_hash")
+    if unique_index.name in {index["name"] for index in inspect(engine).get_indexes("app_review")}:
+        return
+
+    db = SessionLocal()
+    try:
+        kept = (
+            select(func.min(AppReview.id))
+            .where(AppReview.content_hash.isnot(None))
+            .group_by(AppReview.app_id, AppReview.content_hash)
+        )
+        duplicates = db.execute(
+            select(AppReview.id, AppReview.app_id)
+            .where(AppReview.content_hash.isnot(None), AppReview.id.notin_(kept))
+        ).all()
+        for start in range(0, len(duplicates), chunk_size):
+            chunk = [review_id for review_id, _ in duplicates[start:start + chunk_size]]
+            unindex_reviews(db, chunk)
+            db.query(AppReview).filter(AppReview.id.in_(chunk)).delete(synchronize_session=False)
+        for app_id in {app_id for _, app_id in duplicates}:
+            refresh_review_stats(db, app_id)
+        db.commit()
+        if duplicates:
+            print(f"[DB] 중복 저장된 리뷰 {len(duplicates)}개 삭제")
+    finally:
+        db.close()
+
+    with engine.begin() as conn:
+        unique_index.create(bind=conn, checkfirst=True)
+        conn.execute(text("DROP INDEX IF EXISTS ix_app_review_app_id_content_hash"))
+
+def _backfill_typed_values(chunk_size: int = 1000):
+    """
+    파싱한 숫자/날짜 컬럼이 비어 있는 기존 앱과 리뷰의 값을 채웁니다.
+    해석할 수 없는 값은 NULL로 남으므로 id 순서로 한 번씩만 확인합니다.
+    """
+    db = SessionLocal()
+    try:
+        apps = (
+            db.query(AppInfo)
+            .filter(AppInfo.review_count_value.is_(None), AppInfo.download_count_value.is_(None))
+            .all()
+        )
+        for app in apps:
+            for name, value in app_metric_values(
+                {"review_count": app.review_count, "download_count": app.download_count, "rating": app.rating}
+            ).items():
+                setattr(app, name, value)
+        db.commit()
+
+        last_id = 0
+        while True:
+            rows = (
+                db.query(AppReview.id, AppReview.review_date)
+                .filter(AppReview.id > last_id, AppReview.review_date_value.is_(None), AppReview.review_date.isnot(None))
+                .order_by(AppReview.id)
+                .limit(chunk_size)
+                .all()
+            )
+            if not rows:
+                break
+            last_id = rows[-1].id
+            updates = [
+                {"id": row.id, "review_date_value": parsed}
+                for row in rows
+                if (parsed := parse_review_date(row.review_date)) is not None
+            ]
+            if updates:
+                db.bulk_update_mappings(AppReview, updates)
+            db.commit()
+    finally:
+        db.close()
+
+def _backfill_review_stats(chunk_size: int = 1000):
+    """분석 결과에서 감정을 채우고, 통계 요약이 없는 앱의 review_stat을 만듭니다."""
+    db = SessionLocal()
+    try:
+        while True:
+            reviews = (
+                db.query(AppReview)
+                .filter(AppReview.individual_analysis.isnot(None), AppReview.sentiment.is_(None))
+                .limit(chunk_size)
+                .all()
+            )
+            if not reviews:
+                break
+            for review in reviews:
+                review.sentiment = parse_sentiment(review.individual_analysis)
+            db.commit()
+
+        summarized = db.query(ReviewStat.app_id).distinct()
+        missing = db.query(AppReview.app_id).filter(AppReview.app_id.notin_(summarized)).distinct().all()
+        for (app_id,) in missing:
+            refresh_review_stats(db, app_id)
+            db.commit()
+    finally:
+        db.close()
+
+def _init_search_index():
+    """리뷰 검색 색인을 만들고 색인에 없는 기존 리뷰를 추가합니다."""
+    db = SessionLocal()
+    try:
+        if ensure_search_index(db):
+            added = backfill_search_index(db)
+            if added:
+                print(f"[DB] 검색 색인에 리뷰 {added}개 추가")
+    finally:
+        db.close()
+
+def _pool_snapshot(engine: Engine, label: str) -> dict:
+    pool = engine.pool
+    status = {
+        "dialect": engine.dialect.name,
+        "driver": engine.dialect.driver,
+        "pool_class": type(pool).__name__,
+        "status": pool.status(),
+    }
+    # QueuePool 계열만 크기/사용 중 연결 수를 제공
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        if hasattr(pool, name):
+            status[name] = getattr(pool, name)()
+    if hasattr(pool, "timeout"):
+        status["max_overflow"] = DB_MAX_OVERFLOW
+        status["timeout"] = pool.timeout()
+    with _pool_events_lock:
+        status["events"] = dict(_pool_events[label])
+    return status
+
+def pool_status() -> dict:
+    """동기/비동기 엔진의 커넥션 풀 현재 상태와 이벤트 누적 횟수"""
+    return {
+        **_pool_snapshot(engine, "sync"),
+        "async": _pool_snapshot(async_engine.sync_engine, "async"),
+    }
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    _migrate_schema()
+    _backfill_content_hash()
+    _backfill_typed_values()
+    _ensure_unique_review_hash()
+    _backfill_review_stats()
+    _init_search_index()
 
 def get_db():
     db = SessionLocal()
@@ -36,3 +340,7 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """async def 핸들러용 비동기 세션"""
+    async with AsyncSessionLocal() as db:
+        yield db
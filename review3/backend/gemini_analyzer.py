@@ -1,8 +1,16 @@
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+import asyncio
+import json
 import os
+import random
+import threading
+import time
 from typing import List, Dict
 from dotenv import load_dotenv
 
+from analysis_cache import analysis_cache, is_failure, make_key
+
 load_dotenv()
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
@@ -11,17 +19,64 @@ if not GEMINI_API_KEY:
 
 genai.configure(api_key=GEMINI_API_KEY)
 
-def analyze_reviews_overall(reviews: List[Dict]) -> str:
-    """전체 리뷰를 분석합니다."""
-    model = genai.GenerativeModel('gemini-2.5-flash')
-    
+MODEL_NAME = 'gemini-2.5-flash'
+# 프롬프트 템플릿을 바꾸면 버전을 올려 이전 캐시 결과를 사용하지 않도록 함
+OVERALL_PROMPT_VERSION = "overall-v1"
+INDIVIDUAL_PROMPT_VERSION = "individual-batch-v2"
+
+# 한 번의 요청에 묶어 보낼 개별 리뷰 수
+BATCH_SIZE = int(os.getenv("GEMINI_BATCH_SIZE", "20"))
+# 동시에 진행할 Gemini 요청 수
+MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+# 분당 요청 한도 (토큰 버킷 충전 속도)
+REQUESTS_PER_MINUTE = float(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "60"))
+MAX_RETRIES = 4
+
+# 재시도하면 성공할 수 있는 오류 (요청 한도 초과, 일시적 서버 오류)
+RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+)
+
+class TokenBucket:
+    """
+    요청 속도 제한용 토큰 버킷
+    토큰이 부족하면 미리 예약하고 충전될 때까지 기다립니다 (여러 스레드/이벤트 루프에서 공유 가능).
+    """
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+rate_limiter = TokenBucket(REQUESTS_PER_MINUTE / 60.0, capacity=max(1.0, MAX_CONCURRENCY))
+
+def _build_overall_prompt(reviews: List[Dict]) -> str:
     # 리뷰 텍스트 조합
     reviews_text = "\n\n".join([
         f"별점: {review['rating']}점\n날짜: {review['review_date']}\n내용: {review['review_content']}"
         for review in reviews
     ])
-    
-    prompt = f"""
+
+    return f"""
 다음은 앱에 대한 사용자 리뷰들입니다. 전체적인 분석을 제공해주세요.
 
 {reviews_text}
@@ -35,49 +90,139 @@ def analyze_reviews_overall(reviews: List[Dict]) -> str:
 
 분석 결과를 한국어로 작성해주세요.
 """
-    
-    try:
-        response = model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        return f"전체 분석 실패: {str(e)}"
 
-def analyze_review_individual(review: Dict) -> str:
-    """개별 리뷰를 분석합니다."""
-    model = genai.GenerativeModel('gemini-2.5-flash')
-    
-    prompt = f"""
-다음 앱 리뷰를 분석해주세요:
+def _build_batch_prompt(reviews: List[Dict]) -> str:
+    # 작성일은 분석에 영향이 없으므로 제외 - 같은 별점/내용의 리뷰는 결과를 공유(캐시)
+    reviews_text = "\n\n".join([
+        f"[{idx}]\n별점: {review['rating']}점\n내용: {review['review_content']}"
+        for idx, review in enumerate(reviews, start=1)
+    ])
 
-별점: {review['rating']}점
-날짜: {review['review_date']}
-내용: {review['review_content']}
+    return f"""
+다음 앱 리뷰 {len(reviews)}개를 각각 분석해주세요:
 
-다음 항목들을 간단히 분석해주세요:
+{reviews_text}
+
+각 리뷰마다 다음 항목들을 간단히 분석해주세요:
 1. 감정 분석 (긍정/부정/중립)
 2. 주요 언급 내용 (기능, 성능, UI/UX, 버그 등)
 3. 핵심 요약 (1-2문장)
 
-분석 결과를 한국어로 간결하게 작성해주세요.
+결과는 JSON 배열로만 응답해주세요. 각 원소는 {{"index": 리뷰 번호, "analysis": "분석 결과"}} 형식이며,
+분석 결과는 위 세 항목을 한국어로 간결하게 작성한 문자열입니다.
 """
-    
+
+async def _generate_async(prompt: str, json_output: bool = False) -> str:
+    """요청 속도 제한을 지키며 Gemini를 호출하고, 한도 초과 등 일시적 오류는 지수 백오프로 재시도합니다."""
+    model = genai.GenerativeModel(MODEL_NAME)
+    generation_config = {"response_mime_type": "application/json"} if json_output else None
+
+    attempt = 0
+    while True:
+        await rate_limiter.acquire()
+        try:
+            response = await model.generate_content_async(prompt, generation_config=generation_config)
+            return response.text
+        except RETRYABLE_ERRORS:
+            attempt += 1
+            if attempt > MAX_RETRIES:
+                raise
+            delay = 2 ** attempt
+            await asyncio.sleep(delay + random.uniform(0, 1))
+
+def _parse_batch_response(text: str, size: int) -> List[str]:
+    """배치 분석 JSON 응답을 리뷰 순서대로 정리합니다."""
+    data = json.loads(text)
+    if isinstance(data, dict):
+        # {"results": [...]} 처럼 감싸서 응답한 경우
+        data = next((value for value in data.values() if isinstance(value, list)), [])
+
+    analyses = {}
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        try:
+            index = int(item.get("index"))
+        except (TypeError, ValueError):
+            continue
+        analysis = item.get("analysis")
+        if not isinstance(analysis, str):
+            analysis = json.dumps(analysis, ensure_ascii=False)
+        analyses[index] = analysis.strip()
+
+    return [
+        analyses.get(idx, "개별 분석 실패: 응답에 이 리뷰의 분석 결과가 없습니다.")
+        for idx in range(1, size + 1)
+    ]
+
+async def analyze_reviews_overall_async(reviews: List[Dict]) -> str:
+    """전체 리뷰를 비동기로 분석합니다."""
     try:
-        response = model.generate_content(prompt)
-        return response.text
+        return await _generate_async(_build_overall_prompt(reviews))
     except Exception as e:
-        return f"개별 분석 실패: {str(e)}"
+        return f"전체 분석 실패: {str(e)}"
+
+async def analyze_reviews_batch_async(reviews: List[Dict]) -> List[str]:
+    """여러 개별 리뷰를 한 번의 요청으로 분석합니다. 리뷰 순서대로 결과를 반환합니다."""
+    try:
+        text = await _generate_async(_build_batch_prompt(reviews), json_output=True)
+        return _parse_batch_response(text, len(reviews))
+    except Exception as e:
+        return [f"개별 분석 실패: {str(e)}"] * len(reviews)
+
+def _overall_cache_key(reviews: List[Dict]) -> str:
+    content = "\n".join(
+        f"{review['rating']}|{review['review_date']}|{review['review_content']}" for review in reviews
+    )
+    return make_key(MODEL_NAME, OVERALL_PROMPT_VERSION, "overall", content)
 
-def analyze_all_reviews(reviews: List[Dict]) -> tuple[str, List[str]]:
+def _individual_cache_key(review: Dict) -> str:
+    content = f"{float(review['rating'] or 0):.1f}|{review['review_content']}"
+    return make_key(MODEL_NAME, INDIVIDUAL_PROMPT_VERSION, "individual", content)
+
+async def analyze_all_reviews_async(reviews: List[Dict]) -> tuple[str, List[str]]:
     """
-    전체 리뷰와 개별 리뷰를 모두 분석합니다.
+    전체 분석과 배치 단위 개별 분석을 동시에 실행합니다.
+    캐시에 있는 결과는 재사용하고, 같은 별점/내용의 리뷰는 한 번만 분석합니다.
     Returns: (전체 분석 결과, 개별 분석 결과 리스트)
     """
-    overall_analysis = analyze_reviews_overall(reviews)
-    
-    individual_analyses = []
-    for review in reviews:
-        individual_analysis = analyze_review_individual(review)
-        individual_analyses.append(individual_analysis)
-    
-    return overall_analysis, individual_analyses
+    overall_key = _overall_cache_key(reviews)
+    individual_keys = [_individual_cache_key(review) for review in reviews]
+    # 캐시 조회/저장은 동기 DB 세션을 사용하므로 이벤트 루프를 막지 않도록 스레드에서 실행
+    cached = await asyncio.to_thread(analysis_cache.get_many, [overall_key, *individual_keys])
+
+    # 캐시에 없는 리뷰만 중복 없이 분석
+    missing: Dict[str, Dict] = {}
+    for key, review in zip(individual_keys, reviews):
+        if key not in cached and key not in missing:
+            missing[key] = review
+    missing_reviews = list(missing.values())
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+
+    async def limited(coro):
+        async with semaphore:
+            return await coro
 
+    async def cached_overall():
+        return cached[overall_key]
+
+    batches = [missing_reviews[i:i + BATCH_SIZE] for i in range(0, len(missing_reviews), BATCH_SIZE)]
+    overall_analysis, *batch_results = await asyncio.gather(
+        cached_overall() if overall_key in cached else limited(analyze_reviews_overall_async(reviews)),
+        *(limited(analyze_reviews_batch_async(batch)) for batch in batches)
+    )
+
+    fresh = dict(zip(missing, (analysis for batch in batch_results for analysis in batch)))
+
+    # 실패 메시지를 제외한 새 결과 저장
+    await asyncio.to_thread(
+        analysis_cache.put_many, "individual", {k: v for k, v in fresh.items() if not is_failure(v)}
+    )
+    if overall_key not in cached and not is_failure(overall_analysis):
+        await asyncio.to_thread(analysis_cache.put_many, "overall", {overall_key: overall_analysis})
+    await asyncio.to_thread(analysis_cache.evict_if_needed)
+
+    results = {**cached, **fresh}
+    individual_analyses = [results[key] for key in individual_keys]
+    return overall_analysis, individual_analyses
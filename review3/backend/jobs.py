@@ -0,0 +1,205 @@
+"""
+백그라운드 작업 큐 모듈
+
+크롤링, AI 분석, 토픽 모델링처럼 오래 걸리는 작업을 요청과 분리해 실행합니다.
+작업은 job 테이블에 저장되므로 서버가 재시작되어도 대기/실행 중이던 작업을 이어서 처리합니다.
+asyncio.Queue는 스레드 안전하지 않으므로 공개 메서드는 이벤트 루프에서 await 하고,
+job 테이블 읽기/쓰기는 이벤트 루프를 막지 않도록 asyncio.to_thread로 실행합니다.
+"""
+import asyncio
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import update
+
+from database import SessionLocal
+from models import Job
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+FINISHED_STATUSES = ("succeeded", "failed")
+
+
+def job_to_dict(job: Job) -> Dict[str, Any]:
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "payload": json.loads(job.payload) if job.payload else None,
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+class JobQueue:
+    """DB에 영속화되는 비동기 작업 큐"""
+
+    def __init__(self, workers: int = 2):
+        self.workers = workers
+        self._handlers: Dict[str, JobHandler] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._changed: Optional[asyncio.Condition] = None
+
+    def register(self, kind: str, handler: JobHandler):
+        """작업 종류별 실행 함수를 등록합니다. 핸들러는 JSON 직렬화 가능한 결과를 반환해야 합니다."""
+        self._handlers[kind] = handler
+
+    def _recover(self) -> List[tuple]:
+        db = SessionLocal()
+        try:
+            # 서버 종료로 중단된 작업은 처음부터 다시 실행
+            db.execute(update(Job).where(Job.status == "running").values(status="queued", started_at=None))
+            db.commit()
+            return db.query(Job.id).filter(Job.status == "queued").order_by(Job.created_at).all()
+        finally:
+            db.close()
+
+    async def start(self):
+        """중단된 작업을 복구하고 워커를 실행합니다."""
+        self._queue = asyncio.Queue()
+        self._changed = asyncio.Condition()
+
+        pending = await asyncio.to_thread(self._recover)
+        for (job_id,) in pending:
+            self._queue.put_nowait(job_id)
+        if pending:
+            print(f"[JobQueue] 대기 중인 작업 {len(pending)}개 복구")
+
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _create(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        db = SessionLocal()
+        try:
+            job = Job(
+                id=uuid.uuid4().hex,
+                kind=kind,
+                status="queued",
+                payload=json.dumps(payload, ensure_ascii=False),
+            )
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+            return job_to_dict(job)
+        finally:
+            db.close()
+
+    async def submit(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """작업을 저장하고 큐에 넣은 뒤 작업 정보를 반환합니다. 이벤트 루프에서 호출해야 합니다."""
+        if kind not in self._handlers:
+            raise ValueError(f"알 수 없는 작업 종류입니다: {kind}")
+
+        result = await asyncio.to_thread(self._create, kind, payload)
+        self._queue.put_nowait(result["id"])
+        return result
+
+    def _load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        db = SessionLocal()
+        try:
+            job = db.get(Job, job_id)
+            return job_to_dict(job) if job else None
+        finally:
+            db.close()
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._load, job_id)
+
+    async def events(self, job_id: str, heartbeat: float = 15.0) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        작업 상태가 바뀔 때마다 작업 정보를 내보냅니다. 완료되면 종료합니다.
+        heartbeat 초 동안 변화가 없으면 None을 내보내 연결을 유지합니다.
+        """
+        last_status = None
+        while True:
+            job = await self.get(job_id)
+            if job is None:
+                return
+            if job["status"] != last_status:
+                last_status = job["status"]
+                yield job
+                if last_status in FINISHED_STATUSES:
+                    return
+
+            async with self._changed:
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+
+    async def _notify(self):
+        async with self._changed:
+            self._changed.notify_all()
+
+    def _claim(self, job_id: str) -> Optional[Job]:
+        """queued 상태인 작업만 running으로 바꿔 가져옵니다 (중복 실행 방지)."""
+        db = SessionLocal()
+        try:
+            claimed = db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == "queued")
+                .values(status="running", started_at=datetime.utcnow())
+            )
+            db.commit()
+            if claimed.rowcount != 1:
+                return None
+            job = db.get(Job, job_id)
+            db.expunge(job)
+            return job
+        finally:
+            db.close()
+
+    def _finish(self, job_id: str, result: Any = None, error: Optional[str] = None):
+        db = SessionLocal()
+        try:
+            job = db.get(Job, job_id)
+            job.status = "failed" if error is not None else "succeeded"
+            job.result = json.dumps(result, ensure_ascii=False, default=str) if error is None else None
+            job.error = error
+            job.finished_at = datetime.utcnow()
+            db.commit()
+        finally:
+            db.close()
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = await asyncio.to_thread(self._claim, job_id)
+                if job is None:
+                    continue
+                await self._notify()
+
+                handler = self._handlers.get(job.kind)
+                try:
+                    if handler is None:
+                        raise ValueError(f"알 수 없는 작업 종류입니다: {job.kind}")
+                    result = await handler(json.loads(job.payload))
+                    await asyncio.to_thread(self._finish, job_id, result=result)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # HTTPException은 detail에 사용자용 메시지가 들어 있음
+                    await asyncio.to_thread(self._finish, job_id, error=str(getattr(e, "detail", None) or e))
+                await self._notify()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[JobQueue] 작업 {job_id} 처리 중 오류: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+
+# 애플리케이션 전역 작업 큐
+job_queue = JobQueue(workers=int(os.getenv("JOB_WORKERS", "2")))
@@ -1,21 +1,52 @@
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from contextlib import aclosing
+from datetime import date, datetime
+from typing import Any, Callable, List, Literal, Optional
+from urllib.parse import urlencode
 import asyncio
+import base64
+import json
 
-from database import get_db, init_db
-from models import AppInfo, AppReview
+from database import AsyncSessionLocal, SessionLocal, async_engine, get_async_db, get_db, init_db, pool_status
+from models import AppInfo, AppReview, ReviewStat, TopicModel, crawled_review_fingerprint
 from schemas import (
     AppInfoCreate, 
     AppInfoResponse, 
     AppReviewResponse, 
     AppDetailResponse,
-    AnalyzeRequest
+    AppStatsResponse,
+    AppSummaryResponse,
+    ReviewPageResponse,
+    ReviewSearchHit,
+    ReviewSearchResponse,
+    AnalyzeRequest,
+    TopicModelingRequest,
+    BatchCrawlRequest,
+    JobResponse,
+    RefreshRequest
 )
-from crawler import crawl_app_info, crawl_app_reviews
-from gemini_analyzer import analyze_all_reviews
-from topic_modeling import perform_topic_modeling
+from crawler import iter_app_reviews
+from browser_pool import browser_pool
+from crawl_profiles import metrics_snapshot
+from crawl_scheduler import run_batch_crawl
+from jobs import job_queue
+from refresh_scheduler import refresh_scheduler
+from gemini_analyzer import analyze_all_reviews_async
+from analysis_cache import analysis_cache
+from topic_model_store import model_app_topics
+from topic_modeling import render_chart
+from review_export import EXPORT_FORMATS, iter_export
+from response_cache import etag_matches, response_cache
+from review_ingest import insert_reviews
+from review_search import highlight_ranges, index_reviews, search_reviews, unindex_app_reviews
+from review_stats import app_review_stats, refresh_review_stats
+from value_parsers import app_metric_values, parse_review_date, parse_sentiment
 
 app = FastAPI(title="App Review Analyzer")
 
@@ -29,139 +60,589 @@ app.add_middleware(
 )
 
 @app.on_event("startup")
-def startup_event():
+async def startup_event():
     init_db()
+    # 크롤링용 Chromium은 서버 기동 시 한 번만 실행
+    # 실행하지 못해도(Chromium 미설치 등) 크롤링 외 API는 동작하고, 첫 크롤링 요청 때 다시 시도
+    try:
+        await browser_pool.start()
+    except Exception as e:
+        print(f"[BrowserPool] 브라우저를 실행하지 못했습니다. 첫 크롤링 요청 때 다시 시도합니다: {str(e)}")
+    await job_queue.start()
+    refresh_scheduler.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await refresh_scheduler.stop()
+    await job_queue.stop()
+    await browser_pool.stop()
+    await async_engine.dispose()
 
 @app.get("/")
 def read_root():
     return {"message": "App Review Analyzer API"}
 
-@app.post("/api/apps/crawl", response_model=AppDetailResponse)
-async def crawl_app(app_data: AppInfoCreate, db: Session = Depends(get_db)):
-    """앱 정보와 리뷰를 크롤링하여 저장합니다."""
-    try:
-        # 이미 존재하는지 확인
-        existing_app = db.query(AppInfo).filter(AppInfo.app_id == app_data.app_id).first()
-        if existing_app:
-            # 이미 등록된 앱이면 기존 데이터 반환
-            reviews = db.query(AppReview).filter(AppReview.app_id == app_data.app_id).all()
-            return AppDetailResponse(
-                app_info=AppInfoResponse.from_orm(existing_app),
-                reviews=[AppReviewResponse.from_orm(r) for r in reviews]
-            )
-        
-        # 1. 앱 정보 크롤링
-        app_info_data = await crawl_app_info(app_data.app_id)
-        
-        # 2. 앱 정보 저장
-        app_info = AppInfo(
-            app_id=app_info_data["app_id"],
-            app_name=app_info_data["app_name"],
-            review_count=app_info_data["review_count"],
-            download_count=app_info_data["download_count"],
-            rating=app_info_data.get("rating", "정보 없음")
+# 스크롤 크롤링 시 리뷰를 DB에 나눠 쓰는 단위
+REVIEW_WRITE_BATCH_SIZE = 100
+
+def _save_app_info(db: Session, app_info_data: dict) -> AppInfo:
+    """크롤링한 앱 정보를 저장합니다."""
+    app_info = AppInfo(
+        app_id=app_info_data["app_id"],
+        app_name=app_info_data["app_name"],
+        review_count=app_info_data["review_count"],
+        download_count=app_info_data["download_count"],
+        rating=app_info_data.get("rating", "정보 없음"),
+        **app_metric_values(app_info_data)
+    )
+    db.add(app_info)
+    db.commit()
+    db.refresh(app_info)
+    response_cache.invalidate(app_info.app_id)
+    return app_info
+
+def _save_reviews(db: Session, app_id: str, reviews_data: List[dict]) -> List[int]:
+    """크롤링한 리뷰를 일괄 저장하고 새로 저장된 리뷰 ID를 반환합니다 (이미 저장된 리뷰는 건너뜀)."""
+    review_ids = insert_reviews(db, app_id, reviews_data)
+    if review_ids:
+        index_reviews(db, review_ids)
+        # 새 리뷰의 작성일만 통계 다시 집계
+        refresh_review_stats(db, app_id, days={parse_review_date(r["review_date"]) for r in reviews_data})
+    db.commit()
+    if review_ids:
+        response_cache.invalidate(app_id)
+    return review_ids
+
+def _save_crawled_app(db: Session, app_info_data: dict, reviews_data: List[dict]):
+    """크롤링한 앱 정보와 리뷰를 저장합니다."""
+    app_info = _save_app_info(db, app_info_data)
+    # 처음 수집한 리뷰도 최신 상태이므로 자동 갱신 주기는 지금부터 계산 (리뷰와 함께 커밋)
+    app_info.last_refreshed_at = datetime.utcnow()
+    reviews = _save_reviews(db, app_info.app_id, reviews_data)
+    return app_info, reviews
+
+async def _load_reviews(db: AsyncSession, app_id: str) -> List[AppReview]:
+    return (await db.scalars(select(AppReview).where(AppReview.app_id == app_id))).all()
+
+async def _crawl_app(db: AsyncSession, app_id: str, max_reviews: int = 10) -> AppSummaryResponse:
+    """
+    앱 정보와 리뷰를 크롤링하여 저장하고 앱 정보와 저장된 리뷰 수를 반환합니다.
+    리뷰 목록은 크기가 클 수 있어 반환하지 않으므로 리뷰 페이지 조회 API로 가져옵니다.
+    Playwright를 기다리는 동안 다른 요청이 막히지 않도록 비동기 세션을 사용합니다.
+    """
+    # 이미 존재하는지 확인
+    existing_app = await db.scalar(select(AppInfo).where(AppInfo.app_id == app_id))
+    if existing_app:
+        # 이미 등록된 앱이면 기존 데이터 반환
+        stored, analyzed = (await db.execute(
+            select(func.count(AppReview.id), func.count(AppReview.individual_analysis))
+            .where(AppReview.app_id == app_id)
+        )).one()
+        return AppSummaryResponse(
+            app_info=AppInfoResponse.from_orm(existing_app),
+            stored_review_count=stored,
+            analyzed_review_count=analyzed
         )
-        db.add(app_info)
-        db.commit()
-        db.refresh(app_info)
-        
-        # 3. 리뷰 크롤링
-        reviews_data = await crawl_app_reviews(app_data.app_id, max_reviews=10)
-        
-        # 4. 리뷰 저장
-        reviews = []
-        for review_data in reviews_data:
-            review = AppReview(
-                app_id=app_data.app_id,
-                rating=review_data["rating"],
-                review_content=review_data["review_content"],
-                review_date=review_data["review_date"]
-            )
-            db.add(review)
-            reviews.append(review)
-        
-        db.commit()
-        for review in reviews:
-            db.refresh(review)
-        
-        return AppDetailResponse(
-            app_info=AppInfoResponse.from_orm(app_info),
-            reviews=[AppReviewResponse.from_orm(r) for r in reviews]
+    
+    # 1. 페이지를 한 번만 열어 앱 정보를 먼저 저장
+    saved = {}
+    
+    async def save_app_info(app_info_data: dict):
+        saved["app_info"] = await db.run_sync(_save_app_info, app_info_data)
+    
+    # 2. 리뷰 대화상자를 스크롤하며 추출한 리뷰를 배치 단위로 저장
+    extracted = 0
+    stored = 0
+    # 저장 중 예외가 나도 제너레이터를 바로 닫아 페이지를 브라우저 풀에 반납
+    async with aclosing(iter_app_reviews(
+        app_id,
+        max_reviews=max_reviews,
+        batch_size=REVIEW_WRITE_BATCH_SIZE,
+        on_app_info=save_app_info
+    )) as stream:
+        async for batch in stream:
+            extracted += len(batch)
+            # 동기 저장 함수(일괄 INSERT)를 비동기 연결 위에서 그대로 실행
+            stored += len(await db.run_sync(_save_reviews, app_id, batch))
+    
+    if not extracted:
+        raise Exception("리뷰 크롤링 실패: 리뷰를 찾을 수 없습니다. 이 앱에는 리뷰가 없거나 접근할 수 없습니다.")
+    
+    # 처음 수집한 리뷰도 최신 상태이므로 자동 갱신 주기는 지금부터 계산
+    saved["app_info"].last_refreshed_at = datetime.utcnow()
+    await db.commit()
+    
+    return AppSummaryResponse(
+        app_info=AppInfoResponse.from_orm(saved["app_info"]),
+        stored_review_count=stored,
+        analyzed_review_count=0
+    )
+
+async def _refresh_app(db: AsyncSession, app_id: str, max_new_reviews: int = 500) -> dict:
+    """
+    등록된 앱의 새 리뷰만 수집합니다.
+    최신순으로 크롤링하다가 이미 저장된 리뷰를 만나면 멈추고, 그 앞의 리뷰만 저장합니다.
+    새 리뷰가 max_new_reviews개를 넘으면 저장한 마지막 리뷰를 refresh_resume_hash에 기록하고 truncated를 반환합니다.
+    다음 갱신은 그 리뷰까지 이미 저장된 리뷰를 건너뛰고, 그 뒤에 처음 만나는 저장된 리뷰에서 멈춥니다.
+    """
+    app = await db.scalar(select(AppInfo).where(AppInfo.app_id == app_id))
+    if not app:
+        raise HTTPException(status_code=404, detail="앱을 찾을 수 없습니다.")
+    
+    async def update_app_info(app_info_data: dict):
+        # 리뷰수/다운로드수/별점 갱신
+        app.app_name = app_info_data["app_name"]
+        app.review_count = app_info_data["review_count"]
+        app.download_count = app_info_data["download_count"]
+        app.rating = app_info_data.get("rating", app.rating)
+        for name, value in app_metric_values(app_info_data).items():
+            setattr(app, name, value)
+        await db.commit()
+        response_cache.invalidate(app_id)
+    
+    # 자동 갱신 스케줄러가 실패한 앱을 바로 다시 시도하지 않도록 시도 시각을 먼저 기록
+    app.last_refresh_attempt_at = datetime.utcnow()
+    await db.commit()
+    
+    resume_hash = app.refresh_resume_hash
+    new_reviews = 0
+    collected = 0
+    last_saved_hash = None
+    truncated = False
+    # 경계 리뷰를 지나치게 많이 읽지 않도록 작은 배치로 확인 (개수 제한은 새 리뷰 수로 직접 확인)
+    reviews_stream = iter_app_reviews(
+        app_id,
+        batch_size=20,
+        on_app_info=update_app_info,
+        newest_first=True
+    )
+    try:
+        async with aclosing(reviews_stream):
+            async for batch in reviews_stream:
+                hashes = [crawled_review_fingerprint(r) for r in batch]
+                # 작성자 없이 저장된 기존 리뷰도 경계로 인식
+                legacy_hashes = [crawled_review_fingerprint(r, with_reviewer=False) for r in batch]
+                known = set(await db.scalars(
+                    select(AppReview.content_hash)
+                    .where(AppReview.app_id == app_id, AppReview.content_hash.in_(hashes + legacy_hashes))
+                ))
+                
+                fresh = []
+                reached_known = False
+                for review_data, content_hash, legacy_hash in zip(batch, hashes, legacy_hashes):
+                    if content_hash in known or legacy_hash in known:
+                        if resume_hash is None:
+                            reached_known = True
+                            break
+                        # 지난 갱신에서 멈춘 리뷰까지는 저장된 리뷰를 건너뜀
+                        if content_hash == resume_hash:
+                            resume_hash = None
+                        continue
+                    if collected >= max_new_reviews:
+                        truncated = True
+                        break
+                    fresh.append(review_data)
+                    collected += 1
+                    last_saved_hash = content_hash
+                
+                if fresh:
+                    new_reviews += len(await db.run_sync(_save_reviews, app_id, fresh))
+                if reached_known or truncated:
+                    break
+    except Exception:
+        await db.rollback()
+        await db.execute(
+            update(AppInfo)
+            .where(AppInfo.app_id == app_id)
+            .values(refresh_failures=func.coalesce(AppInfo.refresh_failures, 0) + 1)
         )
-        
+        await db.commit()
+        raise
+    
+    # 지난 멈춘 위치를 아직 지나지 못했으면 그 위치를 유지해야 사이의 리뷰를 놓치지 않음
+    app.refresh_resume_hash = (resume_hash or last_saved_hash) if truncated else None
+    if not truncated:
+        # 남은 리뷰가 있으면 갱신 시각을 앞당기지 않아 자동 갱신이 다음 확인 때 이어서 수집
+        app.last_refreshed_at = datetime.utcnow()
+    app.refresh_failures = 0
+    await db.commit()
+    response_cache.invalidate(app_id)
+    
+    message = f"새 리뷰 {new_reviews}개를 수집했습니다."
+    if truncated:
+        message += f" 최대 수집 개수({max_new_reviews}개)에 도달해 남은 리뷰는 다음 갱신 때 이어서 수집합니다."
+    return {
+        "message": message,
+        "new_reviews": new_reviews,
+        "truncated": truncated
+    }
+
+@app.post("/api/apps/crawl", response_model=AppSummaryResponse)
+async def crawl_app(app_data: AppInfoCreate, db: AsyncSession = Depends(get_async_db)):
+    """앱 정보와 리뷰를 크롤링하여 저장합니다."""
+    try:
+        return await _crawl_app(db, app_data.app_id, max_reviews=app_data.max_reviews)
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/apps/{app_id}/refresh")
+async def refresh_app(app_id: str, max_new_reviews: int = Query(500, ge=1, le=10000), db: AsyncSession = Depends(get_async_db)):
+    """등록된 앱의 새 리뷰만 증분 수집합니다."""
+    try:
+        return await _refresh_app(db, app_id, max_new_reviews=max_new_reviews)
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/apps/crawl/batch")
+async def crawl_apps_batch(request: BatchCrawlRequest):
+    """
+    여러 앱을 동시에 크롤링하여 저장합니다.
+    앱 하나가 끝날 때마다 진행 상황을 NDJSON 한 줄로 스트리밍합니다.
+    """
+    async def is_registered(app_id: str) -> bool:
+        async with AsyncSessionLocal() as db:
+            return await db.scalar(select(AppInfo.id).where(AppInfo.app_id == app_id)) is not None
+    
+    async def save(app_info_data: dict, reviews_data: List[dict]) -> int:
+        # 여러 앱이 동시에 저장되므로 비동기 세션을 공유하지 않고 앱마다 새로 엶
+        async with AsyncSessionLocal() as db:
+            try:
+                _, review_ids = await db.run_sync(_save_crawled_app, app_info_data, reviews_data)
+            except Exception:
+                await db.rollback()
+                raise
+        return len(review_ids)
+    
+    async def progress_stream():
+        summary = {"success": 0, "skipped": 0, "failed": 0}
+        async for event in run_batch_crawl(
+            request.app_ids,
+            on_crawled=save,
+            should_skip=is_registered,
+            concurrency=request.concurrency,
+            max_reviews=request.max_reviews,
+            max_retries=request.max_retries,
+        ):
+            summary[event["status"]] += 1
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+        
+        yield json.dumps({"status": "done", **summary}, ensure_ascii=False) + "\n"
+    
+    return StreamingResponse(progress_stream(), media_type="application/x-ndjson")
+
+@app.get("/api/crawler/metrics")
+def get_crawler_metrics():
+    """크롤링 프로필별 요청 차단/바이트 절약 통계와 브라우저 풀 상태를 조회합니다."""
+    return {
+        **metrics_snapshot(),
+        "browser_pool": browser_pool.status()
+    }
+
+@app.get("/api/db/pool")
+def get_db_pool_status():
+    """DB 커넥션 풀 상태(사용 중/대기 연결 수, 오버플로)와 연결 이벤트 누적 횟수를 조회합니다."""
+    return pool_status()
+
+def _cached_json(request: Request, build: Callable[[], Any], app_id: Optional[str] = None) -> Response:
+    """
+    조회 응답을 캐시에서 꺼내거나 build()로 만들어 저장하고 ETag를 붙여 반환합니다.
+    app_id를 지정하면 그 앱의 쓰기로, 지정하지 않으면 모든 앱의 쓰기로 무효화됩니다.
+    If-None-Match가 현재 ETag와 같으면 본문 없이 304를 반환합니다.
+    """
+    query = urlencode(sorted(request.query_params.multi_items()))
+    key = response_cache.key(request.url.path, query, app_id)
+    cached = response_cache.get(key)
+    if cached:
+        body, etag = cached
+    else:
+        body = json.dumps(
+            jsonable_encoder(build()), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+        etag = response_cache.put(key, body)
+    
+    # no-cache: 브라우저가 저장한 응답을 쓰기 전에 항상 ETag로 재검증
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        response_cache.record_not_modified()
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 @app.get("/api/apps", response_model=List[AppInfoResponse])
-def get_apps(db: Session = Depends(get_db)):
+def get_apps(request: Request, db: Session = Depends(get_db)):
     """모든 앱 정보를 조회합니다."""
-    apps = db.query(AppInfo).all()
-    return apps
+    def build():
+        return [AppInfoResponse.from_orm(app) for app in db.query(AppInfo).all()]
+    
+    return _cached_json(request, build)
 
 @app.get("/api/apps/{app_id}", response_model=AppDetailResponse)
-def get_app_detail(app_id: str, db: Session = Depends(get_db)):
+def get_app_detail(app_id: str, request: Request, db: Session = Depends(get_db)):
     """특정 앱의 상세 정보와 리뷰를 조회합니다."""
-    app = db.query(AppInfo).filter(AppInfo.app_id == app_id).first()
-    if not app:
+    def build():
+        app = db.query(AppInfo).filter(AppInfo.app_id == app_id).first()
+        if not app:
+            raise HTTPException(status_code=404, detail="앱을 찾을 수 없습니다.")
+        
+        reviews = db.query(AppReview).filter(AppReview.app_id == app_id).all()
+        
+        return AppDetailResponse(
+            app_info=AppInfoResponse.from_orm(app),
+            reviews=[AppReviewResponse.from_orm(r) for r in reviews]
+        )
+    
+    return _cached_json(request, build, app_id)
+
+@app.get("/api/apps/{app_id}/summary", response_model=AppSummaryResponse)
+def get_app_summary(app_id: str, request: Request, db: Session = Depends(get_db)):
+    """리뷰 없이 앱 정보와 저장된 리뷰 수만 조회합니다."""
+    def build():
+        app = db.query(AppInfo).filter(AppInfo.app_id == app_id).first()
+        if not app:
+            raise HTTPException(status_code=404, detail="앱을 찾을 수 없습니다.")
+        
+        stored, analyzed = (
+            db.query(func.count(AppReview.id), func.count(AppReview.individual_analysis))
+            .filter(AppReview.app_id == app_id)
+            .one()
+        )
+        
+        return AppSummaryResponse(
+            app_info=AppInfoResponse.from_orm(app),
+            stored_review_count=stored,
+            analyzed_review_count=analyzed
+        )
+    
+    return _cached_json(request, build, app_id)
+
+@app.get("/api/apps/{app_id}/stats", response_model=AppStatsResponse)
+def get_app_stats(
+    app_id: str,
+    request: Request,
+    granularity: Literal["day", "week", "month"] = "month",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_db)
+):
+    """별점/감정 분포와 기간별 리뷰 수를 요약 테이블에서 조회합니다 (기간은 리뷰 작성일 기준)."""
+    def build():
+        if not db.query(AppInfo.id).filter(AppInfo.app_id == app_id).first():
+            raise HTTPException(status_code=404, detail="앱을 찾을 수 없습니다.")
+        return AppStatsResponse(**app_review_stats(db, app_id, granularity, date_from, date_to))
+    
+    return _cached_json(request, build, app_id)
+
+# 정렬 방식별 (정렬 키 컬럼, 내림차순 여부) - id는 항상 마지막 키로 사용해 순서를 고정
+REVIEW_SORTS = {
+    "newest": ((AppReview.id,), True),
+    "oldest": ((AppReview.id,), False),
+    "rating_desc": ((AppReview.rating, AppReview.id), True),
+    "rating_asc": ((AppReview.rating, AppReview.id), False),
+}
+
+def _encode_cursor(values: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str, size: int) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="잘못된 cursor 값입니다.")
+    return values
+
+@app.get("/api/apps/{app_id}/reviews", response_model=ReviewPageResponse)
+def list_app_reviews(
+    app_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    sort: Literal["newest", "oldest", "rating_desc", "rating_asc"] = "newest",
+    min_rating: Optional[float] = Query(None, ge=0, le=5),
+    max_rating: Optional[float] = Query(None, ge=0, le=5),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    has_analysis: Optional[bool] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    앱 리뷰를 페이지 단위로 조회합니다 (키셋 페이지네이션).
+    date_from/date_to는 리뷰 작성일(review_date_value) 기준이며, 작성일을 해석하지 못한 리뷰는 제외됩니다.
+    """
+    if not db.query(AppInfo.id).filter(AppInfo.app_id == app_id).first():
         raise HTTPException(status_code=404, detail="앱을 찾을 수 없습니다.")
     
-    reviews = db.query(AppReview).filter(AppReview.app_id == app_id).all()
+    query = db.query(AppReview).filter(AppReview.app_id == app_id)
+    if min_rating is not None:
+        query = query.filter(AppReview.rating >= min_rating)
+    if max_rating is not None:
+        query = query.filter(AppReview.rating <= max_rating)
+    if date_from is not None:
+        query = query.filter(AppReview.review_date_value >= date_from)
+    if date_to is not None:
+        query = query.filter(AppReview.review_date_value <= date_to)
+    if has_analysis is not None:
+        analysis = AppReview.individual_analysis
+        query = query.filter(analysis.isnot(None) if has_analysis else analysis.is_(None))
+    
+    keys, descending = REVIEW_SORTS[sort]
+    if cursor:
+        # 이전 페이지 마지막 리뷰의 정렬 키 다음부터 조회
+        position = tuple_(*keys)
+        values = tuple_(*_decode_cursor(cursor, len(keys)))
+        query = query.filter(position < values if descending else position > values)
+    query = query.order_by(*(key.desc() if descending else key.asc() for key in keys))
+    
+    # 한 개 더 조회해 다음 페이지가 있는지 확인
+    reviews = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(reviews) > limit:
+        reviews = reviews[:limit]
+        next_cursor = _encode_cursor([getattr(reviews[-1], key.key) for key in keys])
+    
+    return ReviewPageResponse(
+        items=[AppReviewResponse.from_orm(r) for r in reviews],
+        next_cursor=next_cursor
+    )
+
+@app.get("/api/reviews/search", response_model=ReviewSearchResponse)
+def search_all_reviews(
+    q: str = Query(..., min_length=1, max_length=200),
+    app_id: Optional[str] = None,
+    min_rating: Optional[float] = Query(None, ge=0, le=5),
+    max_rating: Optional[float] = Query(None, ge=0, le=5),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    모든 앱(또는 app_id 앱)의 리뷰 내용을 검색합니다.
+    띄어쓰기로 구분한 검색어를 모두 포함하는 리뷰를 관련도순으로 반환합니다.
+    """
+    offset = _decode_cursor(cursor, 1)[0] if cursor else 0
+    if not isinstance(offset, int) or offset < 0:
+        raise HTTPException(status_code=400, detail="잘못된 cursor 값입니다.")
+    
+    try:
+        # 한 개 더 조회해 다음 페이지가 있는지 확인
+        hits, terms = search_reviews(
+            db, q, app_id=app_id, min_rating=min_rating, max_rating=max_rating, limit=limit + 1, offset=offset
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    next_cursor = None
+    if len(hits) > limit:
+        hits = hits[:limit]
+        next_cursor = _encode_cursor([offset + limit])
+    
+    return ReviewSearchResponse(
+        items=[
+            ReviewSearchHit(
+                **AppReviewResponse.from_orm(review).model_dump(),
+                score=score,
+                highlights=highlight_ranges(review.review_content, terms)
+            )
+            for review, score in hits
+        ],
+        next_cursor=next_cursor
+    )
+
+@app.get("/api/apps/{app_id}/export")
+def export_app_reviews(
+    app_id: str,
+    format: Literal["ndjson", "csv", "parquet"] = "ndjson",
+    gzip: bool = False,
+    db: Session = Depends(get_db)
+):
+    """앱 리뷰와 개별 분석 결과를 파일로 내보냅니다 (스트리밍, gzip=true면 압축)."""
+    if not db.query(AppInfo.id).filter(AppInfo.app_id == app_id).first():
+        raise HTTPException(status_code=404, detail="앱을 찾을 수 없습니다.")
+    
+    try:
+        chunks = iter_export(app_id, format, gzip=gzip)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    media_type, extension = EXPORT_FORMATS[format]
+    filename = f"{app_id}_reviews.{extension}"
+    if gzip:
+        media_type, filename = "application/gzip", filename + ".gz"
     
-    return AppDetailResponse(
-        app_info=AppInfoResponse.from_orm(app),
-        reviews=[AppReviewResponse.from_orm(r) for r in reviews]
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
     )
 
+async def _analyze_app(db: AsyncSession, app_id: str) -> dict:
+    """앱 리뷰를 AI로 분석하고 결과를 저장합니다."""
+    # 앱 정보 조회
+    app = await db.scalar(select(AppInfo).where(AppInfo.app_id == app_id))
+    if not app:
+        raise HTTPException(status_code=404, detail="앱을 찾을 수 없습니다.")
+    
+    # 리뷰 조회
+    reviews = await _load_reviews(db, app_id)
+    if not reviews:
+        raise HTTPException(status_code=404, detail="분석할 리뷰가 없습니다.")
+    
+    # 리뷰 데이터를 딕셔너리로 변환
+    reviews_data = [
+        {
+            "rating": r.rating,
+            "review_content": r.review_content,
+            "review_date": r.review_date
+        }
+        for r in reviews
+    ]
+    
+    # Gemini API로 분석 (전체 분석과 배치 단위 개별 분석을 동시에 실행)
+    overall_analysis, individual_analyses = await analyze_all_reviews_async(reviews_data)
+    
+    # 전체 분석 결과 저장
+    app.overall_analysis = overall_analysis
+    
+    # 개별 분석 결과 저장
+    for review, analysis in zip(reviews, individual_analyses):
+        review.individual_analysis = analysis
+        review.sentiment = parse_sentiment(analysis)
+    
+    await db.run_sync(refresh_review_stats, app_id)
+    await db.commit()
+    response_cache.invalidate(app_id)
+    
+    return {
+        "message": "분석이 완료되었습니다.",
+        "overall_analysis": overall_analysis
+    }
+
 @app.post("/api/apps/analyze")
-def analyze_app_reviews(request: AnalyzeRequest, db: Session = Depends(get_db)):
+async def analyze_app_reviews(request: AnalyzeRequest, db: AsyncSession = Depends(get_async_db)):
     """앱 리뷰를 AI로 분석합니다."""
     try:
-        # 앱 정보 조회
-        app = db.query(AppInfo).filter(AppInfo.app_id == request.app_id).first()
-        if not app:
-            raise HTTPException(status_code=404, detail="앱을 찾을 수 없습니다.")
-        
-        # 리뷰 조회
-        reviews = db.query(AppReview).filter(AppReview.app_id == request.app_id).all()
-        if not reviews:
-            raise HTTPException(status_code=404, detail="분석할 리뷰가 없습니다.")
-        
-        # 리뷰 데이터를 딕셔너리로 변환
-        reviews_data = [
-            {
-                "rating": r.rating,
-                "review_content": r.review_content,
-                "review_date": r.review_date
-            }
-            for r in reviews
-        ]
-        
-        # Gemini API로 분석
-        overall_analysis, individual_analyses = analyze_all_reviews(reviews_data)
-        
-        # 전체 분석 결과 저장
-        app.overall_analysis = overall_analysis
-        
-        # 개별 분석 결과 저장
-        for review, analysis in zip(reviews, individual_analyses):
-            review.individual_analysis = analysis
-        
-        db.commit()
-        
-        return {
-            "message": "분석이 완료되었습니다.",
-            "overall_analysis": overall_analysis
-        }
-        
+        return await _analyze_app(db, request.app_id)
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/analysis-cache/stats")
+def get_analysis_cache_stats():
+    """AI 분석 결과 캐시의 적중률과 저장 항목 수를 조회합니다."""
+    return analysis_cache.stats()
+
+@app.get("/api/response-cache/stats")
+def get_response_cache_stats():
+    """조회 응답 캐시의 적중률, 304 응답 수, 저장 항목 수를 조회합니다."""
+    return response_cache.stats()
+
 @app.delete("/api/apps/{app_id}")
 def delete_app(app_id: str, db: Session = Depends(get_db)):
     """앱 정보와 관련 리뷰를 삭제합니다."""
@@ -169,50 +650,53 @@ def delete_app(app_id: str, db: Session = Depends(get_db)):
     if not app:
         raise HTTPException(status_code=404, detail="앱을 찾을 수 없습니다.")
     
-    # 관련 리뷰 먼저 삭제
+    # 관련 리뷰와 토픽 모델 먼저 삭제
+    unindex_app_reviews(db, app_id)
     db.query(AppReview).filter(AppReview.app_id == app_id).delete()
+    db.query(TopicModel).filter(TopicModel.app_id == app_id).delete()
+    db.query(ReviewStat).filter(ReviewStat.app_id == app_id).delete()
     
     # 앱 정보 삭제
     db.delete(app)
     db.commit()
+    response_cache.invalidate(app_id)
     
     return {"message": "앱이 삭제되었습니다."}
 
+def _run_topic_modeling(db: Session, app_id: str, chart_format: str = "points", n_topics: int = 5, topic_range=None) -> dict:
+    """앱 리뷰의 토픽 모델링을 수행합니다."""
+    # 앱 정보 조회
+    app = db.query(AppInfo).filter(AppInfo.app_id == app_id).first()
+    if not app:
+        raise HTTPException(status_code=404, detail="앱을 찾을 수 없습니다.")
+    
+    # 리뷰 조회
+    reviews = db.query(AppReview).filter(AppReview.app_id == app_id).all()
+    if not reviews or len(reviews) < 3:
+        raise HTTPException(
+            status_code=400, 
+            detail="토픽 모델링을 수행하기에 리뷰가 너무 적습니다. (최소 3개 필요)"
+        )
+    
+    # 토픽 모델링 수행 (리뷰가 그대로면 저장된 결과 반환, 새 리뷰만 추가되었으면 모델 온라인 갱신)
+    result = model_app_topics(db, app_id, reviews, n_topics=n_topics, n_top_words=10, topic_range=topic_range)
+    result = render_chart(result, chart_format)
+    
+    return {
+        "message": "토픽 모델링이 완료되었습니다.",
+        "result": result
+    }
+
+def _topic_modeling_options(options: dict) -> tuple:
+    """요청(또는 작업 payload)에서 (chart_format, n_topics, topic_range)를 꺼냅니다."""
+    topic_range = (options["min_topics"], options["max_topics"]) if options.get("sweep") else None
+    return options.get("chart_format", "points"), options.get("n_topics", 5), topic_range
+
 @app.post("/api/apps/topic-modeling")
-def topic_modeling(request: AnalyzeRequest, db: Session = Depends(get_db)):
+def topic_modeling(request: TopicModelingRequest, db: Session = Depends(get_db)):
     """앱 리뷰의 토픽 모델링을 수행하고 t-SNE 시각화를 생성합니다."""
     try:
-        # 앱 정보 조회
-        app = db.query(AppInfo).filter(AppInfo.app_id == request.app_id).first()
-        if not app:
-            raise HTTPException(status_code=404, detail="앱을 찾을 수 없습니다.")
-        
-        # 리뷰 조회
-        reviews = db.query(AppReview).filter(AppReview.app_id == request.app_id).all()
-        if not reviews or len(reviews) < 3:
-            raise HTTPException(
-                status_code=400, 
-                detail="토픽 모델링을 수행하기에 리뷰가 너무 적습니다. (최소 3개 필요)"
-            )
-        
-        # 리뷰 데이터를 딕셔너리로 변환
-        reviews_data = [
-            {
-                "rating": r.rating,
-                "review_content": r.review_content,
-                "review_date": r.review_date
-            }
-            for r in reviews
-        ]
-        
-        # 토픽 모델링 수행
-        result = perform_topic_modeling(reviews_data, n_topics=5, n_top_words=10)
-        
-        return {
-            "message": "토픽 모델링이 완료되었습니다.",
-            "result": result
-        }
-        
+        return _run_topic_modeling(db, request.app_id, *_topic_modeling_options(request.model_dump()))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except HTTPException:
@@ -220,6 +704,99 @@ def topic_modeling(request: AnalyzeRequest, db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"토픽 모델링 중 오류가 발생했습니다: {str(e)}")
 
+# ===== 백그라운드 작업 =====
+
+def _with_session(func, *args):
+    """새 DB 세션으로 동기 함수를 실행합니다 (워커 스레드용)."""
+    db = SessionLocal()
+    try:
+        return func(db, *args)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+async def _with_async_session(func, *args, **kwargs):
+    """새 비동기 DB 세션으로 코루틴 함수를 실행합니다 (비동기 작업용)."""
+    async with AsyncSessionLocal() as db:
+        try:
+            return await func(db, *args, **kwargs)
+        except Exception:
+            await db.rollback()
+            raise
+
+async def _crawl_job(payload: dict) -> dict:
+    return jsonable_encoder(await _with_async_session(
+        _crawl_app, payload["app_id"], max_reviews=payload.get("max_reviews", 10)
+    ))
+
+async def _refresh_job(payload: dict) -> dict:
+    return await _with_async_session(
+        _refresh_app, payload["app_id"], max_new_reviews=payload.get("max_new_reviews", 500)
+    )
+
+async def _analyze_job(payload: dict) -> dict:
+    return await _with_async_session(_analyze_app, payload["app_id"])
+
+async def _topic_modeling_job(payload: dict) -> dict:
+    return await asyncio.to_thread(
+        _with_session, _run_topic_modeling, payload["app_id"], *_topic_modeling_options(payload)
+    )
+
+job_queue.register("crawl", _crawl_job)
+job_queue.register("refresh", _refresh_job)
+job_queue.register("analyze", _analyze_job)
+job_queue.register("topic_modeling", _topic_modeling_job)
+
+@app.post("/api/jobs/crawl", response_model=JobResponse, status_code=202)
+async def submit_crawl_job(app_data: AppInfoCreate):
+    """크롤링 작업을 등록하고 작업 ID를 반환합니다."""
+    return await job_queue.submit("crawl", {"app_id": app_data.app_id, "max_reviews": app_data.max_reviews})
+
+@app.post("/api/jobs/refresh", response_model=JobResponse, status_code=202)
+async def submit_refresh_job(request: RefreshRequest):
+    """증분 갱신 작업을 등록하고 작업 ID를 반환합니다."""
+    return await job_queue.submit("refresh", {"app_id": request.app_id, "max_new_reviews": request.max_new_reviews})
+
+@app.post("/api/jobs/analyze", response_model=JobResponse, status_code=202)
+async def submit_analyze_job(request: AnalyzeRequest):
+    """AI 분석 작업을 등록하고 작업 ID를 반환합니다."""
+    return await job_queue.submit("analyze", {"app_id": request.app_id})
+
+@app.post("/api/jobs/topic-modeling", response_model=JobResponse, status_code=202)
+async def submit_topic_modeling_job(request: TopicModelingRequest):
+    """토픽 모델링 작업을 등록하고 작업 ID를 반환합니다."""
+    return await job_queue.submit("topic_modeling", request.model_dump())
+
+@app.get("/api/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """작업 상태와 결과를 조회합니다."""
+    job = await job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """작업 상태 변화를 Server-Sent Events로 전송합니다."""
+    if not await job_queue.get(job_id):
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    
+    async def event_stream():
+        async for job in job_queue.events(job_id):
+            if job is None:
+                yield ": keep-alive\n\n"
+                continue
+            data = json.dumps(jsonable_encoder(JobResponse(**job)), ensure_ascii=False)
+            yield f"event: {job['status']}\ndata: {data}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
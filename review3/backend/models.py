@@ -1,7 +1,8 @@
-from sqlalchemy import Column, String, Integer, Text, ForeignKey, DateTime, Float
+from sqlalchemy import Column, String, Integer, BigInteger, Text, ForeignKey, Date, DateTime, Float, Index, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
+import hashlib
 
 Base = declarative_base()
 
@@ -14,8 +15,18 @@ class AppInfo(Base):
     review_count = Column(String)
     download_count = Column(String)
     rating = Column(String, nullable=True)
+    # 표시용 문자열을 파싱한 값 (정렬/집계용, 해석할 수 없으면 NULL)
+    review_count_value = Column(BigInteger, nullable=True)
+    download_count_value = Column(BigInteger, nullable=True)
+    rating_value = Column(Float, nullable=True)
     overall_analysis = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    last_refreshed_at = Column(DateTime, nullable=True)
+    # 자동 갱신 재시도 간격 계산용 (마지막 갱신 시도 시각, 연속 실패 횟수)
+    last_refresh_attempt_at = Column(DateTime, nullable=True)
+    refresh_failures = Column(Integer, nullable=True, default=0)
+    # 최대 개수에 도달해 멈춘 갱신에서 마지막으로 저장한 리뷰의 content_hash (다음 갱신은 여기서부터 이어서 수집)
+    refresh_resume_hash = Column(String(64), nullable=True)
     
     reviews = relationship("AppReview", back_populates="app")
 
@@ -27,9 +38,97 @@ class AppReview(Base):
     rating = Column(Float)
     review_content = Column(Text)
     review_date = Column(String)
+    reviewer_name = Column(String, nullable=True)
+    review_date_value = Column(Date, nullable=True)  # review_date를 파싱한 작성일
     individual_analysis = Column(Text, nullable=True)
+    sentiment = Column(String, nullable=True)  # 개별 분석에서 추출한 positive / negative / neutral / unknown
+    content_hash = Column(String(64), nullable=True)  # review_fingerprint() 값
     created_at = Column(DateTime, default=datetime.utcnow)
     
     app = relationship("AppInfo", back_populates="reviews")
+    
+    __table_args__ = (
+        # 동시에 저장해도 같은 리뷰가 두 번 들어가지 않도록 유니크 (INSERT ... ON CONFLICT DO NOTHING 대상)
+        Index("ux_app_review_app_id_content_hash", "app_id", "content_hash", unique=True),
+        # 리뷰 목록 키셋 페이지네이션 (최신순/별점순)
+        Index("ix_app_review_app_id_id", "app_id", "id"),
+        Index("ix_app_review_app_id_rating_id", "app_id", "rating", "id"),
+        # 작성일 기간 필터/집계
+        Index("ix_app_review_app_id_review_date_value", "app_id", "review_date_value", "id"),
+    )
+
+def review_fingerprint(review_date: str, rating: float, review_content: str, reviewer: str = None) -> str:
+    """
+    작성일, 별점, 내용과 작성자(Play 리뷰 ID 또는 작성자 이름)로 리뷰를 식별하는 해시를 만듭니다 (중복 판별용).
+    작성자가 없으면 작성자를 모르던 기존 리뷰와 같은 해시가 됩니다.
+    """
+    key = f"{(review_date or '').strip()}|{float(rating or 0):.1f}|{(review_content or '').strip()}"
+    if reviewer and reviewer.strip():
+        key += f"|{reviewer.strip()}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+def crawled_review_fingerprint(review_data: dict, with_reviewer: bool = True) -> str:
+    """크롤링한 리뷰 dict의 지문. 같은 날 같은 별점의 짧은 리뷰("좋아요")도 작성자가 다르면 구분됩니다."""
+    reviewer = (review_data.get("review_id") or review_data.get("reviewer_name")) if with_reviewer else None
+    return review_fingerprint(
+        review_data["review_date"], review_data["rating"], review_data["review_content"], reviewer
+    )
+
+class Job(Base):
+    __tablename__ = "job"
+    
+    id = Column(String, primary_key=True)  # uuid4 hex
+    kind = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="queued", index=True)  # queued / running / succeeded / failed
+    payload = Column(Text, nullable=False)  # JSON
+    result = Column(Text, nullable=True)  # JSON
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
 
+class AnalysisCache(Base):
+    __tablename__ = "analysis_cache"
+    
+    key = Column(String(64), primary_key=True)  # sha256(모델, 프롬프트 버전, 리뷰 내용)
+    kind = Column(String, nullable=False)  # overall / individual
+    value = Column(Text, nullable=False)
+    hit_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    last_accessed_at = Column(DateTime, default=datetime.utcnow, index=True)
 
+class ReviewToken(Base):
+    __tablename__ = "review_token"
+    
+    text_hash = Column(String(64), primary_key=True)  # sha256(전처리된 리뷰 내용)
+    tokenizer_version = Column(String, primary_key=True)
+    tokens = Column(Text, nullable=False)  # JSON 형용사 리스트
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class TopicModel(Base):
+    __tablename__ = "topic_model"
+    
+    app_id = Column(String, ForeignKey("app_info.app_id"), primary_key=True)
+    config = Column(String, nullable=False)  # 모델 버전, 형태소 분석기 버전, 토픽 수, 상위 단어 수
+    fingerprint = Column(String(64), nullable=False)  # sha256(config, 학습에 사용한 리뷰 ID)
+    review_ids = Column(Text, nullable=False)  # JSON 리뷰 ID 리스트
+    fitted_review_count = Column(Integer, nullable=False)  # 마지막 전체 학습 시 리뷰 수
+    model = Column(LargeBinary, nullable=False)  # pickle (vectorizer, lda_model)
+    result = Column(Text, nullable=False)  # JSON 토픽 모델링 결과
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class ReviewStat(Base):
+    """앱 리뷰의 (작성일, 별점, 감정)별 리뷰 수 요약. 리뷰 저장/분석 시 바뀐 작성일만 다시 집계합니다."""
+    __tablename__ = "review_stat"
+    
+    id = Column(Integer, primary_key=True)
+    app_id = Column(String, ForeignKey("app_info.app_id"), nullable=False)
+    review_day = Column(Date, nullable=True)  # 작성일 (해석하지 못한 리뷰는 NULL)
+    rating = Column(Integer, nullable=True)  # 반올림한 별점 1~5
+    sentiment = Column(String, nullable=True)  # NULL이면 아직 분석하지 않은 리뷰
+    review_count = Column(Integer, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_review_stat_app_id_review_day", "app_id", "review_day"),
+    )
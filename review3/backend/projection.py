@@ -0,0 +1,116 @@
+"""
+토픽 분포 2차원 투영 모듈
+
+리뷰 수가 많아도 차트를 빠르게 만들 수 있도록
+- Barnes-Hut t-SNE (PCA 초기화, learning_rate='auto')
+- 최대 max_points개만 샘플링해 t-SNE를 학습하고 나머지 리뷰는 최근접 이웃 위치로 배치
+- 리뷰 수가 아주 많거나 빠른 결과가 필요하면 PCA만 사용
+방식을 제공하고 단계별 소요 시간을 기록합니다.
+"""
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from sklearn.decomposition import PCA
+from sklearn.manifold import TSNE
+from sklearn.neighbors import NearestNeighbors
+
+# barnes_hut (기본값) / exact / pca
+PROJECTION_METHOD = os.getenv("TOPIC_PROJECTION_METHOD", "barnes_hut")
+# t-SNE를 학습할 최대 리뷰 수 (나머지는 최근접 이웃 위치로 배치)
+PROJECTION_MAX_POINTS = int(os.getenv("TOPIC_PROJECTION_MAX_POINTS", "3000"))
+# 샘플 밖 리뷰 배치에 사용할 최근접 이웃 수
+PLACEMENT_NEIGHBORS = 5
+
+PROJECTION_METHODS = ("barnes_hut", "exact", "pca")
+
+
+def _sample_indices(main_topics: np.ndarray, max_points: int, rng: np.random.Generator) -> np.ndarray:
+    """토픽별 비율을 유지하며 최대 max_points개를 샘플링합니다 (작은 토픽도 최소 1개 포함)."""
+    n_samples = len(main_topics)
+    selected = []
+    for topic in np.unique(main_topics):
+        members = np.flatnonzero(main_topics == topic)
+        quota = max(1, int(round(len(members) * max_points / n_samples)))
+        selected.append(rng.choice(members, size=min(quota, len(members)), replace=False))
+    return np.sort(np.concatenate(selected))
+
+
+def _place_out_of_sample(
+    features: np.ndarray,
+    sample_idx: np.ndarray,
+    sample_embedding: np.ndarray,
+    rest_idx: np.ndarray
+) -> np.ndarray:
+    """샘플에 포함되지 않은 리뷰를 토픽 분포가 가까운 샘플 리뷰들의 거리 가중 평균 위치에 배치합니다."""
+    k = min(PLACEMENT_NEIGHBORS, len(sample_idx))
+    neighbors = NearestNeighbors(n_neighbors=k).fit(features[sample_idx])
+    distances, indices = neighbors.kneighbors(features[rest_idx])
+    weights = 1.0 / (distances + 1e-6)
+    weights /= weights.sum(axis=1, keepdims=True)
+    return np.einsum("ij,ijk->ik", weights, sample_embedding[indices])
+
+
+def project_2d(
+    lda_output: np.ndarray,
+    method: Optional[str] = None,
+    max_points: Optional[int] = None,
+    random_state: int = 42
+) -> Tuple[Optional[np.ndarray], Dict[str, Any]]:
+    """
+    리뷰별 토픽 분포를 2차원 좌표로 투영합니다.
+
+    Returns:
+        (좌표 (n_samples, 2) 또는 리뷰가 5개 미만이면 None, 투영 정보(방식, 샘플 수, 단계별 소요 시간))
+    """
+    method = method or PROJECTION_METHOD
+    max_points = max_points or PROJECTION_MAX_POINTS
+    if method not in PROJECTION_METHODS:
+        raise ValueError(f"알 수 없는 투영 방식입니다: {method} (사용 가능: {', '.join(PROJECTION_METHODS)})")
+
+    n_samples = lda_output.shape[0]
+    info: Dict[str, Any] = {"method": method, "points": n_samples, "fitted_points": 0, "timings": {}}
+    if n_samples < 5:  # t-SNE는 최소 5개 샘플 필요
+        return None, info
+
+    if method == "pca":
+        started = time.perf_counter()
+        embedding = PCA(n_components=2, random_state=random_state).fit_transform(lda_output)
+        info["fitted_points"] = n_samples
+        info["timings"]["pca"] = round(time.perf_counter() - started, 3)
+        return embedding, info
+
+    rng = np.random.default_rng(random_state)
+    if n_samples > max_points:
+        sample_idx = _sample_indices(np.argmax(lda_output, axis=1), max_points, rng)
+    else:
+        sample_idx = np.arange(n_samples)
+
+    started = time.perf_counter()
+    tsne = TSNE(
+        n_components=2,
+        method=method,
+        init="pca",
+        learning_rate="auto",
+        angle=0.5,
+        perplexity=min(30, len(sample_idx) - 1),
+        random_state=random_state,
+    )
+    sample_embedding = tsne.fit_transform(lda_output[sample_idx])
+    info["fitted_points"] = len(sample_idx)
+    info["timings"]["tsne"] = round(time.perf_counter() - started, 3)
+
+    if len(sample_idx) == n_samples:
+        return sample_embedding, info
+
+    started = time.perf_counter()
+    rest_mask = np.ones(n_samples, dtype=bool)
+    rest_mask[sample_idx] = False
+    rest_idx = np.flatnonzero(rest_mask)
+
+    embedding = np.empty((n_samples, 2), dtype=sample_embedding.dtype)
+    embedding[sample_idx] = sample_embedding
+    embedding[rest_idx] = _place_out_of_sample(lda_output, sample_idx, sample_embedding, rest_idx)
+    info["timings"]["placement"] = round(time.perf_counter() - started, 3)
+    return embedding, info
@@ -0,0 +1,118 @@
+"""
+등록된 앱의 주기적 증분 갱신 스케줄러
+
+일정 간격으로 오래 갱신되지 않은 앱을 찾아 refresh 작업을 작업 큐에 등록합니다.
+갱신에 실패한 앱은 연속 실패 횟수에 따라 재시도 간격을 두 배씩 늘립니다 (최대 MAX_BACKOFF_FACTOR배).
+최대 수집 개수에 도달해 남은 리뷰가 있는 앱은 재시도 간격 없이 다음 확인 때 이어서 갱신합니다.
+"""
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import or_
+
+from database import SessionLocal
+from jobs import JobQueue, job_queue
+from models import AppInfo, Job
+
+# 연속으로 실패한 앱의 재시도 간격 상한 (갱신 간격의 배수)
+MAX_BACKOFF_FACTOR = 64
+
+
+class RefreshScheduler:
+    """interval_minutes 마다 갱신 주기가 지난 앱의 refresh 작업을 등록합니다."""
+
+    def __init__(self, job_queue: JobQueue, interval_minutes: int = 0, check_seconds: int = 60):
+        self.job_queue = job_queue
+        self.interval_minutes = interval_minutes
+        self.check_seconds = check_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval_minutes > 0
+
+    def start(self):
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+            print(f"[RefreshScheduler] {self.interval_minutes}분 간격으로 앱 리뷰를 갱신합니다.")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _pending_app_ids(self, db) -> set:
+        """이미 대기/실행 중인 refresh 작업의 앱 ID"""
+        payloads = (
+            db.query(Job.payload)
+            .filter(Job.kind == "refresh", Job.status.in_(("queued", "running")))
+            .all()
+        )
+        return {json.loads(payload).get("app_id") for (payload,) in payloads}
+
+    def _retry_at(self, attempted_at: Optional[datetime], failures: Optional[int]) -> Optional[datetime]:
+        """마지막 시도 이후 다시 시도할 수 있는 시각 (실패할 때마다 갱신 간격을 두 배로 늘림)"""
+        if attempted_at is None:
+            return None
+        factor = min(2 ** max((failures or 0) - 1, 0), MAX_BACKOFF_FACTOR)
+        return attempted_at + timedelta(minutes=self.interval_minutes * factor)
+
+    def _due_app_ids(self) -> list:
+        """갱신 주기와 재시도 간격이 지났거나 이어서 수집할 리뷰가 남았고, refresh 작업이 대기/실행 중이 아닌 앱 ID"""
+        now = datetime.utcnow()
+        threshold = now - timedelta(minutes=self.interval_minutes)
+        db = SessionLocal()
+        try:
+            due = (
+                db.query(
+                    AppInfo.app_id,
+                    AppInfo.last_refresh_attempt_at,
+                    AppInfo.refresh_failures,
+                    AppInfo.refresh_resume_hash,
+                )
+                .filter(or_(
+                    AppInfo.last_refreshed_at.is_(None),
+                    AppInfo.last_refreshed_at < threshold,
+                    AppInfo.refresh_resume_hash.isnot(None),
+                ))
+                .all()
+            )
+            pending = self._pending_app_ids(db)
+        finally:
+            db.close()
+        return [
+            app_id
+            for app_id, attempted_at, failures, resume_hash in due
+            if app_id not in pending and (
+                (resume_hash and not failures) or (self._retry_at(attempted_at, failures) or now) <= now
+            )
+        ]
+
+    async def enqueue_due_apps(self) -> int:
+        """갱신 주기가 지난 앱의 refresh 작업을 등록하고 등록한 수를 반환합니다."""
+        submitted = 0
+        for app_id in await asyncio.to_thread(self._due_app_ids):
+            await self.job_queue.submit("refresh", {"app_id": app_id})
+            submitted += 1
+        return submitted
+
+    async def _run(self):
+        while True:
+            try:
+                submitted = await self.enqueue_due_apps()
+                if submitted:
+                    print(f"[RefreshScheduler] 앱 {submitted}개 갱신 작업 등록")
+            except Exception as e:
+                print(f"[RefreshScheduler] 갱신 작업 등록 중 오류: {str(e)}")
+            await asyncio.sleep(self.check_seconds)
+
+
+# 애플리케이션 전역 갱신 스케줄러 (APP_REFRESH_INTERVAL_MINUTES=0 이면 비활성)
+refresh_scheduler = RefreshScheduler(
+    job_queue,
+    interval_minutes=int(os.getenv("APP_REFRESH_INTERVAL_MINUTES", "0")),
+)
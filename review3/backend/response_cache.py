@@ -0,0 +1,199 @@
+"""
+조회 API 응답 캐시 모듈
+
+직렬화한 JSON 응답과 ETag를 저장해 같은 조회를 반복할 때 DB 조회와 직렬화를 건너뜁니다.
+- 기본은 프로세스 메모리 LRU, RESPONSE_CACHE_REDIS_URL을 지정하면 Redis(호환 서버)에 저장
+- 캐시 키에 범위별 버전(앱 목록, 앱별)을 넣고, 쓰기 후 버전을 올려 이전 응답을 무효화
+- TTL은 다른 프로세스에서 일어난 쓰기를 놓쳤을 때 오래된 응답을 보관하는 최대 시간
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+try:
+    import redis
+except ImportError:
+    # Redis 백엔드는 redis 패키지가 설치된 경우에만 지원
+    redis = None
+
+CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL")
+
+# 모든 앱에 걸친 응답(앱 목록)의 버전 범위
+ALL_APPS_SCOPE = "apps"
+
+
+class MemoryBackend:
+    """프로세스 메모리 LRU 백엔드"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: int):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def version(self, scope: str) -> int:
+        with self._lock:
+            return self._versions.get(scope, 0)
+
+    def bump(self, scope: str):
+        with self._lock:
+            self._versions[scope] = self._versions.get(scope, 0) + 1
+
+    def size(self) -> Optional[int]:
+        with self._lock:
+            return len(self._entries)
+
+
+class RedisBackend:
+    """
+    Redis 백엔드 (여러 서버 프로세스가 캐시와 무효화를 공유)
+    Redis에 연결할 수 없으면 캐시를 건너뛰고 DB에서 조회합니다.
+    """
+
+    name = "redis"
+    prefix = "review3:response:"
+
+    def __init__(self, url: str):
+        if redis is None:
+            raise ValueError("RESPONSE_CACHE_REDIS_URL을 사용하려면 redis 패키지를 설치해야 합니다. (pip install redis)")
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5)
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self._client.get(self.prefix + key)
+        except redis.RedisError:
+            return None
+
+    def set(self, key: str, value: bytes, ttl: int):
+        try:
+            self._client.set(self.prefix + key, value, ex=ttl)
+        except redis.RedisError:
+            pass
+
+    def version(self, scope: str) -> int:
+        try:
+            return int(self._client.get(self.prefix + "version:" + scope) or 0)
+        except redis.RedisError:
+            return -1
+
+    def bump(self, scope: str):
+        try:
+            self._client.incr(self.prefix + "version:" + scope)
+        except redis.RedisError as e:
+            print(f"[ResponseCache] 캐시 무효화 실패 ({scope}): {str(e)}")
+
+    def size(self) -> Optional[int]:
+        # 다른 키와 DB를 공유할 수 있으므로 항목 수는 세지 않음
+        return None
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더(여러 값, 약한 ETag W/ 포함)에 etag가 있는지 확인합니다."""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or any(value.removeprefix("W/") == etag for value in candidates)
+
+
+class ResponseCache:
+    def __init__(self, backend, ttl_seconds: int):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._counts = {"hits": 0, "misses": 0, "not_modified": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    def key(self, path: str, query: str, app_id: Optional[str] = None) -> Optional[str]:
+        """
+        요청 경로와 쿼리 문자열, 관련 범위의 현재 버전으로 캐시 키를 만듭니다.
+        버전을 읽을 수 없으면(Redis 장애) None을 반환해 캐시를 사용하지 않습니다.
+        """
+        # 앱 하나의 응답은 그 앱의 버전만 보므로 다른 앱이 바뀌어도 유지됨
+        version = self.backend.version(ALL_APPS_SCOPE if app_id is None else f"app:{app_id}")
+        if version < 0:
+            return None
+        raw = "\x1f".join([path, query, str(version)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: Optional[str]) -> Optional[Tuple[bytes, str]]:
+        """저장된 (응답 본문, ETag)를 반환합니다."""
+        stored = self.backend.get(key) if key else None
+        if stored is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        etag, _, body = stored.partition(b"\n")
+        return body, etag.decode()
+
+    def put(self, key: Optional[str], body: bytes) -> str:
+        """응답 본문을 저장하고 ETag를 반환합니다."""
+        etag = make_etag(body)
+        if key:
+            self.backend.set(key, etag.encode() + b"\n" + body, self.ttl_seconds)
+        return etag
+
+    def record_not_modified(self):
+        self._count("not_modified")
+
+    def invalidate(self, app_id: str):
+        """
+        쓰기 후 해당 앱의 응답과 앱 목록 응답을 무효화합니다.
+        앱 목록에 리뷰 수/분석 결과가 함께 표시되므로 앱 하나가 바뀌어도 앱 목록 버전도 올립니다.
+        """
+        self.backend.bump(ALL_APPS_SCOPE)
+        self.backend.bump(f"app:{app_id}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self._counts)
+        lookups = counts["hits"] + counts["misses"]
+        return {
+            "backend": self.backend.name,
+            **counts,
+            "hit_rate": round(counts["hits"] / lookups, 4) if lookups else None,
+            "entries": self.backend.size(),
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+def _create_backend():
+    if CACHE_REDIS_URL:
+        return RedisBackend(CACHE_REDIS_URL)
+    return MemoryBackend(CACHE_MAX_ENTRIES)
+
+
+# 애플리케이션 전역 응답 캐시 (hits/misses는 프로세스 시작 이후 누적값)
+response_cache = ResponseCache(_create_backend(), CACHE_TTL_SECONDS)
@@ -0,0 +1,158 @@
+"""
+리뷰 내보내기 모듈
+
+앱 리뷰와 개별 분석 결과를 NDJSON / CSV / Parquet 형식으로 스트리밍합니다.
+서버 측 커서(yield_per)로 일정 개수씩 읽어 바로 내보내므로 리뷰 수와 관계없이 메모리 사용량이 일정합니다.
+"""
+import csv
+import io
+import json
+import zlib
+from typing import Dict, Iterator, List
+
+from sqlalchemy import select
+
+from database import SessionLocal
+from models import AppReview
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    # parquet 형식은 pyarrow가 설치된 경우에만 지원
+    pa = None
+    pq = None
+
+EXPORT_FORMATS = {
+    # 형식: (media type, 확장자)
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+EXPORT_COLUMNS = [
+    "id", "app_id", "rating", "review_date", "review_content",
+    "individual_analysis", "content_hash", "created_at",
+]
+# 한 번에 DB에서 읽어 내보낼 리뷰 수
+EXPORT_BATCH_SIZE = 1000
+
+
+def parquet_available() -> bool:
+    return pa is not None
+
+
+def _iter_row_batches(app_id: str, batch_size: int) -> Iterator[List[Dict]]:
+    """리뷰를 id 순서로 batch_size개씩 읽습니다 (스트리밍 응답이 끝날 때까지 자체 세션 사용)."""
+    db = SessionLocal()
+    try:
+        # yield_per: PostgreSQL에서는 서버 측 커서로 batch_size개씩 가져옴
+        statement = (
+            select(*(getattr(AppReview, column) for column in EXPORT_COLUMNS))
+            .where(AppReview.app_id == app_id)
+            .order_by(AppReview.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for partition in db.execute(statement).partitions():
+            yield [row._asdict() for row in partition]
+    finally:
+        db.close()
+
+
+def _ndjson_chunks(batches: Iterator[List[Dict]]) -> Iterator[bytes]:
+    for rows in batches:
+        yield "".join(
+            json.dumps(row, ensure_ascii=False, default=str) + "\n" for row in rows
+        ).encode("utf-8")
+
+
+def _csv_chunks(batches: Iterator[List[Dict]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    # 리뷰가 없으면 헤더만 내보냄
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink:
+    """
+    ParquetWriter가 쓴 바이트를 모아 두었다가 꺼내 가는 출력 스트림.
+    Parquet footer의 row group 위치가 맞도록 tell()은 지금까지 쓴 전체 바이트 수를 반환합니다.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _parquet_chunks(batches: Iterator[List[Dict]]) -> Iterator[bytes]:
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("app_id", pa.string()),
+        ("rating", pa.float64()),
+        ("review_date", pa.string()),
+        ("review_content", pa.string()),
+        ("individual_analysis", pa.string()),
+        ("content_hash", pa.string()),
+        ("created_at", pa.timestamp("us")),
+    ])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema)
+    try:
+        # 배치마다 row group 하나를 써서 바로 내보냄
+        for rows in batches:
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def _gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # gzip 헤더 포함
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def iter_export(app_id: str, export_format: str, gzip: bool = False) -> Iterator[bytes]:
+    """앱 리뷰를 지정한 형식의 바이트 조각으로 내보냅니다."""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"알 수 없는 내보내기 형식입니다: {export_format}")
+    if export_format == "parquet" and not parquet_available():
+        raise ValueError("parquet 형식으로 내보내려면 pyarrow를 설치해야 합니다. (pip install pyarrow)")
+
+    writers = {"ndjson": _ndjson_chunks, "csv": _csv_chunks, "parquet": _parquet_chunks}
+    chunks = writers[export_format](_iter_row_batches(app_id, EXPORT_BATCH_SIZE))
+    return _gzip_chunks(chunks) if gzip else chunks
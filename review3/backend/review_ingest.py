@@ -0,0 +1,100 @@
+"""
+크롤링한 리뷰 일괄 저장 모듈
+
+리뷰를 chunk_size개씩 묶어 INSERT ... SELECT ... RETURNING 한 문장으로 저장합니다 (chunk당 DB 왕복 1회).
+같은 앱에 이미 저장된 리뷰는 (app_id, content_hash) 유니크 인덱스와 ON CONFLICT DO NOTHING으로,
+같은 배치 안의 중복은 저장 전에 건너뜁니다.
+"""
+import os
+from typing import Dict, List
+
+from sqlalchemy import Date, Float, String, Text, cast, column, exists, insert, null, select, true, values
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models import AppReview, crawled_review_fingerprint
+from value_parsers import parse_review_date
+
+# 한 문장으로 저장할 리뷰 수 (SQLite 바인드 변수 한도 32766 / 컬럼 7개 이내)
+INSERT_CHUNK_SIZE = int(os.getenv("REVIEW_INSERT_CHUNK_SIZE", "500"))
+
+_INCOMING_COLUMNS = (
+    column("app_id", String),
+    column("rating", Float),
+    column("review_content", Text),
+    column("review_date", String),
+    column("reviewer_name", String),
+    column("review_date_value", Date),
+    column("content_hash", String),
+)
+
+# INSERT ... ON CONFLICT DO NOTHING을 지원하는 DB별 insert
+_CONFLICT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _typed_row(row: tuple) -> tuple:
+    # NULL은 타입 없이 렌더링되므로 PostgreSQL이 VALUES 컬럼 타입을 text로 추론하지 않도록 컬럼 타입으로 CAST
+    return tuple(
+        cast(null(), column_.type) if value is None else value
+        for column_, value in zip(_INCOMING_COLUMNS, row)
+    )
+
+
+def _insert_statement(rows: List[tuple], dialect_name: str):
+    # SQLite는 FROM (VALUES ...) AS t(컬럼) 문법을 지원하지 않으므로 CTE로 전달
+    incoming = values(*_INCOMING_COLUMNS, name="incoming").data([_typed_row(row) for row in rows]).cte("incoming")
+    columns = [c.name for c in _INCOMING_COLUMNS]
+
+    dialect_insert = _CONFLICT_INSERTS.get(dialect_name)
+    if dialect_insert is None:
+        # ON CONFLICT를 지원하지 않는 DB는 저장된 리뷰를 NOT EXISTS로 건너뜀 (동시에 저장하면 유니크 인덱스 오류)
+        already_saved = (
+            select(AppReview.id)
+            .where(AppReview.app_id == incoming.c.app_id, AppReview.content_hash == incoming.c.content_hash)
+        )
+        return (
+            insert(AppReview)
+            .from_select(columns, select(incoming).where(~exists(already_saved)))
+            .returning(AppReview.id)
+        )
+
+    # SQLite는 INSERT ... SELECT 뒤의 ON CONFLICT를 구분하려면 SELECT에 WHERE가 있어야 함
+    return (
+        dialect_insert(AppReview)
+        .from_select(columns, select(incoming).where(true()))
+        .on_conflict_do_nothing(index_elements=["app_id", "content_hash"])
+        .returning(AppReview.id)
+    )
+
+
+def _insert_chunk(db: Session, rows: List[tuple]) -> List[int]:
+    statement = _insert_statement(rows, db.get_bind().dialect.name)
+    return list(db.execute(statement).scalars())
+
+
+def insert_reviews(db: Session, app_id: str, reviews_data: List[Dict], chunk_size: int = None) -> List[int]:
+    """
+    리뷰를 일괄 저장하고 새로 저장된 리뷰 ID를 반환합니다.
+    커밋은 호출한 쪽에서 하므로 모든 chunk가 한 트랜잭션으로 저장됩니다.
+    """
+    chunk_size = chunk_size or INSERT_CHUNK_SIZE
+
+    # 같은 배치 안의 중복 리뷰는 처음 것만 유지
+    rows: Dict[str, tuple] = {}
+    for review_data in reviews_data:
+        content_hash = crawled_review_fingerprint(review_data)
+        rows.setdefault(content_hash, (
+            app_id,
+            review_data["rating"],
+            review_data["review_content"],
+            review_data["review_date"],
+            review_data.get("reviewer_name"),
+            parse_review_date(review_data["review_date"]),
+            content_hash,
+        ))
+
+    rows_list = list(rows.values())
+    inserted = []
+    for start in range(0, len(rows_list), chunk_size):
+        inserted.extend(_insert_chunk(db, rows_list[start:start + chunk_size]))
+    return sorted(inserted)
@@ -0,0 +1,226 @@
+"""
+리뷰 전문 검색 모듈
+
+- SQLite: 리뷰 내용을 두 글자 단위(bigram)로 나눠 FTS5 테이블(review_fts)에 색인하고 bm25로 순위를 매깁니다.
+  한국어는 띄어쓰기 단위 토큰으로는 "로그인이", "로그인했는데" 같은 활용형을 찾지 못하므로 bigram을 사용합니다.
+- PostgreSQL: pg_trgm GIN 인덱스로 ILIKE 검색을 가속하고 word_similarity로 순위를 매깁니다.
+  인덱스는 DB가 유지하므로 별도 동기화가 필요 없습니다.
+그 밖의 DB나 FTS5/pg_trgm을 사용할 수 없으면 순위 없는 LIKE 검색으로 동작합니다.
+"""
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Float, Integer, and_, bindparam, func, literal, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from models import AppReview
+
+_WORD_PATTERN = re.compile(r"\w+")
+# 색인 시 한 번에 읽어 올 리뷰 수
+INDEX_CHUNK_SIZE = 500
+
+# ensure_search_index 결과 (dialect 이름 -> 색인 사용 가능 여부)
+_index_available = {}
+
+
+def _words(text_value: str) -> List[str]:
+    return _WORD_PATTERN.findall((text_value or "").lower())
+
+
+def _bigrams(word: str) -> List[str]:
+    if len(word) < 2:
+        return [word]
+    return [word[i:i + 2] for i in range(len(word) - 1)]
+
+
+def to_grams(text_value: str) -> str:
+    """FTS5 unicode61 토크나이저가 그대로 나눌 수 있도록 공백으로 구분한 bigram 문자열을 만듭니다."""
+    return " ".join(gram for word in _words(text_value) for gram in _bigrams(word))
+
+
+def _match_expression(terms: List[str]) -> str:
+    """검색어마다 bigram 구문을 만들어 AND로 묶습니다. 한 글자 검색어는 그 글자로 시작하는 bigram 접두사 검색"""
+    clauses = []
+    for term in terms:
+        if len(term) == 1:
+            clauses.append(f'"{term}"*')
+        else:
+            clauses.append('"' + " ".join(_bigrams(term)) + '"')
+    return " AND ".join(clauses)
+
+
+def _dialect(db) -> str:
+    return db.get_bind().dialect.name
+
+
+def ensure_search_index(db: Session) -> bool:
+    """검색 색인(FTS5 테이블 또는 pg_trgm 인덱스)을 만들고 사용 가능 여부를 반환합니다."""
+    dialect = _dialect(db)
+    try:
+        if dialect == "sqlite":
+            db.execute(text(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS review_fts "
+                "USING fts5(grams, tokenize = 'unicode61 remove_diacritics 2')"
+            ))
+        elif dialect == "postgresql":
+            db.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            db.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_app_review_content_trgm "
+                "ON app_review USING gin (review_content gin_trgm_ops)"
+            ))
+        else:
+            return False
+        db.commit()
+        _index_available[dialect] = True
+    except DBAPIError as e:
+        db.rollback()
+        print(f"[Search] 검색 색인을 만들 수 없어 LIKE 검색을 사용합니다: {str(e)}")
+        _index_available[dialect] = False
+    return _index_available[dialect]
+
+
+def _fts_enabled(db: Session) -> bool:
+    if _dialect(db) != "sqlite":
+        return False
+    if "sqlite" not in _index_available:
+        exists = db.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'review_fts'")).first()
+        _index_available["sqlite"] = exists is not None
+    return _index_available["sqlite"]
+
+
+def _write_index(db: Session, rows) -> int:
+    params = [{"id": review_id, "grams": to_grams(content)} for review_id, content in rows]
+    if params:
+        db.execute(text("INSERT INTO review_fts (rowid, grams) VALUES (:id, :grams)"), params)
+    return len(params)
+
+
+def index_reviews(db: Session, review_ids: List[int]):
+    """새로 저장한 리뷰를 검색 색인에 추가합니다 (SQLite만 해당, 커밋은 호출한 쪽에서)."""
+    if not review_ids or not _fts_enabled(db):
+        return
+    for start in range(0, len(review_ids), INDEX_CHUNK_SIZE):
+        chunk = review_ids[start:start + INDEX_CHUNK_SIZE]
+        _write_index(db, db.execute(
+            select(AppReview.id, AppReview.review_content).where(AppReview.id.in_(chunk))
+        ).all())
+
+
+def unindex_app_reviews(db: Session, app_id: str):
+    """앱의 리뷰를 삭제하기 전에 검색 색인에서 제거합니다."""
+    if _fts_enabled(db):
+        db.execute(
+            text("DELETE FROM review_fts WHERE rowid IN (SELECT id FROM app_review WHERE app_id = :app_id)"),
+            {"app_id": app_id},
+        )
+
+
+def unindex_reviews(db: Session, review_ids: List[int]):
+    """삭제할 리뷰를 검색 색인에서 제거합니다 (SQLite만 해당, 커밋은 호출한 쪽에서)."""
+    if not review_ids or not _fts_enabled(db):
+        return
+    for start in range(0, len(review_ids), INDEX_CHUNK_SIZE):
+        db.execute(
+            text("DELETE FROM review_fts WHERE rowid IN :ids").bindparams(bindparam("ids", expanding=True)),
+            {"ids": review_ids[start:start + INDEX_CHUNK_SIZE]},
+        )
+
+
+def backfill_search_index(db: Session) -> int:
+    """색인에 없는 기존 리뷰를 추가하고 추가한 수를 반환합니다."""
+    if not _fts_enabled(db):
+        return 0
+    added = 0
+    last_id = 0
+    while True:
+        rows = db.execute(text(
+            "SELECT id, review_content FROM app_review "
+            "WHERE id > :last_id AND id NOT IN (SELECT rowid FROM review_fts) "
+            "ORDER BY id LIMIT :limit"
+        ), {"last_id": last_id, "limit": INDEX_CHUNK_SIZE}).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        added += _write_index(db, rows)
+        db.commit()
+    return added
+
+
+def highlight_ranges(content: str, terms: List[str]) -> List[List[int]]:
+    """리뷰 내용에서 검색어가 나타난 [시작, 끝) 위치 목록 (겹치는 구간은 합침)"""
+    lowered = (content or "").lower()
+    ranges = []
+    for term in terms:
+        start = lowered.find(term)
+        while start >= 0:
+            ranges.append([start, start + len(term)])
+            start = lowered.find(term, start + 1)
+
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_reviews(
+    db: Session,
+    query: str,
+    app_id: Optional[str] = None,
+    min_rating: Optional[float] = None,
+    max_rating: Optional[float] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> Tuple[List[Tuple[AppReview, float]], List[str]]:
+    """
+    모든 검색어를 포함하는 리뷰를 관련도 순으로 찾습니다.
+    Returns: ([(리뷰, 점수)], 검색어 목록) - 점수는 높을수록 관련도가 높음
+    """
+    terms = list(dict.fromkeys(_words(query)))
+    if not terms:
+        raise ValueError("검색어에 글자나 숫자가 하나 이상 있어야 합니다.")
+
+    filters = []
+    if app_id is not None:
+        filters.append(AppReview.app_id == app_id)
+    if min_rating is not None:
+        filters.append(AppReview.rating >= min_rating)
+    if max_rating is not None:
+        filters.append(AppReview.rating <= max_rating)
+
+    if _fts_enabled(db):
+        hits = (
+            text("SELECT rowid AS id, bm25(review_fts) AS rank FROM review_fts WHERE review_fts MATCH :match")
+            .bindparams(match=_match_expression(terms))
+            .columns(id=Integer, rank=Float)
+            .subquery("hits")
+        )
+        # bm25는 관련도가 높을수록 작은(음수) 값
+        score = -hits.c.rank
+        statement = (
+            select(AppReview, score)
+            .join(hits, hits.c.id == AppReview.id)
+            .where(*filters)
+            .order_by(hits.c.rank, AppReview.id.desc())
+        )
+    else:
+        matches = and_(*(AppReview.review_content.ilike(f"%{_escape_like(term)}%", escape="\\") for term in terms))
+        if _dialect(db) == "postgresql" and _index_available.get("postgresql"):
+            score = func.word_similarity(" ".join(terms), AppReview.review_content)
+        else:
+            score = literal(0.0, Float)
+        statement = (
+            select(AppReview, score)
+            .where(matches, *filters)
+            .order_by(score.desc(), AppReview.id.desc())
+        )
+
+    rows = db.execute(statement.offset(offset).limit(limit)).all()
+    return [(review, float(value or 0)) for review, value in rows], terms
@@ -0,0 +1,144 @@
+"""
+앱 리뷰 통계 모듈
+
+review_stat 테이블에 앱별 (작성일, 별점, 감정) 리뷰 수를 요약해 두고, 통계 조회는 이 요약 테이블만 집계합니다.
+리뷰를 저장하면 새 리뷰의 작성일만, 분석 결과를 저장하면 앱 전체를 다시 집계합니다.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import Integer, and_, cast, delete, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from models import AppInfo, AppReview, ReviewStat
+
+GRANULARITIES = ("day", "week", "month")
+
+
+def _day_condition(column, days: Iterable[Optional[date]]):
+    """작성일 목록 조건 (None은 작성일을 해석하지 못한 리뷰)"""
+    days = set(days)
+    conditions = []
+    dated = sorted(day for day in days if day is not None)
+    if dated:
+        conditions.append(column.in_(dated))
+    if None in days:
+        conditions.append(column.is_(None))
+    return or_(*conditions)
+
+
+def refresh_review_stats(db: Session, app_id: str, days: Optional[Iterable[Optional[date]]] = None):
+    """
+    앱의 리뷰 통계를 다시 집계합니다. days를 지정하면 해당 작성일의 요약 행만 바꿉니다.
+    커밋은 호출한 쪽에서 하므로 리뷰 저장과 같은 트랜잭션으로 반영되고, 앱 행 잠금도 커밋까지 유지됩니다.
+    """
+    # 아직 flush하지 않은 분석 결과(sentiment)도 집계에 포함
+    db.flush()
+
+    stat_filter = [ReviewStat.app_id == app_id]
+    review_filter = [AppReview.app_id == app_id]
+    if days is not None:
+        days = list(days)
+        if not days:
+            return
+        stat_filter.append(_day_condition(ReviewStat.review_day, days))
+        review_filter.append(_day_condition(AppReview.review_date_value, days))
+
+    rating = cast(func.round(AppReview.rating), Integer)
+    summary = (
+        select(
+            AppReview.app_id,
+            AppReview.review_date_value,
+            rating,
+            AppReview.sentiment,
+            func.count(AppReview.id),
+        )
+        .where(and_(*review_filter))
+        .group_by(AppReview.app_id, AppReview.review_date_value, rating, AppReview.sentiment)
+    )
+    # PostgreSQL에서 같은 앱을 동시에 다시 집계하면 서로 지운 뒤 넣은 요약 행을 보지 못해 중복되므로
+    # 앱 행을 잠가 앱별로 차례로 집계 (SQLite는 쓰기 트랜잭션이 하나뿐이라 FOR UPDATE가 생략됨)
+    db.execute(select(AppInfo.app_id).where(AppInfo.app_id == app_id).with_for_update())
+    db.execute(delete(ReviewStat).where(*stat_filter))
+    db.execute(
+        insert(ReviewStat).from_select(
+            ["app_id", "review_day", "rating", "sentiment", "review_count"], summary
+        )
+    )
+
+
+def _period_start(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def app_review_stats(
+    db: Session,
+    app_id: str,
+    granularity: str = "month",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> Dict:
+    """
+    별점 분포, 감정 분포, 기간별 리뷰 수와 평균 별점을 반환합니다.
+    date_from/date_to를 지정하면 작성일을 해석하지 못한 리뷰는 제외됩니다.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"알 수 없는 집계 단위입니다: {granularity} (사용 가능: {', '.join(GRANULARITIES)})")
+
+    conditions = [ReviewStat.app_id == app_id]
+    if date_from is not None:
+        conditions.append(ReviewStat.review_day >= date_from)
+    if date_to is not None:
+        conditions.append(ReviewStat.review_day <= date_to)
+
+    def grouped(*columns):
+        return db.execute(
+            select(*columns, func.sum(ReviewStat.review_count))
+            .where(*conditions)
+            .group_by(*columns)
+        ).all()
+
+    ratings = {value: count for value, count in grouped(ReviewStat.rating)}
+    sentiments = {value: count for value, count in grouped(ReviewStat.sentiment)}
+
+    # 일별로 집계한 뒤 주/월 단위로 묶음 (요약 행 수가 작아 DB별 날짜 함수 없이 처리)
+    periods = defaultdict(lambda: [0, 0])
+    undated = 0
+    for day, value, count in grouped(ReviewStat.review_day, ReviewStat.rating):
+        if day is None:
+            undated += count
+            continue
+        period = periods[_period_start(day, granularity)]
+        period[0] += count
+        period[1] += (value or 0) * count
+
+    total = sum(ratings.values())
+    rated = sum(count for value, count in ratings.items() if value is not None)
+    rating_sum = sum(value * count for value, count in ratings.items() if value is not None)
+    volume: List[Dict] = [
+        {
+            "period": start.isoformat(),
+            "review_count": count,
+            "average_rating": round(period_rating / count, 3) if count else None,
+        }
+        for start, (count, period_rating) in sorted(periods.items())
+    ]
+
+    return {
+        "app_id": app_id,
+        "granularity": granularity,
+        "total_reviews": total,
+        "analyzed_reviews": total - sentiments.get(None, 0),
+        "average_rating": round(rating_sum / rated, 3) if rated else None,
+        "rating_distribution": {str(star): ratings.get(star, 0) for star in range(1, 6)},
+        "sentiment_distribution": {
+            name: sentiments.get(name, 0) for name in ("positive", "negative", "neutral", "unknown")
+        },
+        "volume": volume,
+        "undated_reviews": undated,
+    }
@@ -1,9 +1,11 @@
-from pydantic import BaseModel
-from typing import Optional, List
-from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Any, Literal, Optional, List
+from datetime import date, datetime
 
 class AppInfoCreate(BaseModel):
     app_id: str
+    # 처음 표시된 리뷰보다 많으면 리뷰 대화상자를 스크롤하며 추가로 수집
+    max_reviews: int = Field(10, ge=1, le=10000)
 
 class AppInfoResponse(BaseModel):
     id: int
@@ -12,6 +14,9 @@ class AppInfoResponse(BaseModel):
     review_count: str
     download_count: str
     rating: Optional[str] = None
+    review_count_value: Optional[int] = None
+    download_count_value: Optional[int] = None
+    rating_value: Optional[float] = None
     overall_analysis: Optional[str] = None
     created_at: datetime
     
@@ -24,6 +29,8 @@ class AppReviewResponse(BaseModel):
     rating: float
     review_content: str
     review_date: str
+    review_date_value: Optional[date] = None
+    reviewer_name: Optional[str] = None
     individual_analysis: Optional[str] = None
     created_at: datetime
     
@@ -34,7 +41,70 @@ class AppDetailResponse(BaseModel):
     app_info: AppInfoResponse
     reviews: List[AppReviewResponse]
     
+class AppSummaryResponse(BaseModel):
+    app_info: AppInfoResponse
+    stored_review_count: int
+    analyzed_review_count: int
+
+class ReviewSearchHit(AppReviewResponse):
+    score: float  # 높을수록 관련도가 높음
+    highlights: List[List[int]]  # review_content에서 검색어가 나타난 [시작, 끝) 위치
+
+class ReviewSearchResponse(BaseModel):
+    items: List[ReviewSearchHit]
+    next_cursor: Optional[str] = None
+
+class ReviewVolumePoint(BaseModel):
+    period: date  # 기간 시작일 (주 단위는 월요일, 월 단위는 1일)
+    review_count: int
+    average_rating: Optional[float] = None
+
+class AppStatsResponse(BaseModel):
+    app_id: str
+    granularity: str
+    total_reviews: int
+    analyzed_reviews: int
+    average_rating: Optional[float] = None
+    rating_distribution: dict  # "1"~"5" -> 리뷰 수
+    sentiment_distribution: dict  # positive / negative / neutral / unknown -> 리뷰 수
+    volume: List[ReviewVolumePoint]
+    undated_reviews: int  # 작성일을 해석하지 못한 리뷰 수
+
+class ReviewPageResponse(BaseModel):
+    items: List[AppReviewResponse]
+    # 다음 페이지 요청 시 cursor로 전달 (마지막 페이지면 None)
+    next_cursor: Optional[str] = None
+
 class AnalyzeRequest(BaseModel):
     app_id: str
 
+class TopicModelingRequest(BaseModel):
+    app_id: str
+    n_topics: int = Field(5, ge=2, le=30)
+    # True면 min_topics~max_topics 범위의 토픽 수를 병렬로 비교해 가장 좋은 토픽 수 사용 (n_topics 무시)
+    sweep: bool = False
+    min_topics: int = Field(2, ge=2, le=30)
+    max_topics: int = Field(10, ge=2, le=30)
+    # points: 좌표 JSON, binary: base64 float32 배열, png: 서버 렌더링 이미지
+    chart_format: Literal["points", "binary", "png"] = "points"
+
+class RefreshRequest(BaseModel):
+    app_id: str
+    max_new_reviews: int = Field(500, ge=1, le=10000)
+
+class BatchCrawlRequest(BaseModel):
+    app_ids: List[str] = Field(..., min_length=1, max_length=1000)
+    concurrency: int = Field(4, ge=1, le=16)
+    max_reviews: int = Field(10, ge=1, le=100)
+    max_retries: int = Field(2, ge=0, le=5)
 
+class JobResponse(BaseModel):
+    id: str
+    kind: str
+    status: str
+    payload: Optional[Any] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,10 @@
+import os
+import sys
+from pathlib import Path
+
+# main을 import 하는 테스트용 (실제 Gemini 호출이나 개발 DB 접근은 하지 않음)
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+# backend 모듈을 패키지 없이 import 할 수 있도록 경로 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from analysis_cache import _upsert_chunk
+from models import AnalysisCache, Base
+
+
+def _rows(values):
+    now = datetime.utcnow()
+    return [
+        {"key": key, "kind": "individual", "value": value, "hit_count": 0, "created_at": now, "last_accessed_at": now}
+        for key, value in values.items()
+    ]
+
+
+def test_upsert_overwrites_existing_keys():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        _upsert_chunk(db, _rows({"a": "1", "b": "2"}))
+        db.commit()
+        # 다른 분석이 같은 키를 동시에 저장한 경우처럼 이미 있는 키를 다시 저장
+        _upsert_chunk(db, _rows({"a": "3", "c": "4"}))
+        db.commit()
+
+        stored = dict(db.query(AnalysisCache.key, AnalysisCache.value))
+        assert stored == {"a": "3", "b": "2", "c": "4"}
@@ -0,0 +1,20 @@
+import pytest
+
+from response_cache import etag_matches
+
+ETAG = '"abc123"'
+
+
+@pytest.mark.parametrize("if_none_match, expected", [
+    ('"abc123"', True),
+    ('W/"abc123"', True),
+    ('"old", "abc123"', True),
+    ('"old",W/"abc123"', True),
+    ("*", True),
+    ('"old"', False),
+    ("abc123", False),
+    ("", False),
+    (None, False),
+])
+def test_etag_matches(if_none_match, expected):
+    assert etag_matches(if_none_match, ETAG) is expected
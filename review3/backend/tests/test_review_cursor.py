@@ -0,0 +1,33 @@
+import base64
+
+import pytest
+from fastapi import HTTPException
+
+from main import _decode_cursor, _encode_cursor
+
+
+@pytest.mark.parametrize("values", [
+    [42],
+    [4.5, 1203],
+    [None, 7],
+    [0],
+])
+def test_cursor_round_trip(values):
+    cursor = _encode_cursor(values)
+
+    assert "=" not in cursor
+    assert _decode_cursor(cursor, len(values)) == values
+
+
+@pytest.mark.parametrize("cursor, size", [
+    ("not-base64!", 1),
+    (base64.urlsafe_b64encode(b"{\"id\": 1}").decode(), 1),
+    (_encode_cursor([1, 2]), 1),
+    (_encode_cursor([1]), 2),
+    (base64.urlsafe_b64encode(b"[1").decode(), 1),
+])
+def test_invalid_cursor_is_bad_request(cursor, size):
+    with pytest.raises(HTTPException) as error:
+        _decode_cursor(cursor, size)
+
+    assert error.value.status_code == 400
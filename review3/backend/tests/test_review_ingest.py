@@ -0,0 +1,68 @@
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from models import AppInfo, AppReview, Base
+from review_ingest import _insert_statement, insert_reviews
+
+
+def _reviews(dates):
+    return [
+        {"rating": 5.0, "review_content": f"리뷰 {i}", "review_date": review_date}
+        for i, review_date in enumerate(dates)
+    ]
+
+
+def test_unparseable_dates_are_typed_nulls_for_postgresql():
+    rows = [("app", 5.0, "리뷰", "날짜 정보 없음", None, None, "hash")]
+    sql = str(_insert_statement(rows, "postgresql").compile(dialect=postgresql.asyncpg.dialect()))
+    assert "CAST(NULL AS DATE)" in sql
+    assert "ON CONFLICT (app_id, content_hash) DO NOTHING" in sql
+
+
+def test_insert_chunk_with_only_unparseable_dates():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(AppInfo(app_id="app", app_name="앱"))
+        db.commit()
+
+        ids = insert_reviews(db, "app", _reviews(["날짜 정보 없음"] * 3))
+        db.commit()
+
+        assert len(ids) == 3
+        assert db.query(AppReview).filter(AppReview.review_date_value.isnot(None)).count() == 0
+
+
+def test_insert_mixed_dates_and_skips_duplicates():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(AppInfo(app_id="app", app_name="앱"))
+        db.commit()
+
+        reviews = _reviews(["2024년 1월 5일", "날짜 정보 없음"])
+        assert len(insert_reviews(db, "app", reviews)) == 2
+        assert insert_reviews(db, "app", reviews) == []
+        db.commit()
+
+        dates = sorted(str(value) for (value,) in db.query(AppReview.review_date_value))
+        assert dates == ["2024-01-05", "None"]
+
+
+def test_same_short_review_from_different_reviewers_is_kept():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(AppInfo(app_id="app", app_name="앱"))
+        db.commit()
+
+        reviews = [
+            {"rating": 5.0, "review_content": "좋아요", "review_date": "2024년 1월 5일", "reviewer_name": name}
+            for name in ("사용자1", "사용자2", "사용자1")
+        ]
+        assert len(insert_reviews(db, "app", reviews)) == 2
+        db.commit()
+
+        names = sorted(name for (name,) in db.query(AppReview.reviewer_name))
+        assert names == ["사용자1", "사용자2"]
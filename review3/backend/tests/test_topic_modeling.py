@@ -0,0 +1,16 @@
+import json
+
+import numpy as np
+
+from topic_modeling import chart_points
+
+
+def test_chart_points_keep_three_decimals_from_float32():
+    tsne_output = np.array([[-0.76600003, 12.34567], [1.0005, -3.14159]], dtype=np.float32)
+    lda_output = np.array([[0.1, 0.9], [0.8, 0.2]])
+
+    chart = chart_points(tsne_output, lda_output)
+
+    assert json.dumps(chart["x"]) == "[-0.766, 1.0]"
+    assert json.dumps(chart["y"]) == "[12.346, -3.142]"
+    assert chart["topic"] == [2, 1]
@@ -0,0 +1,51 @@
+from datetime import date
+
+import pytest
+
+from value_parsers import parse_count, parse_rating, parse_review_date
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1억회 이상", 100_000_000),
+    ("리뷰 3.5만개", 35_000),
+    ("5천만+", 50_000_000),
+    ("1,234", 1_234),
+    ("10K+ reviews", 10_000),
+    ("1.2M downloads", 1_200_000),
+    ("5B+", 5_000_000_000),
+    ("정보 없음", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_count(text, expected):
+    assert parse_count(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("4.5", 4.5),
+    ("5", 5.0),
+    ("0", 0.0),
+    ("Rated 4.1 stars out of five stars", 4.1),
+    ("7.0", None),
+    ("정보 없음", None),
+    (None, None),
+])
+def test_parse_rating(text, expected):
+    assert parse_rating(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2024년 1월 5일", date(2024, 1, 5)),
+    ("2024년 12월 31일", date(2024, 12, 31)),
+    ("2024. 1. 5.", date(2024, 1, 5)),
+    ("2024-01-05", date(2024, 1, 5)),
+    ("January 5, 2024", date(2024, 1, 5)),
+    ("Jan 5, 2024", date(2024, 1, 5)),
+    (" March 10, 2023 ", date(2023, 3, 10)),
+    ("2024년 2월 30일", None),
+    ("어제", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_review_date(text, expected):
+    assert parse_review_date(text) == expected
@@ -0,0 +1,74 @@
+"""
+리뷰 형태소 분석 결과(형용사 토큰) 캐시 모듈
+
+전처리된 리뷰 내용의 해시와 형태소 분석기 버전을 키로 토큰을 DB에 저장해,
+같은 리뷰로 토픽 모델링을 반복할 때 새 리뷰만 형태소 분석합니다.
+"""
+import hashlib
+import json
+from typing import Dict, List
+
+from sqlalchemy.exc import IntegrityError
+
+from database import SessionLocal
+from models import ReviewToken
+from topic_modeling import tokenize_documents, tokenizer_version
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _load(hashes: List[str], version: str) -> Dict[str, List[str]]:
+    found = {}
+    db = SessionLocal()
+    try:
+        for start in range(0, len(hashes), 500):
+            rows = (
+                db.query(ReviewToken.text_hash, ReviewToken.tokens)
+                .filter(ReviewToken.tokenizer_version == version)
+                .filter(ReviewToken.text_hash.in_(hashes[start:start + 500]))
+                .all()
+            )
+            found.update((text_hash, json.loads(tokens)) for text_hash, tokens in rows)
+    finally:
+        db.close()
+    return found
+
+
+def _store(tokens_by_hash: Dict[str, List[str]], version: str):
+    db = SessionLocal()
+    try:
+        db.add_all(
+            ReviewToken(text_hash=text_hash, tokenizer_version=version, tokens=json.dumps(tokens, ensure_ascii=False))
+            for text_hash, tokens in tokens_by_hash.items()
+        )
+        db.commit()
+    except IntegrityError:
+        # 동시에 실행된 다른 토픽 모델링이 먼저 저장한 경우 - 결과가 같으므로 무시
+        db.rollback()
+    finally:
+        db.close()
+
+
+def tokenize_with_cache(processed_texts: List[str]) -> List[List[str]]:
+    """
+    저장된 토큰을 재사용하고 캐시에 없는 리뷰만 형태소 분석합니다.
+    tokenize_reviews의 tokenizer로 사용합니다.
+    """
+    version = tokenizer_version()
+    hashes = [_text_hash(text) for text in processed_texts]
+    cached = _load(list(dict.fromkeys(hashes)), version)
+
+    # 캐시에 없는 리뷰만 중복 없이 분석
+    missing: Dict[str, str] = {}
+    for text_hash, text in zip(hashes, processed_texts):
+        if text_hash not in cached and text_hash not in missing:
+            missing[text_hash] = text
+
+    if missing:
+        fresh = dict(zip(missing, tokenize_documents(list(missing.values()))))
+        _store(fresh, version)
+        cached.update(fresh)
+
+    return [cached[text_hash] for text_hash in hashes]
@@ -0,0 +1,135 @@
+"""
+앱별 토픽 모델 저장소
+
+학습한 vectorizer와 LDA 모델, 토픽 모델링 결과를 앱마다 저장합니다.
+- 리뷰가 그대로면 저장된 결과를 바로 반환
+- 새 리뷰만 추가되었으면 LDA를 partial_fit으로 온라인 갱신
+- 리뷰가 삭제되었거나 새 리뷰가 너무 많으면 전체 재학습
+- topic_range를 지정하면 범위 안의 토픽 수를 병렬로 비교해 가장 좋은 토픽 수로 위 과정을 진행
+  (fingerprint에 토픽 수 대신 범위를 넣어, 리뷰와 범위가 그대로면 탐색 없이 저장된 결과를 반환)
+"""
+import hashlib
+import json
+import os
+import pickle
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models import AppReview, TopicModel
+from token_cache import tokenize_with_cache
+from topic_modeling import (
+    fit_topic_model,
+    summarize_topics,
+    sweep_topic_counts,
+    tokenize_reviews,
+    tokenizer_version,
+    update_topic_model,
+)
+
+# 모델 학습 방식이나 결과 형식을 바꾸면 버전을 올려 저장된 모델을 다시 학습하도록 함
+MODEL_VERSION = "lda-v3"
+# 마지막 전체 학습 이후 새 리뷰가 이 비율을 넘으면 partial_fit 대신 전체 재학습
+REFIT_RATIO = float(os.getenv("TOPIC_MODEL_REFIT_RATIO", "0.5"))
+
+
+def _config(n_topics, n_top_words: int) -> str:
+    return f"{MODEL_VERSION}|{tokenizer_version()}|{n_topics}|{n_top_words}"
+
+
+def _fingerprint(config: str, review_ids: List[int]) -> str:
+    raw = config + "|" + ",".join(str(review_id) for review_id in review_ids)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def model_app_topics(
+    db: Session,
+    app_id: str,
+    reviews: List[AppReview],
+    n_topics: int = 5,
+    n_top_words: int = 10,
+    topic_range: Optional[Tuple[int, int]] = None
+) -> Dict[str, Any]:
+    """
+    앱 리뷰의 토픽 모델링 결과를 반환합니다. 저장된 모델을 재사용하거나 갱신하고 결과를 저장합니다.
+    결과의 model_status는 cached(저장된 결과), updated(온라인 갱신), fitted(전체 학습) 중 하나입니다.
+    topic_range=(최소, 최대)를 지정하면 n_topics 대신 탐색으로 고른 토픽 수를 사용하고
+    토픽 수별 점수를 topic_sweep에 담아 반환합니다.
+    """
+    documents = sorted((r.id, r.review_content) for r in reviews if r.review_content)
+    review_ids = [review_id for review_id, _ in documents]
+    texts = [text for _, text in documents]
+
+    if len(texts) < 3:
+        raise ValueError("토픽 모델링을 수행하기에 리뷰가 너무 적습니다. (최소 3개 필요)")
+
+    timings = {}
+    if topic_range:
+        fingerprint = _fingerprint(_config(f"{topic_range[0]}-{topic_range[1]}", n_top_words), review_ids)
+    else:
+        fingerprint = _fingerprint(_config(n_topics, n_top_words), review_ids)
+
+    started = time.perf_counter()
+    stored = db.get(TopicModel, app_id)
+    if stored and stored.fingerprint == fingerprint:
+        # 탐색 결과(topic_sweep)도 저장된 결과에 포함되어 있음
+        result = json.loads(stored.result)
+        timings["load"] = time.perf_counter() - started
+        result["timings"] = {stage: round(seconds, 3) for stage, seconds in timings.items()}
+        result["model_status"] = "cached"
+        return result
+
+    tokenized_docs = tokenize_reviews(texts, tokenize_with_cache, timings)
+    sweep = None
+    if topic_range:
+        sweep = sweep_topic_counts(tokenized_docs, *topic_range, n_top_words=n_top_words, timings=timings)
+        n_topics = sweep["best_n_topics"]
+    config = _config(n_topics, n_top_words)
+
+    lda_output = None
+    fitted_review_count = len(texts)
+    if stored and stored.config == config:
+        previous_ids = set(json.loads(stored.review_ids))
+        new_positions = [idx for idx, review_id in enumerate(review_ids) if review_id not in previous_ids]
+        # 삭제된 리뷰가 없고 새 리뷰가 많지 않을 때만 온라인 갱신
+        if previous_ids.issubset(review_ids) and len(new_positions) <= REFIT_RATIO * stored.fitted_review_count:
+            vectorizer, lda_model = pickle.loads(stored.model)
+            lda_output = update_topic_model(
+                vectorizer, lda_model, [tokenized_docs[idx] for idx in new_positions], tokenized_docs, timings
+            )
+            fitted_review_count = stored.fitted_review_count
+
+    status = "updated" if lda_output is not None else "fitted"
+    if lda_output is None:
+        vectorizer, lda_model, lda_output = fit_topic_model(tokenized_docs, n_topics, timings)
+
+    result = summarize_topics(vectorizer, lda_model, lda_output, texts, n_top_words, timings)
+    if sweep:
+        result["topic_sweep"] = sweep
+
+    # 모델은 이 서버가 직접 학습해 저장한 것만 pickle로 불러옴
+    values = dict(
+        config=config,
+        fingerprint=fingerprint,
+        review_ids=json.dumps(review_ids),
+        fitted_review_count=fitted_review_count,
+        model=pickle.dumps((vectorizer, lda_model)),
+        result=json.dumps(result, ensure_ascii=False),
+        updated_at=datetime.utcnow(),
+    )
+    try:
+        if stored:
+            for key, value in values.items():
+                setattr(stored, key, value)
+        else:
+            db.add(TopicModel(app_id=app_id, **values))
+        db.commit()
+    except IntegrityError:
+        # 같은 앱의 토픽 모델링이 동시에 실행되어 먼저 저장된 경우
+        db.rollback()
+
+    result["model_status"] = status
+    return result
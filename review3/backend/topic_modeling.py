@@ -2,16 +2,25 @@
 """
 토픽 모델링 및 t-SNE 시각화 모듈
 """
+import os
 import re
 import base64
+import hashlib
+import threading
+import time
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional
 
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.decomposition import LatentDirichletAllocation
-from sklearn.manifold import TSNE
+from joblib import Parallel, delayed
+
+from projection import project_2d
 
 # matplotlib 설정 (인코딩 문제 방지를 위해 영문 사용)
 import matplotlib
@@ -34,31 +43,79 @@ def preprocess_korean_text(text: str) -> str:
     text = re.sub(r'\s+', ' ', text)
     return text.strip()
 
-def extract_adjectives(text: str) -> List[str]:
+# 형태소 분석/LDA를 여러 프로세스로 나눠 실행할 최소 리뷰 수
+PARALLEL_THRESHOLD = int(os.getenv("TOPIC_MODELING_PARALLEL_THRESHOLD", "2000"))
+# 토픽 모델링 한 번에 사용할 최대 프로세스 수 (형태소 분석, LDA, 토픽 수 탐색 공통 CPU 예산)
+MAX_WORKERS = int(os.getenv("TOPIC_MODELING_WORKERS", str(os.cpu_count() or 1)))
+# 토픽 수 탐색 시 perplexity 평가용으로 떼어 둘 리뷰 비율 (리뷰가 SWEEP_MIN_HOLDOUT_DOCS개 이상일 때)
+SWEEP_HOLDOUT_RATIO = 0.2
+SWEEP_MIN_HOLDOUT_DOCS = 50
+
+# 형용사 추출 규칙을 바꾸면 버전을 올려 저장된 토큰을 다시 분석하도록 함
+TOKENIZER_VERSION = "adj-v1"
+
+_okt = None
+_okt_available = True
+_okt_lock = threading.Lock()
+
+def get_okt():
     """
-    형용사만 추출하는 함수
-    KoNLPy가 설치되어 있으면 사용, 없으면 간단한 방법 사용
+    프로세스 전역 Okt 형태소 분석기를 반환합니다.
+    Okt 생성은 JVM을 띄우므로 프로세스당 한 번만 생성하고, KoNLPy가 없으면 None을 반환합니다.
     """
-    # 전처리
-    text = preprocess_korean_text(text)
-    
+    global _okt, _okt_available
+    if _okt is None and _okt_available:
+        with _okt_lock:
+            if _okt is None and _okt_available:
+                try:
+                    from konlpy.tag import Okt
+                    _okt = Okt()
+                except Exception:
+                    # KoNLPy 또는 JVM이 없으면 간단한 방법 사용
+                    _okt_available = False
+    return _okt
+
+def tokenizer_version() -> str:
+    """현재 사용 중인 형태소 분석 방법과 버전 (토큰 캐시 키)"""
+    engine = "okt" if get_okt() is not None else "simple"
+    return f"{engine}-{TOKENIZER_VERSION}"
+
+def _adjectives_from_pos(okt, text: str) -> List[str]:
     try:
-        # KoNLPy의 Okt 사용 시도
-        from konlpy.tag import Okt
-        okt = Okt()
-        
         # 형태소 분석 및 형용사만 추출
         pos_tags = okt.pos(text)
-        adjectives = [word for word, pos in pos_tags if pos == 'Adjective' and len(word) >= 2]
-        
-        return adjectives
-    except ImportError:
-        # KoNLPy가 없으면 간단한 형용사 패턴 매칭 사용
-        return simple_adjective_extraction(text)
+        return [word for word, pos in pos_tags if pos == 'Adjective' and len(word) >= 2]
     except Exception:
         # 기타 오류 시 대체 방법 사용
         return simple_adjective_extraction(text)
 
+def _tokenize_chunk(texts: List[str]) -> List[List[str]]:
+    """전처리된 텍스트 묶음의 형용사를 추출합니다 (작업 프로세스에서도 실행)."""
+    okt = get_okt()
+    if okt is None:
+        return [simple_adjective_extraction(text) for text in texts]
+    return [_adjectives_from_pos(okt, text) for text in texts]
+
+def tokenize_documents(processed_texts: List[str], workers: Optional[int] = None) -> List[List[str]]:
+    """
+    전처리된 전체 리뷰를 한 번에 형태소 분석해 리뷰별 형용사 리스트를 반환합니다.
+    리뷰 수가 PARALLEL_THRESHOLD 이상이면 여러 프로세스로 나눠 분석합니다.
+    """
+    workers = MAX_WORKERS if workers is None else workers
+    if workers <= 1 or len(processed_texts) < PARALLEL_THRESHOLD:
+        return _tokenize_chunk(processed_texts)
+    
+    # 프로세스마다 Okt(JVM)를 한 번씩 띄우므로 묶음을 크게 나눔
+    chunk_size = -(-len(processed_texts) // (workers * 4))
+    chunks = [processed_texts[i:i + chunk_size] for i in range(0, len(processed_texts), chunk_size)]
+    
+    # JVM이 떠 있는 프로세스를 fork하면 멈출 수 있으므로 spawn 사용
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return [tokens for chunk in executor.map(_tokenize_chunk, chunks) for tokens in chunk]
+
+def _identity(tokens: List[str]) -> List[str]:
+    return tokens
+
 def simple_adjective_extraction(text: str) -> List[str]:
     """
     간단한 형용사 추출 (KoNLPy 없이)
@@ -84,58 +141,202 @@ def simple_adjective_extraction(text: str) -> List[str]:
     
     return [adj for adj in adjectives if len(adj) >= 2]
 
-def perform_topic_modeling(
-    reviews: List[Dict[str, Any]], 
-    n_topics: int = 5,
-    n_top_words: int = 10
-) -> Dict[str, Any]:
-    """
-    형용사 기반 토픽 모델링 수행
+def tokenize_reviews(
+    texts: List[str],
+    tokenizer: Optional[Callable[[List[str]], List[List[str]]]] = None,
+    timings: Optional[Dict[str, float]] = None
+) -> List[List[str]]:
+    """리뷰 텍스트를 전처리하고 전체 리뷰를 한 번에 형태소 분석합니다."""
+    timings = {} if timings is None else timings
     
-    Args:
-        reviews: 리뷰 데이터 리스트 (review_content 필드 필요)
-        n_topics: 추출할 토픽 수
-        n_top_words: 각 토픽당 상위 형용사 수
+    started = time.perf_counter()
+    processed_texts = [preprocess_korean_text(text) for text in texts]
+    timings['preprocess'] = time.perf_counter() - started
     
-    Returns:
-        토픽 모델링 결과 (토픽, 형용사, t-SNE 차트 등)
+    started = time.perf_counter()
+    # CountVectorizer 기본 동작과 같이 소문자로 변환 후 분석
+    tokenized_docs = (tokenizer or tokenize_documents)([text.lower() for text in processed_texts])
+    timings['tokenize'] = time.perf_counter() - started
+    return tokenized_docs
+
+def build_doc_term_matrix(tokenized_docs: List[List[str]]):
     """
-    # 리뷰 텍스트 추출
-    texts = [r.get('review_content', '') for r in reviews if r.get('review_content')]
+    형용사 문서-단어 행렬을 만듭니다.
     
-    if len(texts) < 3:
-        raise ValueError("토픽 모델링을 수행하기에 리뷰가 너무 적습니다. (최소 3개 필요)")
-    
-    # 텍스트 전처리
-    processed_texts = [preprocess_korean_text(text) for text in texts]
-    
-    # CountVectorizer로 문서-단어 행렬 생성 (형용사만)
+    Returns:
+        (vectorizer, doc_term_matrix)
+    """
+    # CountVectorizer로 문서-단어 행렬 생성 (형용사만, 이미 분석한 토큰 사용)
     vectorizer = CountVectorizer(
-        tokenizer=extract_adjectives,
+        analyzer=_identity,
         max_features=500,  # 형용사는 명사보다 적으므로 조정
         min_df=1,  # 최소 1개 문서에 등장 (형용사가 적을 수 있음)
         max_df=0.9  # 90% 이상 문서에 등장하는 단어 제외
     )
     
     try:
-        doc_term_matrix = vectorizer.fit_transform(processed_texts)
+        doc_term_matrix = vectorizer.fit_transform(tokenized_docs)
     except ValueError as e:
         error_msg = str(e).encode('utf-8', errors='ignore').decode('utf-8')
         raise ValueError(f"텍스트 벡터화 실패: 리뷰에서 형용사를 충분히 추출하지 못했습니다. 더 많은 리뷰가 필요하거나 리뷰 내용이 유사할 수 있습니다.")
     except Exception as e:
         raise ValueError(f"형용사 추출 중 오류가 발생했습니다. 리뷰 내용을 확인해주세요.")
     
+    return vectorizer, doc_term_matrix
+
+def _lda_n_jobs(n_docs: int) -> int:
+    """리뷰가 많을 때만 LDA E-step을 여러 프로세스로 나눔 (적으면 프로세스 생성 비용이 더 큼)"""
+    return MAX_WORKERS if n_docs >= PARALLEL_THRESHOLD else 1
+
+def fit_topic_model(tokenized_docs: List[List[str]], n_topics: int, timings: Optional[Dict[str, float]] = None):
+    """
+    형용사 문서-단어 행렬을 만들고 LDA 모델을 학습합니다.
+    
+    Returns:
+        (vectorizer, lda_model, lda_output)
+    """
+    timings = {} if timings is None else timings
+    
+    started = time.perf_counter()
+    vectorizer, doc_term_matrix = build_doc_term_matrix(tokenized_docs)
+    
     if doc_term_matrix.shape[1] < n_topics:
         n_topics = max(2, doc_term_matrix.shape[1] - 1)
     
+    timings['vectorize'] = time.perf_counter() - started
+    
     # LDA 토픽 모델링
+    started = time.perf_counter()
     lda_model = LatentDirichletAllocation(
         n_components=n_topics,
         random_state=42,
-        max_iter=50
+        max_iter=50,
+        n_jobs=_lda_n_jobs(doc_term_matrix.shape[0])
     )
     
     lda_output = lda_model.fit_transform(doc_term_matrix)
+    timings['lda'] = time.perf_counter() - started
+    return vectorizer, lda_model, lda_output
+
+def _umass_coherence(binary_matrix, components: np.ndarray, n_top_words: int) -> float:
+    """
+    토픽별 상위 단어의 UMass coherence 평균 (0에 가까울수록 좋음)
+    C(t) = sum_{m>l} log((D(w_m, w_l) + 1) / D(w_l)), D: 단어(쌍)가 등장한 문서 수
+    """
+    scores = []
+    for topic in components:
+        top = topic.argsort()[-n_top_words:][::-1]
+        sub = binary_matrix[:, top]
+        co_occurrence = (sub.T @ sub).toarray()
+        doc_freq = np.diag(co_occurrence)
+        pairs = [
+            np.log((co_occurrence[m, l] + 1) / doc_freq[l])
+            for m in range(1, len(top)) for l in range(m) if doc_freq[l] > 0
+        ]
+        scores.append(float(np.mean(pairs)) if pairs else 0.0)
+    return float(np.mean(scores))
+
+def _score_topic_count(train_matrix, test_matrix, binary_matrix, n_topics: int, n_top_words: int) -> Dict[str, Any]:
+    """토픽 수 하나로 LDA를 학습하고 perplexity와 coherence를 계산합니다 (작업 프로세스에서 실행)."""
+    started = time.perf_counter()
+    lda_model = LatentDirichletAllocation(n_components=n_topics, random_state=42, max_iter=50)
+    lda_model.fit(train_matrix)
+    return {
+        'n_topics': n_topics,
+        'perplexity': round(float(lda_model.perplexity(test_matrix)), 3),
+        'coherence': round(_umass_coherence(binary_matrix, lda_model.components_, n_top_words), 4),
+        'seconds': round(time.perf_counter() - started, 3)
+    }
+
+def sweep_topic_counts(
+    tokenized_docs: List[List[str]],
+    min_topics: int,
+    max_topics: int,
+    n_top_words: int = 10,
+    timings: Optional[Dict[str, float]] = None
+) -> Dict[str, Any]:
+    """
+    min_topics~max_topics 범위의 토픽 수를 여러 프로세스에서 동시에 학습해 비교합니다.
+    UMass coherence가 가장 높은 토픽 수를 고르고, 같으면 perplexity가 낮은 쪽을 고릅니다.
+    리뷰가 충분하면 perplexity는 학습에 쓰지 않은 리뷰로 계산합니다.
+    
+    Returns:
+        {'best_n_topics', 'scores': 토픽 수별 점수 리스트, 'workers', 'held_out_docs'}
+    """
+    timings = {} if timings is None else timings
+    if min_topics > max_topics:
+        raise ValueError("min_topics는 max_topics보다 클 수 없습니다.")
+    
+    started = time.perf_counter()
+    _, doc_term_matrix = build_doc_term_matrix(tokenized_docs)
+    # 어휘 수보다 토픽이 많으면 의미가 없으므로 범위를 줄임
+    max_topics = max(2, min(max_topics, doc_term_matrix.shape[1] - 1))
+    candidates = list(range(min(min_topics, max_topics), max_topics + 1))
+    
+    n_docs = doc_term_matrix.shape[0]
+    if n_docs >= SWEEP_MIN_HOLDOUT_DOCS:
+        order = np.random.default_rng(42).permutation(n_docs)
+        n_test = int(n_docs * SWEEP_HOLDOUT_RATIO)
+        train_matrix, test_matrix = doc_term_matrix[order[n_test:]], doc_term_matrix[order[:n_test]]
+    else:
+        train_matrix = test_matrix = doc_term_matrix
+        n_test = 0
+    binary_matrix = (doc_term_matrix > 0).astype(np.int32).tocsc()
+    
+    # 토픽 수마다 프로세스 하나, 전체 프로세스 수는 CPU 예산 이내
+    workers = max(1, min(MAX_WORKERS, len(candidates)))
+    scores = Parallel(n_jobs=workers)(
+        delayed(_score_topic_count)(train_matrix, test_matrix, binary_matrix, k, n_top_words)
+        for k in candidates
+    )
+    timings['sweep'] = time.perf_counter() - started
+    
+    best = max(scores, key=lambda score: (score['coherence'], -score['perplexity']))
+    return {
+        'best_n_topics': best['n_topics'],
+        'scores': scores,
+        'workers': workers,
+        'held_out_docs': n_test
+    }
+
+def update_topic_model(
+    vectorizer: CountVectorizer,
+    lda_model: LatentDirichletAllocation,
+    new_docs: List[List[str]],
+    tokenized_docs: List[List[str]],
+    timings: Optional[Dict[str, float]] = None
+) -> np.ndarray:
+    """
+    학습된 LDA 모델을 새 리뷰로 온라인 갱신(partial_fit)하고 전체 리뷰의 토픽 분포를 반환합니다.
+    어휘는 처음 학습할 때의 것을 유지하므로 새 리뷰에만 있는 형용사는 반영되지 않습니다.
+    """
+    timings = {} if timings is None else timings
+    
+    started = time.perf_counter()
+    new_matrix = vectorizer.transform(new_docs)
+    doc_term_matrix = vectorizer.transform(tokenized_docs)
+    timings['vectorize'] = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    if new_matrix.nnz:
+        # 전체 문서 수를 알려줘야 새 리뷰의 가중치가 올바르게 반영됨
+        lda_model.set_params(total_samples=doc_term_matrix.shape[0])
+        lda_model.partial_fit(new_matrix)
+    lda_output = lda_model.transform(doc_term_matrix)
+    timings['lda'] = time.perf_counter() - started
+    return lda_output
+
+def summarize_topics(
+    vectorizer: CountVectorizer,
+    lda_model: LatentDirichletAllocation,
+    lda_output: np.ndarray,
+    texts: List[str],
+    n_top_words: int = 10,
+    timings: Optional[Dict[str, float]] = None
+) -> Dict[str, Any]:
+    """학습된 모델로 토픽별 상위 형용사, 리뷰별 주요 토픽, t-SNE 차트를 만듭니다."""
+    timings = {} if timings is None else timings
+    n_topics = lda_model.n_components
     
     # 토픽별 상위 단어 추출
     feature_names = vectorizer.get_feature_names_out()
@@ -162,81 +363,147 @@ def perform_topic_modeling(
             'review_preview': texts[idx][:50] + '...' if len(texts[idx]) > 50 else texts[idx]
         })
     
-    # t-SNE 시각화 (2D)
-    if lda_output.shape[0] >= 5:  # t-SNE는 최소 5개 샘플 필요
-        try:
-            tsne = TSNE(n_components=2, random_state=42, perplexity=min(30, len(texts) - 1))
-            tsne_output = tsne.fit_transform(lda_output)
-            
-            # t-SNE 차트 생성
-            chart_base64 = create_tsne_chart(tsne_output, lda_output, n_topics)
-        except Exception:
-            # t-SNE 생성 실패 시 차트 없이 진행
-            chart_base64 = None
-    else:
-        chart_base64 = None
+    # t-SNE 시각화 (2D, 리뷰가 많으면 샘플링 후 나머지는 최근접 이웃 위치로 배치)
+    started = time.perf_counter()
+    projection_info = None
+    try:
+        tsne_output, projection_info = project_2d(lda_output)
+        
+        # 차트 좌표 (클라이언트 렌더링용, PNG는 render_chart로 변환)
+        chart = chart_points(tsne_output, lda_output) if tsne_output is not None else None
+    except Exception:
+        # t-SNE 생성 실패 시 차트 없이 진행
+        chart = None
+    timings['projection'] = time.perf_counter() - started
     
     return {
         'n_topics': n_topics,
         'topics': topics,
         'doc_topics': doc_topics,
-        'chart': chart_base64,
-        'total_reviews': len(texts)
+        'chart': chart,
+        'total_reviews': len(texts),
+        'projection': projection_info,
+        'timings': {stage: round(seconds, 3) for stage, seconds in timings.items()}
+    }
+
+CHART_FORMATS = ("points", "binary", "png")
+# 서버에서 렌더링한 PNG 차트를 보관할 최대 개수
+CHART_CACHE_SIZE = int(os.getenv("TOPIC_CHART_CACHE_SIZE", "32"))
+
+_chart_cache: "OrderedDict[str, str]" = OrderedDict()
+_chart_cache_lock = threading.Lock()
+
+def chart_points(tsne_output: np.ndarray, lda_output: np.ndarray) -> Dict[str, Any]:
+    """
+    클라이언트에서 산점도를 그릴 수 있도록 좌표와 리뷰별 주요 토픽(1부터 시작)을 반환합니다.
+    좌표는 화면 표시에 충분한 소수점 3자리까지만 유지합니다.
+    """
+    return {
+        'format': 'points',
+        # float32에서 반올림하면 -0.766이 -0.765999972820282처럼 직렬화되므로 float64로 바꾼 뒤 반올림
+        'x': np.round(tsne_output[:, 0].astype(np.float64), 3).tolist(),
+        'y': np.round(tsne_output[:, 1].astype(np.float64), 3).tolist(),
+        'topic': (np.argmax(lda_output, axis=1) + 1).tolist()
+    }
+
+def _pack_points(chart: Dict[str, Any]) -> Dict[str, Any]:
+    """좌표를 float32 [x0, y0, x1, y1, ...] 배열, 토픽을 uint8 배열로 묶어 base64로 인코딩합니다 (little-endian)."""
+    coords = np.column_stack([chart['x'], chart['y']]).astype('<f4')
+    topics = np.asarray(chart['topic'], dtype=np.uint8)
+    return {
+        'format': 'binary',
+        'count': len(topics),
+        'coords': base64.b64encode(coords.tobytes()).decode('ascii'),
+        'topics': base64.b64encode(topics.tobytes()).decode('ascii')
     }
 
-def create_tsne_chart(tsne_output: np.ndarray, lda_output: np.ndarray, n_topics: int) -> str:
+def _render_png(chart: Dict[str, Any], n_topics: int) -> Optional[str]:
+    """PNG 차트를 렌더링합니다. 같은 좌표의 차트는 캐시된 이미지를 재사용합니다."""
+    coords = np.column_stack([chart['x'], chart['y']]).astype(np.float32)
+    main_topics = np.asarray(chart['topic'], dtype=np.int64) - 1
+    key = hashlib.sha256(coords.tobytes() + main_topics.tobytes() + str(n_topics).encode()).hexdigest()
+    
+    with _chart_cache_lock:
+        if key in _chart_cache:
+            _chart_cache.move_to_end(key)
+            return _chart_cache[key]
+    
+    image = create_tsne_chart(coords, main_topics, n_topics)
+    if image is not None:
+        with _chart_cache_lock:
+            _chart_cache[key] = image
+            while len(_chart_cache) > CHART_CACHE_SIZE:
+                _chart_cache.popitem(last=False)
+    return image
+
+def render_chart(result: Dict[str, Any], chart_format: str = "points") -> Dict[str, Any]:
+    """
+    토픽 모델링 결과의 차트를 요청한 형식으로 변환합니다.
+    - points: 좌표/토픽 JSON 배열 (기본값)
+    - binary: base64로 인코딩한 float32 좌표와 uint8 토픽 배열
+    - png: 서버에서 렌더링한 base64 PNG (data URI)
+    """
+    if chart_format not in CHART_FORMATS:
+        raise ValueError(f"알 수 없는 차트 형식입니다: {chart_format} (사용 가능: {', '.join(CHART_FORMATS)})")
+    
+    chart = result.get('chart')
+    if chart is None or chart_format == "points":
+        return result
+    if chart_format == "binary":
+        return {**result, 'chart': _pack_points(chart)}
+    return {**result, 'chart': _render_png(chart, result['n_topics'])}
+
+def create_tsne_chart(tsne_output: np.ndarray, main_topics: np.ndarray, n_topics: int) -> str:
     """
     t-SNE 차트 생성 및 base64 인코딩
+    pyplot 전역 상태를 쓰지 않는 Figure 객체로 그려 여러 요청에서 동시에 호출해도 안전합니다.
     
     Args:
         tsne_output: t-SNE 결과 (n_samples, 2)
-        lda_output: LDA 토픽 분포 (n_samples, n_topics)
+        main_topics: 각 문서의 주요 토픽 (0부터 시작, n_samples)
         n_topics: 토픽 수
     
     Returns:
         base64 인코딩된 차트 이미지
     """
     try:
-        # 각 문서의 주요 토픽 결정
-        main_topics = np.argmax(lda_output, axis=1)
-        
         # 차트 생성
-        plt.figure(figsize=(12, 8))
+        fig = Figure(figsize=(12, 8))
+        ax = fig.subplots()
+        
+        # 리뷰가 많으면 점 크기를 줄여 겹침 완화
+        marker_size = 100 if len(tsne_output) <= 500 else max(10, 100 * np.sqrt(500 / len(tsne_output)))
         
         # 토픽별로 다른 색상
-        colors = plt.cm.rainbow(np.linspace(0, 1, n_topics))
+        colors = matplotlib.colormaps['rainbow'](np.linspace(0, 1, n_topics))
         
         for topic_id in range(n_topics):
             indices = main_topics == topic_id
             if np.sum(indices) > 0:
-                plt.scatter(
+                ax.scatter(
                     tsne_output[indices, 0],
                     tsne_output[indices, 1],
                     c=[colors[topic_id]],
                     label=f'Topic {topic_id + 1}',  # 영문으로 변경 (인코딩 문제 방지)
                     alpha=0.7,
-                    s=100,
+                    s=marker_size,
                     edgecolors='black',
                     linewidth=0.5
                 )
         
-        plt.title('Review Topic Distribution (t-SNE)', fontsize=16, fontweight='bold', pad=20)
-        plt.xlabel('t-SNE Dimension 1', fontsize=12)
-        plt.ylabel('t-SNE Dimension 2', fontsize=12)
-        plt.legend(loc='best', fontsize=10)
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
+        ax.set_title('Review Topic Distribution (t-SNE)', fontsize=16, fontweight='bold', pad=20)
+        ax.set_xlabel('t-SNE Dimension 1', fontsize=12)
+        ax.set_ylabel('t-SNE Dimension 2', fontsize=12)
+        ax.legend(loc='best', fontsize=10)
+        ax.grid(True, alpha=0.3)
+        fig.tight_layout()
         
         # 이미지를 base64로 인코딩
         buffer = BytesIO()
-        plt.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
-        buffer.seek(0)
-        image_base64 = base64.b64encode(buffer.read()).decode('utf-8')
-        plt.close()
+        fig.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
+        image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
         
         return f"data:image/png;base64,{image_base64}"
     except Exception:
         # 차트 생성 실패 시 None 반환
-        plt.close()
         return None
-
@@ -0,0 +1,99 @@
+"""
+크롤링한 표시용 문자열 파싱 모듈
+
+"1억회 이상", "리뷰 3.5만개", "4.5", "2024년 1월 5일"처럼 화면에 표시된 값과 AI 분석 결과의 감정을
+정렬/필터/집계할 수 있는 숫자, 날짜, 코드 값으로 바꿉니다. 해석할 수 없으면 None을 반환합니다.
+"""
+import re
+from datetime import date, datetime
+from typing import Dict, Optional
+
+# 숫자 뒤에 붙는 단위 ("5천만" 처럼 이어진 단위는 곱함)
+COUNT_UNITS = {
+    "천": 1_000,
+    "만": 10_000,
+    "억": 100_000_000,
+    "k": 1_000,
+    "m": 1_000_000,
+    "b": 1_000_000_000,
+}
+
+_COUNT_PATTERN = re.compile(r"(\d+(?:,\d{3})*(?:\.\d+)?)\s*([천만억]+|[kmb](?![a-z]))?", re.IGNORECASE)
+_RATING_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+_DATE_PATTERNS = (
+    re.compile(r"(\d{4})\s*년\s*(\d{1,2})\s*월\s*(\d{1,2})\s*일"),
+    re.compile(r"(\d{4})\s*[.\-/]\s*(\d{1,2})\s*[.\-/]\s*(\d{1,2})"),
+)
+_ENGLISH_DATE_FORMATS = ("%B %d, %Y", "%b %d, %Y")
+
+SENTIMENTS = {"긍정": "positive", "부정": "negative", "중립": "neutral"}
+_SENTIMENT_PATTERN = re.compile("|".join(SENTIMENTS))
+
+
+def parse_count(text: Optional[str]) -> Optional[int]:
+    """리뷰 수/다운로드 수 문자열을 정수로 바꿉니다. "1억회 이상" -> 100000000"""
+    if not text:
+        return None
+    match = _COUNT_PATTERN.search(text)
+    if not match:
+        return None
+
+    number = float(match.group(1).replace(",", ""))
+    for unit in (match.group(2) or "").lower():
+        number *= COUNT_UNITS[unit]
+    return int(round(number))
+
+
+def parse_rating(text: Optional[str]) -> Optional[float]:
+    """앱 별점 문자열을 0~5 사이 실수로 바꿉니다. "정보 없음" 등은 None"""
+    if not text:
+        return None
+    match = _RATING_PATTERN.search(text)
+    if not match:
+        return None
+    rating = float(match.group())
+    return rating if 0 <= rating <= 5 else None
+
+
+def parse_review_date(text: Optional[str]) -> Optional[date]:
+    """리뷰 작성일 문자열을 날짜로 바꿉니다. "2024년 1월 5일", "2024. 1. 5.", "January 5, 2024" 형식 지원"""
+    if not text:
+        return None
+    text = text.strip()
+
+    for pattern in _DATE_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            try:
+                return date(*(int(part) for part in match.groups()))
+            except ValueError:
+                return None
+
+    for date_format in _ENGLISH_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_sentiment(analysis: Optional[str]) -> Optional[str]:
+    """
+    개별 분석 결과에서 감정(positive / negative / neutral)을 꺼냅니다.
+    분석하지 않은 리뷰는 None, 분석은 했지만 감정을 찾지 못하면 unknown
+    """
+    if analysis is None:
+        return None
+    # "1. 감정 분석: 긍정" 처럼 감정 항목 뒤에 나온 첫 감정 단어 사용
+    start = analysis.find("감정")
+    match = _SENTIMENT_PATTERN.search(analysis, start if start >= 0 else 0)
+    return SENTIMENTS[match.group()] if match else "unknown"
+
+
+def app_metric_values(app_info_data: Dict) -> Dict:
+    """크롤링한 앱 정보에서 AppInfo의 숫자 컬럼 값을 만듭니다."""
+    return {
+        "review_count_value": parse_count(app_info_data.get("review_count")),
+        "download_count_value": parse_count(app_info_data.get("download_count")),
+        "rating_value": parse_rating(app_info_data.get("rating")),
+    }
@@ -1,6 +1,74 @@
 import { useState, useEffect } from 'react'
 import axios from 'axios'
 
+const JOB_POLL_INTERVAL = 1500
+const REVIEW_PAGE_SIZE = 50
+const DEFAULT_REVIEW_FILTERS = { sort: 'newest', minRating: '', analysis: 'all' }
+
+// 백그라운드 작업을 등록하고 완료될 때까지 상태를 조회합니다
+const runJob = async (path, body) => {
+  const { data: job } = await axios.post(path, body)
+  while (true) {
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL))
+    const { data } = await axios.get(`/api/jobs/${job.id}`)
+    if (data.status === 'succeeded') return data.result
+    if (data.status === 'failed') {
+      // 호출부에서 axios 오류와 동일하게 처리할 수 있도록 detail 형태로 전달
+      const error = new Error(data.error)
+      error.response = { data: { detail: data.error } }
+      throw error
+    }
+  }
+}
+
+const CHART_WIDTH = 720
+const CHART_HEIGHT = 480
+const CHART_PADDING = 20
+
+// 토픽 번호별 색상 (서버 PNG 차트의 rainbow 색상표와 비슷하게 배치)
+const topicColor = (topic, nTopics) =>
+  `hsl(${Math.round(270 - (270 * (topic - 1)) / Math.max(1, nTopics - 1))}, 75%, 55%)`
+
+// 서버가 보낸 좌표(points 형식)로 토픽 분포 산점도를 그립니다
+function TopicScatter({ chart, nTopics }) {
+  const { x, y, topic } = chart
+  const minX = Math.min(...x)
+  const maxX = Math.max(...x)
+  const minY = Math.min(...y)
+  const maxY = Math.max(...y)
+  const scaleX = (v) => CHART_PADDING + ((v - minX) / (maxX - minX || 1)) * (CHART_WIDTH - CHART_PADDING * 2)
+  const scaleY = (v) => CHART_HEIGHT - CHART_PADDING - ((v - minY) / (maxY - minY || 1)) * (CHART_HEIGHT - CHART_PADDING * 2)
+  // 리뷰가 많으면 점 크기를 줄여 겹침 완화
+  const radius = x.length <= 500 ? 5 : Math.max(2, 5 * Math.sqrt(500 / x.length))
+
+  return (
+    <div className="tsne-scatter">
+      <svg viewBox={`0 0 ${CHART_WIDTH} ${CHART_HEIGHT}`} role="img" aria-label="t-SNE Chart">
+        {x.map((_, idx) => (
+          <circle
+            key={idx}
+            cx={scaleX(x[idx])}
+            cy={scaleY(y[idx])}
+            r={radius}
+            fill={topicColor(topic[idx], nTopics)}
+            fillOpacity={0.7}
+            stroke="#333"
+            strokeWidth={0.5}
+          />
+        ))}
+      </svg>
+      <div className="tsne-legend">
+        {Array.from({ length: nTopics }, (_, idx) => (
+          <span key={idx} className="tsne-legend-item">
+            <span className="tsne-legend-dot" style={{ background: topicColor(idx + 1, nTopics) }} />
+            토픽 {idx + 1}
+          </span>
+        ))}
+      </div>
+    </div>
+  )
+}
+
 function App() {
   const [appId, setAppId] = useState('')
   const [loading, setLoading] = useState(false)
@@ -12,6 +80,10 @@ function App() {
   const [loadingList, setLoadingList] = useState(false)
   const [topicModeling, setTopicModeling] = useState(false)
   const [topicResult, setTopicResult] = useState(null)
+  const [reviews, setReviews] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loadingReviews, setLoadingReviews] = useState(false)
+  const [reviewFilters, setReviewFilters] = useState(DEFAULT_REVIEW_FILTERS)
 
   // 컴포넌트 마운트 시 앱 목록 불러오기
   useEffect(() => {
@@ -30,15 +102,44 @@ function App() {
     }
   }
 
-  const loadAppDetail = async (selectedAppId) => {
+  // 리뷰를 페이지 단위로 불러옵니다 (cursor가 있으면 기존 목록 뒤에 추가)
+  const loadReviews = async (targetAppId, filters, cursor = null) => {
+    setLoadingReviews(true)
+    try {
+      const params = { limit: REVIEW_PAGE_SIZE, sort: filters.sort }
+      if (filters.minRating) params.min_rating = filters.minRating
+      if (filters.analysis !== 'all') params.has_analysis = filters.analysis === 'analyzed'
+      if (cursor) params.cursor = cursor
+
+      const response = await axios.get(`/api/apps/${targetAppId}/reviews`, { params })
+      setReviews((prev) => (cursor ? [...prev, ...response.data.items] : response.data.items))
+      setNextCursor(response.data.next_cursor)
+    } catch (err) {
+      setError('리뷰를 불러오는데 실패했습니다.')
+    } finally {
+      setLoadingReviews(false)
+    }
+  }
+
+  const loadAppDetail = async (selectedAppId, filters = reviewFilters) => {
     try {
-      const response = await axios.get(`/api/apps/${selectedAppId}`)
+      // 리뷰는 포함하지 않는 요약 정보만 조회하고 리뷰는 첫 페이지만 불러옴
+      const response = await axios.get(`/api/apps/${selectedAppId}/summary`)
       setAppData(response.data)
+      setReviews([])
+      setNextCursor(null)
+      await loadReviews(selectedAppId, filters)
     } catch (err) {
       setError('앱 정보를 불러오는데 실패했습니다.')
     }
   }
 
+  const handleReviewFilterChange = (key, value) => {
+    const filters = { ...reviewFilters, [key]: value }
+    setReviewFilters(filters)
+    if (appData) loadReviews(appData.app_info.app_id, filters)
+  }
+
   const handleCrawl = async () => {
     if (!appId.trim()) {
       setError('앱 ID를 입력해주세요.')
@@ -50,10 +151,10 @@ function App() {
     setSuccess('')
 
     try {
-      const response = await axios.post('/api/apps/crawl', {
+      const result = await runJob('/api/jobs/crawl', {
         app_id: appId
       })
-      setAppData(response.data)
+      await loadAppDetail(result.app_info.app_id)
       setSuccess('앱 정보와 리뷰가 수집되었습니다!')
       setAppId('')
       // 앱 목록 새로고침
@@ -73,13 +174,12 @@ function App() {
     setSuccess('')
 
     try {
-      await axios.post('/api/apps/analyze', {
+      await runJob('/api/jobs/analyze', {
         app_id: appData.app_info.app_id
       })
 
       // 분석 결과 다시 조회
-      const response = await axios.get(`/api/apps/${appData.app_info.app_id}`)
-      setAppData(response.data)
+      await loadAppDetail(appData.app_info.app_id)
       setSuccess('리뷰 분석이 완료되었습니다!')
     } catch (err) {
       setError(err.response?.data?.detail || '분석 중 오류가 발생했습니다.')
@@ -95,6 +195,8 @@ function App() {
     try {
       await axios.delete(`/api/apps/${appData.app_info.app_id}`)
       setAppData(null)
+      setReviews([])
+      setNextCursor(null)
       setSuccess('앱 정보가 삭제되었습니다.')
       // 앱 목록 새로고침
       fetchAppList()
@@ -112,11 +214,12 @@ function App() {
     setTopicResult(null)
 
     try {
-      const response = await axios.post('/api/apps/topic-modeling', {
-        app_id: appData.app_info.app_id
+      const result = await runJob('/api/jobs/topic-modeling', {
+        app_id: appData.app_info.app_id,
+        chart_format: 'points'
       })
 
-      setTopicResult(response.data.result)
+      setTopicResult(result.result)
       setSuccess('토픽 모델링이 완료되었습니다!')
     } catch (err) {
       setError(err.response?.data?.detail || '토픽 모델링 중 오류가 발생했습니다.')
@@ -322,7 +425,11 @@ function App() {
                 {topicResult.chart && (
                   <div className="tsne-chart">
                     <h4>🗺️ 토픽 분포 시각화 (t-SNE)</h4>
-                    <img src={topicResult.chart} alt="t-SNE Chart" />
+                    {typeof topicResult.chart === 'string' ? (
+                      <img src={topicResult.chart} alt="t-SNE Chart" />
+                    ) : (
+                      <TopicScatter chart={topicResult.chart} nTopics={topicResult.n_topics} />
+                    )}
                   </div>
                 )}
 
@@ -370,15 +477,44 @@ function App() {
           </div>
 
           <div className="reviews-section">
-            <h2>💬 리뷰 목록 ({appData.reviews.length}개)</h2>
+            <h2>💬 리뷰 목록 ({appData.stored_review_count}개)</h2>
+
+            <div className="review-filters">
+              <select
+                value={reviewFilters.sort}
+                onChange={(e) => handleReviewFilterChange('sort', e.target.value)}
+              >
+                <option value="newest">최신 수집순</option>
+                <option value="oldest">오래된 수집순</option>
+                <option value="rating_desc">별점 높은순</option>
+                <option value="rating_asc">별점 낮은순</option>
+              </select>
+              <select
+                value={reviewFilters.minRating}
+                onChange={(e) => handleReviewFilterChange('minRating', e.target.value)}
+              >
+                <option value="">전체 별점</option>
+                {[5, 4, 3, 2, 1].map((rating) => (
+                  <option key={rating} value={rating}>{rating}점 이상</option>
+                ))}
+              </select>
+              <select
+                value={reviewFilters.analysis}
+                onChange={(e) => handleReviewFilterChange('analysis', e.target.value)}
+              >
+                <option value="all">전체 리뷰</option>
+                <option value="analyzed">AI 분석 완료</option>
+                <option value="unanalyzed">AI 분석 전</option>
+              </select>
+            </div>
 
-            {appData.reviews.length === 0 ? (
+            {reviews.length === 0 && !loadingReviews ? (
               <div className="empty-state">
                 <h3>리뷰가 없습니다</h3>
-                <p>수집된 리뷰가 없습니다.</p>
+                <p>조건에 맞는 리뷰가 없습니다.</p>
               </div>
             ) : (
-              appData.reviews.map((review) => (
+              reviews.map((review) => (
                 <div key={review.id} className="review-card">
                   <div className="review-header">
                     <div className="rating">
@@ -401,6 +537,16 @@ function App() {
                 </div>
               ))
             )}
+
+            {nextCursor && (
+              <button
+                className="btn btn-secondary btn-load-more"
+                onClick={() => loadReviews(appData.app_info.app_id, reviewFilters, nextCursor)}
+                disabled={loadingReviews}
+              >
+                {loadingReviews ? '불러오는 중...' : '리뷰 더 보기'}
+              </button>
+            )}
           </div>
         </>
       )}